@@ -0,0 +1,135 @@
+#!/usr/bin/env python
+"""
+ONNX 임베딩 백엔드 벤치마크 - torch 대비 처리량(텍스트/초)과 코사인 점수 일치도 비교
+
+사용법:
+    python benchmarks/onnx_parity.py [--model 모델] [--texts 문서 폴더] [--json out.json]
+
+같은 텍스트를 torch, onnx(fp32), onnx(int8)로 임베딩하여 다음을 비교합니다.
+    - parity: 같은 텍스트의 torch 벡터와의 코사인 유사도 (최소/평균, 1.0이면 같은 벡터)
+    - score drift: 질의-문서 코사인 점수의 torch 대비 차이 (최대/평균)
+    - top-k overlap: 질의별 상위 k개 문서가 torch와 겹치는 비율
+--texts를 주면 폴더의 문서를 파싱한 청크로, 없으면 내장 예문으로 측정합니다.
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# 프로젝트 루트 추가
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.core.onnx_backend import cosine_parity, load_onnx_encoder, score_drift
+
+SAMPLE_DOCUMENTS = [
+    "2024학년도 1학기 학부모 공개수업은 4월 둘째 주에 학년별로 진행됩니다.",
+    "출장비 정산은 출장 종료 후 5일 이내에 영수증을 첨부하여 신청해야 합니다.",
+    "회의실 예약은 사내 포털의 시설 예약 메뉴에서 최대 2주 전까지 가능합니다.",
+    "신규 입사자는 첫 주에 보안 교육과 개인정보 보호 교육을 이수해야 합니다.",
+    "연차 휴가는 사용 3일 전까지 팀장 승인을 받아야 하며 반차 단위로 사용할 수 있습니다.",
+    "The quarterly budget review meeting has been moved to Thursday afternoon.",
+    "서버 점검으로 토요일 오전 2시부터 4시까지 그룹웨어 접속이 제한됩니다.",
+    "도서관 자료 대출 기간은 14일이며 한 번 연장할 수 있습니다.",
+]
+
+SAMPLE_QUERIES = ["공개수업 일정", "출장비 정산 방법", "회의실 예약", "휴가 신청 절차", "budget meeting"]
+
+
+def load_documents(folder: Path, limit: int):
+    """폴더의 문서를 파싱하여 청크 텍스트 목록 반환"""
+    from src.core.parser import DocumentParser
+
+    parser = DocumentParser(chunk_size=512, chunk_overlap=50)
+    texts = []
+    for file_path in sorted(folder.rglob("*")):
+        if not DocumentParser.is_supported(file_path):
+            continue
+        try:
+            texts.extend(chunk.text for chunk in parser.iter_chunks(file_path))
+        except Exception as e:
+            print(f"  skipped {file_path}: {e}", file=sys.stderr)
+        if len(texts) >= limit:
+            break
+    return texts[:limit]
+
+
+def measure(encode, texts, batch_size: int, repeat: int):
+    """가장 빠른 회차의 (임베딩, 초)"""
+    best = None
+    embeddings = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        embeddings = np.asarray(encode(texts, batch_size=batch_size), dtype=np.float32)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return embeddings, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ONNX 임베딩 백엔드 속도/일치도 비교")
+    parser.add_argument("--model", default="paraphrase-multilingual-MiniLM-L12-v2", help="sentence-transformers 모델")
+    parser.add_argument("--onnx-dir", default="./models/onnx", help="ONNX 모델 저장 디렉토리")
+    parser.add_argument("--texts", type=Path, help="문서 폴더 (없으면 내장 예문)")
+    parser.add_argument("--limit", type=int, default=512, help="최대 청크 수")
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--repeat", type=int, default=3, help="반복 횟수 (가장 빠른 회차 사용)")
+    parser.add_argument("--json", type=Path, help="결과를 저장할 JSON 파일")
+    args = parser.parse_args()
+
+    from sentence_transformers import SentenceTransformer
+
+    # 내장 예문은 처리량을 잴 수 있도록 반복
+    documents = load_documents(args.texts, args.limit) if args.texts else SAMPLE_DOCUMENTS * 8
+    if not documents:
+        print(f"No documents found in {args.texts}")
+        return 1
+    # 점수 비교는 중복 없는 텍스트로 (같은 텍스트는 점수가 같아 상위 k개 순서가 임의로 정해짐)
+    unique = sorted({text: idx for idx, text in enumerate(documents)}.values())
+
+    torch_model = SentenceTransformer(args.model, device="cpu")
+    encoders = {"torch": torch_model.encode}
+    for name, quantize in [("onnx", False), ("onnx-int8", True)]:
+        encoders[name] = load_onnx_encoder(args.model, args.onnx_dir, quantize=quantize).encode
+
+    print(f"{len(documents)} texts, {len(SAMPLE_QUERIES)} queries, model: {args.model}")
+
+    results = {}
+    reference_docs = reference_queries = None
+    for name, encode in encoders.items():
+        docs, seconds = measure(encode, documents, args.batch_size, max(1, args.repeat))
+        queries = np.asarray(encode(SAMPLE_QUERIES, batch_size=args.batch_size), dtype=np.float32)
+        if reference_docs is None:
+            reference_docs, reference_queries = docs, queries
+
+        parity = cosine_parity(reference_docs, docs)
+        drift = score_drift(reference_docs[unique], reference_queries, docs[unique], queries)
+        results[name] = {
+            "seconds": round(seconds, 4),
+            "texts_per_sec": round(len(documents) / seconds, 2),
+            "min_parity": round(float(parity.min()), 6),
+            "mean_parity": round(float(parity.mean()), 6),
+            "max_score_drift": round(drift["max_abs"], 6),
+            "mean_score_drift": round(drift["mean_abs"], 6),
+            "top_k_overlap": round(drift["top_k_overlap"], 4),
+        }
+
+    base = results["torch"]["texts_per_sec"]
+    print(f"\n{'backend':<10} {'texts/s':>9} {'speedup':>8} {'min cos':>9} {'mean cos':>9} {'max drift':>10} {'top-k':>7}")
+    for name, result in results.items():
+        print(
+            f"{name:<10} {result['texts_per_sec']:>9.1f} {result['texts_per_sec'] / base:>7.2f}x "
+            f"{result['min_parity']:>9.5f} {result['mean_parity']:>9.5f} "
+            f"{result['max_score_drift']:>10.5f} {result['top_k_overlap']:>7.3f}"
+        )
+
+    if args.json:
+        args.json.write_text(json.dumps(results, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"\nSaved: {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
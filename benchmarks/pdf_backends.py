@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+"""
+PDF 백엔드 벤치마크 - 설치된 백엔드별 추출 속도(페이지/초)와 pypdf 대비 텍스트 일치도 비교
+
+사용법:
+    python benchmarks/pdf_backends.py <PDF 폴더 또는 파일> [--repeat 3] [--json out.json]
+
+일치도는 공백을 정규화한 단어 다중집합의 겹침 비율(pypdf 기준)입니다. 1.0이면 같은 단어가
+같은 횟수만큼 추출된 것이고, 단어 순서나 줄바꿈 차이는 반영하지 않습니다.
+"""
+import argparse
+import json
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+# 프로젝트 루트 추가
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.core.pdf_backends import PDF_BACKENDS, available_pdf_backends
+
+
+def collect_pdfs(target: Path):
+    """대상 경로의 PDF 파일 목록"""
+    if target.is_file():
+        return [target]
+    return sorted(path for path in target.rglob("*") if path.suffix.lower() == ".pdf")
+
+
+def extract(backend, file_path: Path):
+    """파일 하나를 추출하여 (페이지 수, 단어 Counter, 소요 시간) 반환"""
+    started = time.perf_counter()
+    words = Counter()
+    pages = 0
+    for _, text in backend.iter_pages(file_path):
+        words.update(text.split())
+        pages += 1
+    return pages, words, time.perf_counter() - started
+
+
+def parity(words: Counter, reference: Counter) -> float:
+    """기준 대비 단어 다중집합 겹침 비율"""
+    total = sum(reference.values())
+    if total == 0:
+        return 1.0 if not words else 0.0
+    return sum((words & reference).values()) / total
+
+
+def run(files, backends, repeat: int):
+    """백엔드별 측정 결과"""
+    reference = {}
+    results = {}
+
+    for name in backends:
+        backend = PDF_BACKENDS[name]()
+        pages = failures = 0
+        seconds = 0.0
+        parities = []
+
+        for file_path in files:
+            try:
+                # 가장 빠른 회차를 사용하여 디스크 캐시 영향 줄이기
+                runs = [extract(backend, file_path) for _ in range(repeat)]
+            except Exception as e:
+                print(f"  [{name}] failed on {file_path}: {e}", file=sys.stderr)
+                failures += 1
+                continue
+            file_pages, words, _ = runs[0]
+            pages += file_pages
+            seconds += min(elapsed for _, _, elapsed in runs)
+
+            if name == "pypdf":
+                reference[file_path] = words
+            if file_path in reference:
+                parities.append(parity(words, reference[file_path]))
+
+        results[name] = {
+            "files": len(files) - failures,
+            "failures": failures,
+            "pages": pages,
+            "seconds": round(seconds, 4),
+            "pages_per_sec": round(pages / seconds, 2) if seconds > 0 else None,
+            "parity_vs_pypdf": round(sum(parities) / len(parities), 4) if parities else None,
+            "min_parity_vs_pypdf": round(min(parities), 4) if parities else None,
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PDF 추출 백엔드 속도/일치도 비교")
+    parser.add_argument("target", type=Path, help="PDF 폴더 또는 파일")
+    parser.add_argument("--repeat", type=int, default=3, help="파일별 반복 횟수 (가장 빠른 회차 사용)")
+    parser.add_argument("--json", type=Path, help="결과를 저장할 JSON 파일")
+    args = parser.parse_args()
+
+    files = collect_pdfs(args.target)
+    if not files:
+        print(f"No PDF files found in {args.target}")
+        return 1
+
+    # pypdf를 먼저 측정하여 일치도 기준으로 사용
+    backends = available_pdf_backends()
+    backends.sort(key=lambda name: name != "pypdf")
+    print(f"{len(files)} PDF files, backends: {', '.join(backends)}")
+
+    results = run(files, backends, max(1, args.repeat))
+
+    print(f"\n{'backend':<10} {'files':>6} {'pages':>7} {'seconds':>9} {'pages/s':>9} {'parity':>8} {'min':>8}")
+    for name, result in results.items():
+        print(
+            f"{name:<10} {result['files']:>6} {result['pages']:>7} {result['seconds']:>9.3f} "
+            f"{result['pages_per_sec'] or 0:>9.1f} {result['parity_vs_pypdf'] or 0:>8.4f} "
+            f"{result['min_parity_vs_pypdf'] or 0:>8.4f}"
+        )
+
+    if args.json:
+        args.json.write_text(json.dumps(results, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"\nSaved: {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
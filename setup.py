@@ -19,6 +19,7 @@ setup(
         "sentence-transformers>=2.2.2",
         "chromadb>=0.4.0",
         "torch>=2.0.0",
+        "numpy>=1.24.0",
         "pypdf>=3.15.0",
         "python-docx>=1.0.0",
         "lxml>=4.9.0",
@@ -28,6 +29,13 @@ setup(
         "tqdm>=4.65.0",
     ],
     extras_require={
+        "pdf": [
+            "pypdfium2>=4.0.0",
+        ],
+        "onnx": [
+            "onnxruntime>=1.16.0",
+            "onnx>=1.14.0",
+        ],
         "dev": [
             "pytest>=7.4.0",
             "black>=23.0.0",
@@ -1,13 +1,18 @@
 """memoRAG CLI 메인 엔트리포인트"""
 import click
 from pathlib import Path
+import json
+import multiprocessing
+import os
 import sys
+import time
 from rich.console import Console
 from rich.table import Table
 
 # 프로젝트 모듈
-from ..core import DocumentParser, EmbeddingEngine, VectorSearch
-from ..services import IndexingService, QueryService, ManagementService
+from ..core import DocumentParser, EmbeddingEngine, VectorSearch, EmbeddingCache, TextCache
+from ..services import IndexingService, QueryService, ManagementService, WatchService
+from ..services.scanner import FolderScanner, DEFAULT_EXCLUDES
 from ..utils import Config, setup_logger
 
 console = Console()
@@ -44,12 +49,119 @@ def cli(ctx, config, verbose):
     ctx.obj['logger'] = logger
 
 
+def _create_embedding_cache(config):
+    """설정에 따라 임베딩 캐시 생성 (비활성화면 None)"""
+    if not config.get('cache.enabled', True):
+        return None
+    return EmbeddingCache(
+        directory=config.get('cache.directory', './cache/embeddings'),
+        max_size_mb=config.get('cache.max_size_mb', 2048)
+    )
+
+
+def _create_embedder(config, cache: bool = True):
+    """설정으로 임베딩 엔진 생성 (cache=False면 임베딩 캐시 사용 안 함)"""
+    return EmbeddingEngine(
+        model_name=config.get('embedding.model_name'),
+        device=config.get('embedding.device', 'cpu'),
+        batch_size=config.get('embedding.batch_size', 32),
+        cache=_create_embedding_cache(config) if cache else None,
+        backend=config.get('embedding.backend', 'torch'),
+        quantize=config.get('embedding.quantize', False),
+        onnx_dir=config.get('embedding.onnx_dir', './models/onnx'),
+        max_batch_tokens=config.get('embedding.max_batch_tokens'),
+        bucket_window=config.get('embedding.bucket_window', 256),
+        parallel_workers=config.get('embedding.parallel_workers', 0),
+        worker_threads=config.get('embedding.worker_threads', 0),
+        threads=config.get('embedding.threads', 0)
+    )
+
+
+def _daemon_socket(config, socket_path=None) -> Path:
+    """검색 데몬 소켓 경로 (지정하지 않으면 설정값)"""
+    return Path(socket_path or config.get('daemon.socket', './cache/memorag.sock'))
+
+
+def _query_via_daemon(config, query, index, top_k):
+    """실행 중인 검색 데몬으로 검색 (데몬이 없거나 설정이 다르면 None)"""
+    if not config.get('daemon.enabled', True):
+        return None
+    
+    from ..services.daemon import QueryDaemon, query_daemon
+    
+    expect = QueryDaemon.identity(
+        model_name=config.get('embedding.model_name'),
+        backend=config.get('embedding.backend', 'torch'),
+        quantize=config.get('embedding.quantize', False),
+        persist_directory=config.get('database.persist_directory', './chroma')
+    )
+    return query_daemon(
+        _daemon_socket(config),
+        query,
+        collection_name=index or config.get('database.default_collection', 'default'),
+        top_k=top_k or config.get('search.top_k', 5),
+        expect=expect
+    )
+
+
+def _create_text_cache(config):
+    """설정에 따라 파싱 텍스트 캐시 생성 (비활성화면 None)"""
+    if not config.get('text_cache.enabled', True):
+        return None
+    return TextCache(
+        directory=config.get('text_cache.directory', './cache/parsed'),
+        max_size_mb=config.get('text_cache.max_size_mb', 4096)
+    )
+
+
+def _create_parser(config, embedder=None):
+    """설정으로 문서 파서 생성 (토큰 기준이면 임베딩 모델의 토크나이저로 청크 길이 측정)"""
+    parser = DocumentParser(
+        chunk_size=config.get('parsing.chunk_size', 512),
+        chunk_overlap=config.get('parsing.chunk_overlap', 50),
+        pdf_parallel_pages=config.get('parsing.pdf_parallel_pages', 200),
+        pdf_workers=config.get('parsing.pdf_workers', 0),
+        pdf_backend=config.get('parsing.pdf_backend', 'auto'),
+        xlsx_repeat_header=config.get('parsing.xlsx_repeat_header', True),
+        ooxml_fast_path=config.get('parsing.ooxml_fast_path', True),
+        text_cache=_create_text_cache(config)
+    )
+    
+    if embedder is not None and config.get('parsing.chunk_unit', 'tokens') == 'tokens':
+        tokenizer = embedder.tokenizer
+        max_tokens = embedder.max_chunk_tokens()
+        if getattr(tokenizer, 'is_fast', False) and max_tokens:
+            parser.use_tokenizer(tokenizer, max_tokens)
+        else:
+            console.print("[yellow]모델에 fast 토크나이저가 없어 청크 길이를 문자 수로 측정합니다.[/yellow]")
+    return parser
+
+
+def _create_scanner(config, include=(), exclude=()):
+    """설정과 명령행 패턴으로 폴더 스캐너 생성"""
+    # 이 모듈의 list는 CLI 명령이므로 리스트는 언패킹으로 만듦
+    excludes = [*DEFAULT_EXCLUDES] if config.get('scan.default_excludes', True) else []
+    excludes += [*(config.get('scan.exclude', []) or []), *exclude]
+    return FolderScanner(
+        include=[*(config.get('scan.include', []) or []), *include],
+        exclude=excludes,
+        skip_hidden=config.get('scan.skip_hidden', True)
+    )
+
+
 @cli.command()
 @click.option('--folder', '-f', required=True, type=click.Path(exists=True), help='인덱싱할 폴더 경로')
 @click.option('--output', '-o', help='인덱스 이름 (기본값: default)')
 @click.option('--recursive/--no-recursive', default=True, help='하위 폴더 포함 여부')
+@click.option('--workers', '-w', type=int, help='파싱 워커 프로세스 수 (2 이상이면 파이프라인 모드)')
+@click.option('--full', is_flag=True, help='변경 여부와 관계없이 모든 파일 재인덱싱')
+@click.option('--resume', is_flag=True, help='중단된 인덱싱 작업을 이어서 진행')
+@click.option('--include', multiple=True, help='포함할 파일 이름 패턴 (여러 번 지정 가능)')
+@click.option('--exclude', '-x', multiple=True, help='제외할 파일/폴더 패턴 (여러 번 지정 가능)')
+@click.option('--report', type=click.Path(dir_okay=False), help='단계별 시간/처리량 보고서를 저장할 JSON 파일')
+@click.option('--retry-quarantined', is_flag=True, help='시간/메모리 예산을 넘겨 격리된 파일도 다시 시도')
 @click.pass_context
-def index(ctx, folder, output, recursive):
+def index(ctx, folder, output, recursive, workers, full, resume, include, exclude, report, retry_quarantined):
     """문서 폴더를 인덱싱합니다."""
     config = ctx.obj['config']
     logger = ctx.obj['logger']
@@ -60,41 +172,75 @@ def index(ctx, folder, output, recursive):
     
     try:
         # 컴포넌트 초기화
-        parser = DocumentParser(
-            chunk_size=config.get('parsing.chunk_size', 512),
-            chunk_overlap=config.get('parsing.chunk_overlap', 50)
-        )
+        embedder = _create_embedder(config)
         
-        embedder = EmbeddingEngine(
-            model_name=config.get('embedding.model_name'),
-            device=config.get('embedding.device', 'cpu'),
-            batch_size=config.get('embedding.batch_size', 32)
-        )
+        # 청크 길이를 모델 토크나이저로 측정하므로 모델을 먼저 로드
+        parser = _create_parser(config, embedder)
         
         vector_db = VectorSearch(
             persist_directory=config.get('database.persist_directory', './chroma'),
             collection_name=output or config.get('database.default_collection', 'default')
         )
         
-        indexing_service = IndexingService(parser, embedder, vector_db)
+        indexing_service = IndexingService(
+            parser,
+            embedder,
+            vector_db,
+            workers=workers or config.get('indexing.workers', 1),
+            queue_size=config.get('indexing.queue_size', 16),
+            batch_max_wait=config.get('indexing.batch_max_wait', 2.0),
+            write_batch_size=config.get('indexing.write_batch_size', 1024),
+            scanner=_create_scanner(config, include, exclude),
+            parse_timeout=config.get('indexing.parse_timeout', 300),
+            parse_memory_mb=config.get('indexing.parse_memory_mb', 2048),
+            quarantine=config.get('indexing.quarantine', True)
+        )
         
         # 인덱싱 실행
         stats = indexing_service.index_folder(
             folder_path=Path(folder),
             collection_name=output,
             recursive=recursive,
-            show_progress=True
+            show_progress=True,
+            incremental=not full,
+            resume=resume,
+            retry_quarantined=retry_quarantined
         )
         
         # 결과 출력
         console.print(f"\n[bold green]인덱싱 완료![/bold green]")
         console.print(f"처리 파일: {stats['total_files']}개")
         console.print(f"생성 청크: {stats['total_chunks']}개")
+        if stats.get('skipped_files'):
+            console.print(f"변경 없음: {stats['skipped_files']}개")
+        if stats.get('resumed_files'):
+            console.print(f"이전 작업에서 완료: {stats['resumed_files']}개")
+        if stats.get('deleted_files'):
+            console.print(f"삭제 반영: {stats['deleted_files']}개")
+        if stats.get('quarantined_files'):
+            console.print(
+                f"[yellow]격리되어 건너뜀: {stats['quarantined_files']}개 "
+                f"(--retry-quarantined로 재시도)[/yellow]"
+            )
+        
+        if embedder.cache is not None:
+            cache_stats = embedder.cache.stats()
+            console.print(f"임베딩 캐시: {cache_stats['hits']}개 재사용, {cache_stats['misses']}개 새로 계산")
         
         if stats['errors'] > 0:
             console.print(f"[red]오류 파일: {stats['errors']}개[/red]")
             for error_file in stats.get('error_files', []):
-                console.print(f"  - {error_file}")
+                console.print(f"  - {error_file['path']}: {error_file['reason']}")
+        
+        if stats.get('timing'):
+            _print_timing(stats['timing'])
+        
+        if report:
+            report_path = Path(report)
+            report_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(report_path, 'w', encoding='utf-8') as f:
+                json.dump(stats, f, ensure_ascii=False, indent=2)
+            console.print(f"보고서 저장: {report_path}")
         
     except Exception as e:
         console.print(f"\n[bold red]오류 발생: {e}[/bold red]")
@@ -102,6 +248,116 @@ def index(ctx, folder, output, recursive):
         sys.exit(1)
 
 
+def _print_timing(timing: dict, slowest: int = 5):
+    """단계별 시간/처리량 요약 테이블 출력"""
+    table = Table(title="단계별 소요 시간")
+    table.add_column("단계", style="cyan")
+    table.add_column("호출", justify="right")
+    table.add_column("시간(초)", justify="right")
+    table.add_column("CPU(초)", justify="right")
+    table.add_column("항목", justify="right")
+    table.add_column("항목/초", justify="right")
+    table.add_column("읽은 크기", justify="right")
+    
+    for name, stage in timing['stages'].items():
+        rate = stage['items_per_sec']
+        table.add_row(
+            name,
+            str(stage['calls']),
+            f"{stage['wall_seconds']:.2f}",
+            f"{stage['cpu_seconds']:.2f}",
+            str(stage['items']),
+            f"{rate:.1f}" if rate is not None else "-",
+            f"{stage['bytes_read'] / 1024 / 1024:.1f} MB" if stage['bytes_read'] else "-"
+        )
+    
+    console.print()
+    console.print(table)
+    
+    chunks_per_sec = timing['chunks_per_sec']
+    console.print(
+        f"전체: {timing['wall_seconds']:.2f}초 (CPU {timing['cpu_seconds']:.2f}초), "
+        f"{chunks_per_sec if chunks_per_sec is not None else '-'} 청크/초, "
+        f"읽은 크기 {timing['bytes_read'] / 1024 / 1024:.1f} MB"
+    )
+    
+    if timing['slowest_files']:
+        console.print("\n[bold]파싱이 느린 파일:[/bold]")
+        for item in timing['slowest_files'][:slowest]:
+            console.print(f"  {item['seconds']:.2f}초  {item['chunks']}청크  {item['path']}")
+
+
+@cli.command()
+@click.option('--folder', '-f', required=True, type=click.Path(exists=True, file_okay=False), help='감시할 폴더 경로')
+@click.option('--index', '-i', help='동기화할 인덱스 이름 (기본값: default)')
+@click.option('--recursive/--no-recursive', default=True, help='하위 폴더 포함 여부')
+@click.option('--poll', is_flag=True, help='inotify 대신 주기적 스캔으로 감시')
+@click.pass_context
+def watch(ctx, folder, index, recursive, poll):
+    """폴더 변경을 감시하여 인덱스를 계속 최신 상태로 유지합니다."""
+    config = ctx.obj['config']
+    logger = ctx.obj['logger']
+    
+    console.print(f"\n[bold green]폴더 감시 시작[/bold green]")
+    console.print(f"폴더: {folder}")
+    console.print(f"인덱스: {index or 'default'}")
+    console.print("[dim]종료하려면 Ctrl+C를 누르세요.[/dim]\n")
+    
+    try:
+        # 모델은 감시가 끝날 때까지 한 번만 로드
+        embedder = _create_embedder(config)
+        
+        # 청크 길이를 모델 토크나이저로 측정하므로 모델을 먼저 로드
+        parser = _create_parser(config, embedder)
+        
+        vector_db = VectorSearch(
+            persist_directory=config.get('database.persist_directory', './chroma'),
+            collection_name=index or config.get('database.default_collection', 'default')
+        )
+        
+        indexing_service = IndexingService(
+            parser,
+            embedder,
+            vector_db,
+            write_batch_size=config.get('indexing.write_batch_size', 1024),
+            scanner=_create_scanner(config)
+        )
+        
+        watch_service = WatchService(
+            indexing_service,
+            folder_path=Path(folder),
+            collection_name=index,
+            recursive=recursive,
+            debounce=config.get('watch.debounce', 1.0),
+            use_polling=poll,
+            poll_interval=config.get('watch.poll_interval', 2.0)
+        )
+        
+        def report(kind, path, result):
+            if result is None:
+                console.print(f"[red]반영 실패: {path}[/red]")
+            elif kind == 'rescan':
+                console.print(
+                    f"[cyan]동기화[/cyan] {path} "
+                    f"(청크 {result['total_chunks']}개, 변경 없음 {result['skipped_files']}개, "
+                    f"삭제 {result['deleted_files']}개)"
+                )
+            elif kind == 'changed':
+                if result:
+                    console.print(f"[green]갱신[/green] {path} (청크 {result}개)")
+            else:
+                console.print(f"[yellow]삭제[/yellow] {path}")
+        
+        watch_service.run(on_update=report)
+        
+    except KeyboardInterrupt:
+        console.print("\n[yellow]감시를 종료합니다.[/yellow]")
+    except Exception as e:
+        console.print(f"\n[bold red]오류 발생: {e}[/bold red]")
+        logger.exception("Watch failed")
+        sys.exit(1)
+
+
 @cli.command()
 @click.argument('query', required=True)
 @click.option('--index', '-i', help='검색할 인덱스 이름')
@@ -118,30 +374,30 @@ def query(ctx, query, index, top_k, no_score, no_snippet):
     console.print(f"질의: {query}\n")
     
     try:
-        # 컴포넌트 초기화
-        embedder = EmbeddingEngine(
-            model_name=config.get('embedding.model_name'),
-            device=config.get('embedding.device', 'cpu'),
-            batch_size=config.get('embedding.batch_size', 32)
-        )
+        # 실행 중인 검색 데몬이 있으면 모델을 로드하지 않고 데몬으로 검색
+        results = _query_via_daemon(config, query, index, top_k)
         
-        vector_db = VectorSearch(
-            persist_directory=config.get('database.persist_directory', './chroma'),
-            collection_name=index or config.get('database.default_collection', 'default')
-        )
-        
-        query_service = QueryService(
-            embedder=embedder,
-            vector_db=vector_db,
-            top_k=top_k or config.get('search.top_k', 5),
-            snippet_length=config.get('output.snippet_length', 200)
-        )
-        
-        # 검색 실행
-        results = query_service.search(
-            query=query,
-            collection_name=index
-        )
+        if results is None:
+            # 컴포넌트 초기화
+            embedder = _create_embedder(config, cache=False)
+            
+            vector_db = VectorSearch(
+                persist_directory=config.get('database.persist_directory', './chroma'),
+                collection_name=index or config.get('database.default_collection', 'default')
+            )
+            
+            query_service = QueryService(
+                embedder=embedder,
+                vector_db=vector_db,
+                top_k=top_k or config.get('search.top_k', 5),
+                snippet_length=config.get('output.snippet_length', 200)
+            )
+            
+            # 검색 실행
+            results = query_service.search(
+                query=query,
+                collection_name=index
+            )
         
         # 결과 출력
         if not results:
@@ -175,6 +431,99 @@ def query(ctx, query, index, top_k, no_score, no_snippet):
         sys.exit(1)
 
 
+@cli.command()
+@click.option('--socket', 'socket_path', is_flag=False, flag_value='', default=None,
+              type=click.Path(dir_okay=False), help='유닉스 소켓 경로 (값을 생략하면 설정의 daemon.socket)')
+@click.option('--detach', '-d', is_flag=True, help='백그라운드에서 실행')
+@click.option('--stop', is_flag=True, help='실행 중인 검색 데몬 종료')
+@click.pass_context
+def serve(ctx, socket_path, detach, stop):
+    """검색 데몬을 실행합니다 (모델과 인덱스를 메모리에 유지하여 query가 바로 응답)."""
+    from ..services.daemon import QueryDaemon, is_supported, send_request
+    
+    config = ctx.obj['config']
+    logger = ctx.obj['logger']
+    socket_path = _daemon_socket(config, socket_path)
+    
+    if not is_supported():
+        console.print("[bold red]이 플랫폼은 유닉스 소켓을 지원하지 않아 검색 데몬을 실행할 수 없습니다.[/bold red]")
+        sys.exit(1)
+    
+    if stop:
+        if send_request(socket_path, {"op": "shutdown"}, timeout=5.0) is None:
+            console.print("[yellow]실행 중인 검색 데몬이 없습니다.[/yellow]")
+        else:
+            console.print(f"[green]검색 데몬을 종료했습니다.[/green] ({socket_path})")
+        return
+    
+    running = send_request(socket_path, {"op": "ping"}, timeout=5.0)
+    if running is not None:
+        console.print(f"[yellow]검색 데몬이 이미 실행 중입니다.[/yellow] (pid {running.get('pid')}, {socket_path})")
+        return
+    
+    if detach and _detach_daemon(socket_path):
+        # 부모 프로세스: 데몬이 준비되었음
+        return
+    
+    try:
+        # 모델과 컬렉션을 한 번 로드하여 데몬이 끝날 때까지 유지
+        embedder = _create_embedder(config, cache=False)
+        daemon = QueryDaemon(
+            embedder,
+            persist_directory=config.get('database.persist_directory', './chroma'),
+            default_collection=config.get('database.default_collection', 'default'),
+            top_k=config.get('search.top_k', 5),
+            snippet_length=config.get('output.snippet_length', 200)
+        )
+        daemon.warm_up()
+        
+        if not detach:
+            console.print(f"\n[bold green]검색 데몬 실행 중[/bold green]: {socket_path}")
+            console.print("[dim]종료하려면 Ctrl+C를 누르거나 memorag serve --stop을 실행하세요.[/dim]\n")
+        daemon.serve(socket_path)
+        
+    except KeyboardInterrupt:
+        console.print("\n[yellow]검색 데몬을 종료합니다.[/yellow]")
+    except Exception as e:
+        console.print(f"\n[bold red]오류 발생: {e}[/bold red]")
+        logger.exception("Query daemon failed")
+        sys.exit(1)
+
+
+def _detach_daemon(socket_path: Path, startup_timeout: float = 600.0) -> bool:
+    """
+    데몬을 백그라운드 프로세스로 분리
+    
+    부모 프로세스는 데몬이 모델을 로드하고 소켓에서 응답할 때까지 기다린 뒤 True를 반환하고,
+    자식 프로세스(데몬)는 터미널에서 분리된 뒤 False를 반환하여 이어서 데몬을 실행합니다.
+    """
+    from ..services.daemon import send_request
+    
+    # 모델을 로드하기 전에 fork (torch 스레드가 생긴 뒤 fork하면 교착될 수 있음)
+    pid = os.fork()
+    if pid == 0:
+        os.setsid()
+        devnull = os.open(os.devnull, os.O_RDWR)
+        for fd in (0, 1, 2):
+            os.dup2(devnull, fd)
+        return False
+    
+    with console.status("검색 데몬 시작 중 (모델 로드)..."):
+        deadline = time.monotonic() + startup_timeout
+        while time.monotonic() < deadline:
+            finished, _ = os.waitpid(pid, os.WNOHANG)
+            if finished:
+                console.print("[bold red]검색 데몬이 시작하지 못했습니다. 로그 파일을 확인하세요.[/bold red]")
+                sys.exit(1)
+            if send_request(socket_path, {"op": "ping"}, timeout=1.0) is not None:
+                console.print(f"[green]검색 데몬을 시작했습니다.[/green] (pid {pid}, {socket_path})")
+                return True
+            time.sleep(0.2)
+    
+    console.print(f"[bold red]검색 데몬이 {startup_timeout:.0f}초 안에 응답하지 않았습니다.[/bold red] (pid {pid})")
+    sys.exit(1)
+
+
 @cli.command()
 @click.pass_context
 def list(ctx):
@@ -273,6 +622,118 @@ def clean(ctx, index, yes):
         sys.exit(1)
 
 
+@cli.group()
+def cache():
+    """임베딩 캐시와 파싱 텍스트 캐시를 관리합니다."""
+
+
+@cache.command('stats')
+@click.pass_context
+def cache_stats(ctx):
+    """임베딩 캐시와 파싱 텍스트 캐시 통계를 표시합니다."""
+    config = ctx.obj['config']
+    
+    embedding_cache = EmbeddingCache(
+        directory=config.get('cache.directory', './cache/embeddings'),
+        max_size_mb=config.get('cache.max_size_mb', 2048)
+    )
+    stats = embedding_cache.stats()
+    embedding_cache.close()
+    
+    table = Table(title="\n임베딩 캐시")
+    table.add_column("모델", style="cyan")
+    table.add_column("항목 수", justify="right", style="green")
+    for model_name, count in sorted(stats['models'].items()):
+        table.add_row(model_name or "-", str(count))
+    console.print(table)
+    
+    console.print(f"\n총 항목: {stats['entries']}개")
+    console.print(f"크기: {stats['size_bytes'] / 1024 / 1024:.2f} MB / {stats['max_bytes'] / 1024 / 1024:.0f} MB")
+    console.print(f"저장 위치: {stats['directory']}\n")
+    
+    text_stats = TextCache(
+        directory=config.get('text_cache.directory', './cache/parsed'),
+        max_size_mb=config.get('text_cache.max_size_mb', 4096)
+    ).stats()
+    console.print("[bold]파싱 텍스트 캐시[/bold]")
+    console.print(f"총 항목: {text_stats['entries']}개 문서")
+    console.print(
+        f"크기: {text_stats['size_bytes'] / 1024 / 1024:.2f} MB / {text_stats['max_bytes'] / 1024 / 1024:.0f} MB"
+    )
+    console.print(f"저장 위치: {text_stats['directory']}\n")
+
+
+@cache.command('prune')
+@click.option('--max-size-mb', type=int, help='이 크기(MB)까지 오래된 항목 제거 (기본값: 설정값의 90%)')
+@click.option('--all', 'clear_all', is_flag=True, help='캐시 전체 삭제')
+@click.option('--text', 'text_cache', is_flag=True, help='임베딩 캐시 대신 파싱 텍스트 캐시 정리')
+@click.pass_context
+def cache_prune(ctx, max_size_mb, clear_all, text_cache):
+    """오래 사용되지 않은 임베딩 캐시(또는 파싱 텍스트 캐시) 항목을 정리합니다."""
+    config = ctx.obj['config']
+    logger = ctx.obj['logger']
+    
+    try:
+        if text_cache:
+            target = TextCache(
+                directory=config.get('text_cache.directory', './cache/parsed'),
+                max_size_mb=config.get('text_cache.max_size_mb', 4096)
+            )
+        else:
+            target = EmbeddingCache(
+                directory=config.get('cache.directory', './cache/embeddings'),
+                max_size_mb=config.get('cache.max_size_mb', 2048)
+            )
+        
+        if clear_all:
+            removed = target.clear()
+        elif max_size_mb is not None:
+            removed = target.prune(max_bytes=max_size_mb * 1024 * 1024)
+        else:
+            removed = target.prune()
+        
+        size_mb = target.size_bytes() / 1024 / 1024
+        target.close()
+        
+        console.print(f"[green]{removed}개 항목을 제거했습니다. (현재 크기: {size_mb:.2f} MB)[/green]")
+        
+    except Exception as e:
+        console.print(f"\n[bold red]오류 발생: {e}[/bold red]")
+        logger.exception("Cache prune failed")
+        sys.exit(1)
+
+
+@cli.command('export-onnx')
+@click.option('--model', '-m', help='내보낼 모델 이름 (기본값: 설정의 embedding.model_name)')
+@click.option('--quantize/--no-quantize', default=None, help='int8 동적 양자화 모델도 생성 (기본값: embedding.quantize)')
+@click.pass_context
+def export_onnx_command(ctx, model, quantize):
+    """임베딩 모델을 ONNX로 내보냅니다 (embedding.backend: onnx용, torch 필요)."""
+    config = ctx.obj['config']
+    logger = ctx.obj['logger']
+    
+    from ..core.onnx_backend import export_onnx, onnx_model_dir
+    
+    model_name = model or config.get('embedding.model_name')
+    if quantize is None:
+        quantize = config.get('embedding.quantize', False)
+    output_dir = onnx_model_dir(model_name, config.get('embedding.onnx_dir', './models/onnx'))
+    
+    try:
+        console.print(f"\n[bold blue]모델 내보내는 중:[/bold blue] {model_name}")
+        export_onnx(model_name, output_dir, quantize=quantize)
+        
+        for model_file in sorted(output_dir.glob("*.onnx")):
+            console.print(f"  {model_file.name}: {model_file.stat().st_size / 1024 / 1024:.1f} MB")
+        console.print(f"\n[green]저장 위치: {output_dir}[/green]")
+        console.print("설정에서 embedding.backend를 onnx로 바꾸면 사용합니다.\n")
+    
+    except Exception as e:
+        console.print(f"\n[bold red]오류 발생: {e}[/bold red]")
+        logger.exception("ONNX export failed")
+        sys.exit(1)
+
+
 @cli.command()
 def version():
     """버전 정보를 표시합니다."""
@@ -283,6 +744,8 @@ def version():
 
 def main():
     """CLI 진입점"""
+    # PyInstaller exe에서 파싱 워커 프로세스를 띄우기 위해 필요
+    multiprocessing.freeze_support()
     cli(obj={})
 
 
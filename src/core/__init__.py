@@ -1,7 +1,38 @@
-"""Core modules for document processing and search"""
-from .parser import DocumentParser
-from .embedder import EmbeddingEngine
-from .vector_search import VectorSearch
+"""Core modules for document processing and search
 
-__all__ = ["DocumentParser", "EmbeddingEngine", "VectorSearch"]
+임베딩(torch, sentence-transformers)과 벡터 DB(chromadb)는 import에 수 초가 걸리므로,
+패키지를 import할 때가 아니라 각 클래스를 처음 사용할 때 해당 모듈을 import합니다.
+"""
+from importlib import import_module
+from typing import TYPE_CHECKING
 
+# 공개 이름 → 정의된 하위 모듈
+_EXPORTS = {
+    "DocumentParser": ".parser",
+    "EmbeddingEngine": ".embedder",
+    "VectorSearch": ".vector_search",
+    "EmbeddingCache": ".embedding_cache",
+    "TextCache": ".text_cache",
+}
+
+__all__ = list(_EXPORTS)
+
+if TYPE_CHECKING:
+    from .parser import DocumentParser
+    from .embedder import EmbeddingEngine
+    from .vector_search import VectorSearch
+    from .embedding_cache import EmbeddingCache
+    from .text_cache import TextCache
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
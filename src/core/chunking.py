@@ -0,0 +1,161 @@
+"""토큰 기준 청크 분할 - 임베딩 모델의 토크나이저로 길이 측정"""
+from typing import Iterable, Iterator, List, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 가능하면 이 문자 바로 뒤에서 청크를 자름 (문자 기준 분할과 같은 집합)
+_BOUNDARY_CHARS = frozenset(" \n\t.,!?")
+
+
+class TokenChunker:
+    """
+    토큰 수 기준 청크 분할기
+
+    텍스트를 fast 토크나이저로 한 번에 토큰화하고 오프셋으로 max_tokens 토큰 이내의 구간을 잘라냅니다.
+    가능하면 청크 뒤쪽 절반 안의 단어/문장 경계에서 자르고, 잘라낸 청크들은 한 번의 배치 토큰화로
+    다시 세어 max_tokens를 넘는 청크(문맥에 따라 토큰화가 달라지는 드문 경우)는 더 작게 나눕니다.
+    따라서 모든 청크가 모델의 최대 시퀀스 길이 안에 들어가 잘리는 토큰이 없습니다.
+    """
+
+    def __init__(self, tokenizer, max_tokens: int, overlap: int = 0):
+        """
+        Args:
+            tokenizer: Hugging Face fast 토크나이저 (offset mapping 지원)
+            max_tokens: 청크당 최대 토큰 수 (특수 토큰 제외)
+            overlap: 청크 간 중복 토큰 수 (청크의 1/4을 넘지 않음)
+        """
+        if not getattr(tokenizer, "is_fast", False):
+            raise ValueError("TokenChunker requires a fast tokenizer with offset mapping")
+
+        self.tokenizer = tokenizer
+        self.max_tokens = max(1, max_tokens)
+        self.overlap = max(0, min(overlap, self.max_tokens // 4))
+        if self.overlap < overlap:
+            logger.info(f"Chunk overlap reduced to {self.overlap} tokens for {self.max_tokens}-token chunks")
+
+    def length(self, text: str) -> int:
+        """텍스트의 토큰 수 (특수 토큰 제외)"""
+        return len(self._encode(text)["input_ids"])
+
+    def split(self, text: str) -> List[str]:
+        """
+        텍스트를 청크로 분할
+
+        Args:
+            text: 분할할 텍스트
+
+        Returns:
+            청크 리스트
+        """
+        if not text.strip():
+            return []
+        chunks, _ = self._split(text, final=True)
+        return chunks
+
+    def split_stream(self, pieces: Iterable[str]) -> Iterator[str]:
+        """
+        이어지는 텍스트 조각들을 청크로 분할 (전체 텍스트를 만들지 않음)
+
+        버퍼가 충분히 모이면 토큰화하여 끝에 닿지 않는 청크들만 내보내고 나머지는 다음 조각과 이어 붙입니다.
+
+        Args:
+            pieces: 순서대로 이어 붙일 텍스트 조각
+
+        Yields:
+            청크 텍스트
+        """
+        buffer = ""
+        # 토큰은 대개 한 글자 이상이므로 이만큼 모이면 청크 여러 개를 자를 수 있음
+        threshold = base_threshold = self.max_tokens * 16
+
+        for piece in pieces:
+            buffer += piece
+            if len(buffer) < threshold:
+                continue
+
+            chunks, consumed = self._split(buffer, final=False)
+            yield from chunks
+            buffer = buffer[consumed:]
+            # 청크를 하나도 못 자르면 (토큰이 아주 긴 경우) 다시 토큰화하기 전에 더 모음
+            threshold = base_threshold if consumed else threshold * 2
+
+        if buffer.strip():
+            chunks, _ = self._split(buffer, final=True)
+            yield from chunks
+
+    def _encode(self, text, offsets: bool = False):
+        return self.tokenizer(
+            text,
+            add_special_tokens=False,
+            return_offsets_mapping=offsets,
+            return_attention_mask=False,
+            verbose=False
+        )
+
+    def _split(self, text: str, final: bool, limit: int = 0) -> Tuple[List[str], int]:
+        """
+        텍스트를 limit 토큰 이내 청크로 분할
+
+        Args:
+            text: 분할할 텍스트
+            final: False면 텍스트 끝에 닿는 마지막 청크는 내보내지 않음 (이어질 조각이 있음)
+            limit: 청크당 최대 토큰 수 (0이면 max_tokens)
+
+        Returns:
+            (청크 리스트, 처리한 문자 수)
+        """
+        limit = limit or self.max_tokens
+        offsets = self._encode(text, offsets=True)["offset_mapping"]
+        total = len(offsets)
+        overlap = min(self.overlap, limit // 4)
+
+        chunks = []
+        start = 0
+        while start < total:
+            end = start + limit
+            if end >= total:
+                if not final:
+                    return self._fit(chunks), offsets[start][0]
+                chunks.append(text[offsets[start][0]:].strip())
+                break
+
+            # 청크 뒤쪽 절반 안에서 경계 뒤에 오는 토큰을 찾아 그 앞에서 자름
+            boundary = end
+            while boundary > start + limit // 2 and not self._is_boundary(text, offsets[boundary][0]):
+                boundary -= 1
+            if boundary > start + limit // 2:
+                end = boundary
+
+            chunks.append(text[offsets[start][0]:offsets[end][0]].strip())
+            start = max(end - overlap, start + 1)
+
+        return self._fit([chunk for chunk in chunks if chunk]), len(text)
+
+    def _fit(self, chunks: List[str]) -> List[str]:
+        """청크들을 배치로 다시 세어 max_tokens를 넘는 청크를 더 작게 분할"""
+        chunks = [chunk for chunk in chunks if chunk]
+        if not chunks:
+            return chunks
+
+        lengths = [len(ids) for ids in self._encode(chunks)["input_ids"]]
+        if all(length <= self.max_tokens for length in lengths):
+            return chunks
+
+        fitted = []
+        for chunk, length in zip(chunks, lengths):
+            if length <= self.max_tokens:
+                fitted.append(chunk)
+                continue
+            # 넘친 만큼 한도를 줄여 다시 분할 (한도는 항상 줄어들므로 끝남)
+            smaller = max(1, self.max_tokens - (length - self.max_tokens))
+            fitted.extend(self._split(chunk, final=True, limit=smaller)[0])
+        return fitted
+
+    @staticmethod
+    def _is_boundary(text: str, position: int) -> bool:
+        """position에서 시작하는 토큰 앞이 단어/문장 경계인지 확인"""
+        return position == 0 or text[position - 1] in _BOUNDARY_CHARS or text[position] in _BOUNDARY_CHARS
+
+    def __repr__(self) -> str:
+        return f"TokenChunker(max_tokens={self.max_tokens}, overlap={self.overlap})"
@@ -0,0 +1,199 @@
+"""임베딩 워커 풀 - 여러 프로세스에 모델을 하나씩 올려 배치를 나눠 임베딩"""
+from multiprocessing.connection import wait as wait_connections
+from typing import List, Optional, Sequence
+import logging
+import multiprocessing
+import os
+import signal
+import weakref
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# 워커 → 풀 메시지 종류
+_READY = "ready"
+_RESULT = "result"
+_ERROR = "error"
+
+# 종료 요청 후 워커가 스스로 끝나기를 기다리는 시간 (초)
+_STOP_TIMEOUT = 5.0
+
+
+def default_worker_threads(workers: int) -> int:
+    """워커 하나의 연산 스레드 수 (CPU 코어를 워커 수로 나눔)"""
+    return max(1, (os.cpu_count() or 1) // max(1, workers))
+
+
+def _worker_main(conn, options: dict, threads: int):
+    """워커 프로세스 본체: 모델을 로드한 뒤 (배치 번호, 텍스트)를 받아 임베딩을 돌려보냄"""
+    # Ctrl-C는 부모 프로세스가 처리
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    # 스레드 수는 워커 수 × 스레드가 코어 수를 넘지 않도록 풀이 정함
+    os.environ["TOKENIZERS_PARALLELISM"] = "false"
+    os.environ["OMP_NUM_THREADS"] = str(threads)
+
+    try:
+        from .embedder import EmbeddingEngine
+        engine = EmbeddingEngine(**options, threads=threads)
+    except Exception as e:
+        conn.send((_ERROR, None, f"{type(e).__name__}: {e}"))
+        return
+    conn.send((_READY, None, engine.backend))
+
+    while True:
+        try:
+            task = conn.recv()
+        except (EOFError, OSError):
+            return
+        if task is None:
+            return
+
+        index, texts = task
+        try:
+            conn.send((_RESULT, index, engine._encode_batch(texts, len(texts))))
+        except Exception as e:
+            conn.send((_ERROR, index, f"{type(e).__name__}: {e}"))
+
+
+class _Worker:
+    """풀이 관리하는 워커 프로세스 하나"""
+
+    def __init__(self, context, options: dict, threads: int, index: int):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=_worker_main,
+            args=(child_conn, options, threads),
+            name=f"memorag-embed-{index}",
+            daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+
+    def receive(self) -> tuple:
+        """메시지 하나 받기 (워커가 죽었으면 RuntimeError)"""
+        try:
+            return self.conn.recv()
+        except (EOFError, OSError):
+            self.process.join(1.0)
+            raise RuntimeError(
+                f"Embedding worker {self.process.name} exited unexpectedly (exit code {self.process.exitcode})"
+            )
+
+    def stop(self):
+        """종료 요청 후 대기, 끝나지 않으면 강제 종료"""
+        try:
+            self.conn.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+        self.process.join(_STOP_TIMEOUT)
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join()
+        self.conn.close()
+
+
+def _stop_workers(workers: List[_Worker]):
+    for worker in workers:
+        worker.stop()
+    workers.clear()
+
+
+class EmbeddingPool:
+    """
+    임베딩 워커 프로세스 풀
+
+    워커마다 모델을 하나씩 로드하고 연산 스레드 수를 (코어 수 / 워커 수)로 제한하여, 한 프로세스의
+    스레드를 늘릴 때보다 코어 수에 가깝게 처리량을 늘립니다. 배치는 먼저 비는 워커에 차례로 맡기고
+    결과는 배치 순서대로 돌려주므로, 어느 워커가 처리했는지와 관계없이 결과가 같습니다.
+    워커는 처음 encode()할 때 시작되고 close() 또는 인터프리터 종료 시 정리됩니다.
+    """
+
+    def __init__(self, engine_options: dict, workers: int, threads: int = 0):
+        """
+        Args:
+            engine_options: 워커에서 EmbeddingEngine을 만들 인자 (model_name, backend 등)
+            workers: 워커 프로세스 수
+            threads: 워커 하나의 연산 스레드 수 (0이면 코어 수 / 워커 수)
+        """
+        self.engine_options = engine_options
+        self.workers = max(1, workers)
+        self.threads = threads or default_worker_threads(self.workers)
+
+        # torch/OpenMP 스레드 풀이 있는 프로세스를 fork하면 교착될 수 있으므로 spawn 사용
+        self._context = multiprocessing.get_context("spawn")
+        self._workers: List[_Worker] = []
+        self._finalizer = weakref.finalize(self, _stop_workers, self._workers)
+
+    def start(self):
+        """워커를 시작하고 모두 모델을 로드할 때까지 대기"""
+        if self._workers:
+            return
+
+        logger.info(f"Starting {self.workers} embedding workers ({self.threads} threads each)")
+        self._workers.extend(
+            _Worker(self._context, self.engine_options, self.threads, index + 1) for index in range(self.workers)
+        )
+        try:
+            for worker in self._workers:
+                kind, _, payload = worker.receive()
+                if kind == _ERROR:
+                    raise RuntimeError(f"Embedding worker failed to load the model: {payload}")
+        except BaseException:
+            self.close()
+            raise
+
+    def encode(self, batches: Sequence[List[str]]) -> List[np.ndarray]:
+        """
+        배치들을 워커에 나눠 임베딩
+
+        Args:
+            batches: 텍스트 배치 리스트 (배치 하나는 한 번의 model.encode 호출)
+
+        Returns:
+            배치 순서대로의 임베딩 배열 리스트
+        """
+        self.start()
+
+        results: List[Optional[np.ndarray]] = [None] * len(batches)
+        tasks = iter(enumerate(batches))
+        idle = list(self._workers)
+        busy = {}
+        try:
+            while True:
+                while idle:
+                    task = next(tasks, None)
+                    if task is None:
+                        break
+                    worker = idle.pop()
+                    worker.conn.send(task)
+                    busy[worker.conn] = worker
+
+                if not busy:
+                    return results
+
+                ready = set(wait_connections(list(busy) + [worker.process.sentinel for worker in busy.values()]))
+                for conn, worker in list(busy.items()):
+                    if conn not in ready and worker.process.sentinel not in ready:
+                        continue
+                    del busy[conn]
+                    kind, index, payload = worker.receive()
+                    if kind == _ERROR:
+                        raise RuntimeError(f"Embedding worker failed: {payload}")
+                    results[index] = payload
+                    idle.append(worker)
+        except BaseException:
+            # 처리 중인 배치의 결과가 다음 호출에 섞이지 않도록 워커를 모두 정리 (다음 호출 때 다시 시작)
+            self.close()
+            raise
+
+    def close(self):
+        """워커 종료"""
+        _stop_workers(self._workers)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -1,12 +1,42 @@
 """임베딩 엔진 - 텍스트를 벡터로 변환"""
-from typing import List, Union
+from typing import List, Optional, Sequence, Union
 import logging
-import torch
-from sentence_transformers import SentenceTransformer
+import numpy as np
+
+from .embedding_cache import EmbeddingCache
 
 logger = logging.getLogger(__name__)
 
 
+def plan_batches(lengths: Sequence[int], max_tokens: int) -> List[List[int]]:
+    """
+    토큰 예산 안에서 길이가 비슷한 텍스트끼리 배치 구성
+    
+    배치는 가장 긴 텍스트 길이로 패딩되므로, 길이 내림차순으로 정렬한 뒤
+    (배치 크기 × 배치의 첫(가장 긴) 텍스트 길이)가 max_tokens를 넘지 않을 때까지 채웁니다.
+    짧은 텍스트는 큰 배치로, 긴 텍스트는 작은 배치로 묶입니다.
+    
+    Args:
+        lengths: 텍스트별 토큰 수
+        max_tokens: 배치 하나의 최대 (패딩 포함) 토큰 수
+        
+    Returns:
+        배치별 원래 인덱스 리스트 (긴 배치부터)
+    """
+    order = sorted(range(len(lengths)), key=lambda idx: -lengths[idx])
+    batches = []
+    batch = []
+    for idx in order:
+        # 정렬되어 있으므로 batch[0]이 배치에서 가장 긺
+        if batch and (len(batch) + 1) * max(lengths[batch[0]], 1) > max_tokens:
+            batches.append(batch)
+            batch = []
+        batch.append(idx)
+    if batch:
+        batches.append(batch)
+    return batches
+
+
 class EmbeddingEngine:
     """텍스트를 벡터로 변환하는 임베딩 엔진"""
     
@@ -14,48 +44,178 @@ class EmbeddingEngine:
         self,
         model_name: str = "paraphrase-multilingual-MiniLM-L12-v2",
         device: str = "cpu",
-        batch_size: int = 32
+        batch_size: int = 32,
+        cache: Optional[EmbeddingCache] = None,
+        backend: str = "torch",
+        quantize: bool = False,
+        onnx_dir: str = "./models/onnx",
+        max_batch_tokens: Optional[int] = None,
+        bucket_window: int = 256,
+        parallel_workers: int = 0,
+        worker_threads: int = 0,
+        threads: int = 0
     ):
         """
         Args:
             model_name: 사용할 임베딩 모델 이름
-            device: 연산 디바이스 ("cpu" or "cuda")
+            device: 연산 디바이스 ("cpu" or "cuda", onnx 백엔드는 항상 CPU)
             batch_size: 배치 처리 크기
+            cache: 임베딩 디스크 캐시 (None이면 캐시 사용 안 함)
+            backend: 실행 백엔드 (torch: sentence-transformers, onnx: ONNX Runtime).
+                onnx는 처음 사용할 때 모델을 onnx_dir에 내보내며(torch 필요), 실패하면 torch 사용
+            quantize: onnx 백엔드에서 int8 동적 양자화 모델 사용
+            onnx_dir: ONNX로 내보낸 모델 저장 디렉토리
+            max_batch_tokens: 배치 하나의 최대 (패딩 포함) 토큰 수. 텍스트를 토큰 길이순으로 묶어
+                짧은 텍스트는 더 큰 배치로 처리 (None이면 batch_size × 모델 최대 시퀀스 길이, 0이면
+                길이와 상관없이 batch_size개씩)
+            bucket_window: 인덱싱 중 길이별로 묶기 위해 한 번에 embed()에 넘기는 청크 수
+                (클수록 길이가 비슷한 청크끼리 모이지만 결과가 늦게 나옴)
+            parallel_workers: 문서 임베딩을 나눠 처리할 워커 프로세스 수 (2 이상이면 워커마다 모델을
+                로드하여 배치를 나눠 처리, 0/1이면 현재 프로세스에서 처리)
+            worker_threads: 워커 하나의 연산 스레드 수 (0이면 CPU 코어 수 / 워커 수)
+            threads: 현재 프로세스의 연산 스레드 수 (0이면 라이브러리 기본값)
         """
         self.model_name = model_name
         self.device = device
         self.batch_size = batch_size
+        self.cache = cache
+        self.backend = backend
+        self.quantize = quantize
+        self.onnx_dir = onnx_dir
+        self.max_batch_tokens = max_batch_tokens
+        self.bucket_window = bucket_window
+        self.parallel_workers = parallel_workers
+        self.worker_threads = worker_threads
+        self.threads = threads
         self.model = None
+        self._pool = None
         
         logger.info(f"Initializing embedding engine with model: {model_name}")
         self._load_model()
     
     def _load_model(self):
         """모델 로드"""
+        if self.backend == "onnx":
+            if self._load_onnx_model():
+                return
+        elif self.backend != "torch":
+            raise ValueError(f"Unknown embedding backend: {self.backend} (choose from torch, onnx)")
+        
+        # torch/sentence-transformers는 import에 몇 초가 걸리므로 모델을 만들 때 import
+        from sentence_transformers import SentenceTransformer
+        
         try:
             self.model = SentenceTransformer(self.model_name, device=self.device)
+            if self.threads:
+                import torch
+                torch.set_num_threads(self.threads)
             logger.info(f"Model loaded successfully on {self.device}")
         except Exception as e:
             logger.error(f"Failed to load model: {e}")
             raise
     
-    def embed(self, texts: Union[str, List[str]], prefix: str = "") -> List[List[float]]:
+    def _load_onnx_model(self) -> bool:
+        """ONNX Runtime 인코더 로드 (실패하면 경고 후 False를 반환하여 torch 사용)"""
+        from .onnx_backend import load_onnx_encoder
+        
+        if self.device != "cpu":
+            logger.info(f"ONNX backend runs on CPU; ignoring device '{self.device}'")
+        try:
+            self.model = load_onnx_encoder(
+                self.model_name, self.onnx_dir, quantize=self.quantize, threads=self.threads
+            )
+        except Exception as e:
+            logger.warning(f"Could not load ONNX model for {self.model_name}: {e}; using the torch backend")
+            self.backend = "torch"
+            return False
+        
+        self.device = "cpu"
+        logger.info(f"ONNX model loaded{' (int8)' if self.quantize else ''}: {self.model.model_dir}")
+        return True
+    
+    @property
+    def cache_name(self) -> str:
+        """
+        임베딩 캐시 키에 쓰는 모델 이름
+        
+        ONNX fp32는 torch와 같은 벡터를 내므로 같은 이름을 쓰고, int8 양자화 결과는 조금 다르므로 구분합니다.
+        """
+        if self.backend == "onnx" and self.quantize:
+            return f"{self.model_name}#int8"
+        return self.model_name
+    
+    @property
+    def embed_window(self) -> int:
+        """
+        인덱싱 중 embed() 한 번에 넘길 청크 수
+        
+        embed()에 넘긴 텍스트 안에서만 길이별로 묶거나 워커에 나눌 수 있으므로, 길이별 배치나 워커
+        프로세스를 쓰면 batch_size보다 많이 모아서 넘깁니다.
+        """
+        if not self._batch_token_budget():
+            window = self.batch_size
+        else:
+            window = max(self.batch_size, self.bucket_window)
+        # 워커마다 배치가 돌아가도록 워커 수만큼 더 모음
+        return window * max(1, self.parallel_workers)
+    
+    def embed(
+        self,
+        texts: Union[str, List[str]],
+        prefix: str = "",
+        use_cache: bool = True
+    ) -> np.ndarray:
         """
         텍스트를 벡터로 변환
         
         Args:
             texts: 임베딩할 텍스트 (문자열 또는 리스트)
             prefix: 텍스트 앞에 붙일 접두사 (일부 모델에서 사용)
+            use_cache: 임베딩 캐시 사용 여부 (캐시가 설정된 경우)
             
         Returns:
-            임베딩 벡터 리스트 (각 벡터는 float 리스트)
+            (len(texts), dim) 크기의 float32 배열 (행 하나가 텍스트 하나의 벡터)
         """
         if isinstance(texts, str):
             texts = [texts]
         
         if not texts:
-            return []
+            return np.empty((0, self.get_dimension()), dtype=np.float32)
+        
+        if self.cache is None or not use_cache:
+            return np.asarray(self._encode(texts, prefix), dtype=np.float32)
+        
+        # 캐시에 없는 텍스트만 모델로 임베딩
+        keys = [EmbeddingCache.make_key(self.cache_name, prefix, text) for text in texts]
+        cached = self.cache.get_many(keys)
+        
+        # 캐시에 없는 키 → 처음 나온 위치 (같은 텍스트가 한 배치에 여러 번 나와도 한 번만 임베딩)
+        missing = {}
+        for idx, key in enumerate(keys):
+            if key not in cached:
+                missing.setdefault(key, idx)
+        hits = sum(1 for key in keys if key in cached)
+        logger.debug(f"Embedding cache: {hits} hits, {len(keys) - hits} misses ({len(missing)} unique)")
+        
+        if missing:
+            new_embeddings = self._encode([texts[idx] for idx in missing.values()], prefix)
+            new_keys = [*missing]
+            self.cache.put_many(new_keys, new_embeddings, model_name=self.cache_name)
+            cached.update(zip(new_keys, new_embeddings))
+        
+        return np.stack([cached[key] for key in keys]).astype(np.float32, copy=False)
+    
+    def _encode(self, texts: List[str], prefix: str = "") -> np.ndarray:
+        """
+        모델로 텍스트 임베딩
         
+        Args:
+            texts: 임베딩할 텍스트 리스트
+            prefix: 텍스트 앞에 붙일 접두사
+            
+        Returns:
+            (len(texts), dim) 크기의 numpy 배열
+        """
         # multilingual-e5 모델은 query와 passage에 다른 접두사 사용
         if prefix:
             texts = [f"{prefix}: {text}" for text in texts]
@@ -63,25 +223,101 @@ class EmbeddingEngine:
         try:
             logger.debug(f"Embedding {len(texts)} texts...")
             
-            # 배치 처리
-            embeddings = self.model.encode(
-                texts,
-                batch_size=self.batch_size,
-                show_progress_bar=False,
-                convert_to_numpy=True
-            )
+            lengths = self._token_lengths(texts)
+            max_tokens = self._batch_token_budget()
+            if lengths is not None and max_tokens:
+                # 토큰 길이가 비슷한 텍스트끼리 묶어 패딩을 줄이고, 결과는 입력 순서로 되돌림
+                batches = plan_batches(lengths, max_tokens)
+            elif self.parallel_workers > 1:
+                batches = [
+                    list(range(start, min(start + self.batch_size, len(texts))))
+                    for start in range(0, len(texts), self.batch_size)
+                ]
+            else:
+                # 고정 크기 배치 처리
+                batches = None
             
-            # numpy array를 리스트로 변환
-            embeddings_list = embeddings.tolist()
+            if batches is None:
+                embeddings = self._encode_batch(texts, self.batch_size)
+            else:
+                batch_texts = [[texts[idx] for idx in batch] for batch in batches]
+                if self.parallel_workers > 1 and len(batches) > 1:
+                    outputs = self._get_pool().encode(batch_texts)
+                else:
+                    outputs = (self._encode_batch(batch, len(batch)) for batch in batch_texts)
+                
+                embeddings = None
+                for batch, batch_embeddings in zip(batches, outputs):
+                    if embeddings is None:
+                        embeddings = np.empty((len(texts), batch_embeddings.shape[1]), dtype=batch_embeddings.dtype)
+                    embeddings[batch] = batch_embeddings
             
-            logger.debug(f"Generated {len(embeddings_list)} embeddings")
-            return embeddings_list
+            logger.debug(f"Generated {len(embeddings)} embeddings")
+            return embeddings
             
         except Exception as e:
             logger.error(f"Error during embedding: {e}")
             raise
     
-    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+    def _encode_batch(self, texts: List[str], batch_size: int) -> np.ndarray:
+        """모델 encode 호출"""
+        return self.model.encode(
+            texts,
+            batch_size=batch_size,
+            show_progress_bar=False,
+            convert_to_numpy=True
+        )
+    
+    def _get_pool(self):
+        """임베딩 워커 풀 (처음 쓸 때 생성, 워커는 같은 모델/백엔드로 각자 모델을 로드)"""
+        if self._pool is None:
+            from .embed_pool import EmbeddingPool
+            
+            options = {
+                "model_name": self.model_name,
+                "device": self.device,
+                "batch_size": self.batch_size,
+                "backend": self.backend,
+                "quantize": self.quantize,
+                "onnx_dir": self.onnx_dir
+            }
+            self._pool = EmbeddingPool(options, self.parallel_workers, self.worker_threads)
+        return self._pool
+    
+    def close(self):
+        """임베딩 워커 프로세스 종료 (다시 임베딩하면 새로 시작)"""
+        if self._pool is not None:
+            self._pool.close()
+    
+    def _batch_token_budget(self) -> int:
+        """배치 하나의 최대 토큰 수 (0이면 고정 크기 배치)"""
+        if self.max_batch_tokens is not None:
+            return self.max_batch_tokens
+        max_length = getattr(self.model, "max_seq_length", None)
+        return self.batch_size * max_length if max_length else 0
+    
+    def _token_lengths(self, texts: List[str]) -> Optional[List[int]]:
+        """
+        텍스트별 토큰 수 (특수 토큰 포함, 모델 최대 길이에서 잘림)
+        
+        Returns:
+            토큰 수 리스트 (토크나이저가 없거나 텍스트가 하나뿐이면 None)
+        """
+        tokenizer = self.tokenizer
+        if tokenizer is None or len(texts) < 2:
+            return None
+        
+        max_length = getattr(self.model, "max_seq_length", None)
+        encoded = tokenizer(
+            texts,
+            truncation=bool(max_length),
+            max_length=max_length,
+            return_attention_mask=False,
+            return_token_type_ids=False
+        )
+        return [len(ids) for ids in encoded["input_ids"]]
+    
+    def embed_documents(self, texts: List[str]) -> np.ndarray:
         """
         문서 텍스트를 임베딩 (passage용)
         
@@ -89,14 +325,12 @@ class EmbeddingEngine:
             texts: 문서 텍스트 리스트
             
         Returns:
-            임베딩 벡터 리스트
+            (len(texts), dim) 크기의 float32 배열
         """
         # multilingual-e5 모델의 경우 passage 접두사 사용
-        if "e5" in self.model_name.lower():
-            return self.embed(texts, prefix="passage")
-        return self.embed(texts)
+        return self.embed(texts, prefix=self._document_prefix())
     
-    def embed_query(self, text: str) -> List[float]:
+    def embed_query(self, text: str) -> np.ndarray:
         """
         쿼리 텍스트를 임베딩 (query용)
         
@@ -104,15 +338,45 @@ class EmbeddingEngine:
             text: 쿼리 텍스트
             
         Returns:
-            임베딩 벡터
+            (dim,) 크기의 float32 벡터
         """
         # multilingual-e5 모델의 경우 query 접두사 사용
+        # 쿼리는 재사용되는 경우가 드물어 캐시에 넣지 않음
         if "e5" in self.model_name.lower():
-            embeddings = self.embed([text], prefix="query")
+            embeddings = self.embed([text], prefix="query", use_cache=False)
         else:
-            embeddings = self.embed([text])
+            embeddings = self.embed([text], use_cache=False)
+        
+        return embeddings[0]
+    
+    def _document_prefix(self) -> str:
+        """문서 임베딩에 붙이는 접두사 (multilingual-e5 모델은 passage)"""
+        return "passage" if "e5" in self.model_name.lower() else ""
+    
+    @property
+    def tokenizer(self):
+        """모델의 토크나이저 (없으면 None)"""
+        return getattr(self.model, "tokenizer", None)
+    
+    def max_chunk_tokens(self) -> Optional[int]:
+        """
+        문서 청크 하나가 잘리지 않고 임베딩되는 최대 토큰 수
         
-        return embeddings[0] if embeddings else []
+        모델의 최대 시퀀스 길이에서 특수 토큰([CLS], [SEP] 등)과 문서 접두사가 차지하는 토큰을 뺀 값입니다.
+        
+        Returns:
+            최대 토큰 수 (모델이 알려 주지 않으면 None)
+        """
+        tokenizer = self.tokenizer
+        max_length = getattr(self.model, "max_seq_length", None)
+        if tokenizer is None or not max_length:
+            return None
+        
+        reserved = tokenizer.num_special_tokens_to_add(pair=False)
+        prefix = self._document_prefix()
+        if prefix:
+            reserved += len(tokenizer(f"{prefix}: ", add_special_tokens=False)["input_ids"])
+        return max_length - reserved
     
     def get_dimension(self) -> int:
         """임베딩 벡터 차원 반환"""
@@ -121,5 +385,8 @@ class EmbeddingEngine:
         return self.model.get_sentence_embedding_dimension()
     
     def __repr__(self) -> str:
-        return f"EmbeddingEngine(model={self.model_name}, device={self.device}, dim={self.get_dimension()})"
+        return (
+            f"EmbeddingEngine(model={self.model_name}, backend={self.backend}, "
+            f"device={self.device}, dim={self.get_dimension()})"
+        )
 
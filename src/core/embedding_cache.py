@@ -0,0 +1,320 @@
+"""임베딩 캐시 - 동일한 텍스트의 재임베딩을 막는 디스크 캐시"""
+from pathlib import Path
+from typing import Dict, List, Optional
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import time
+import unicodedata
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+class EmbeddingCache:
+    """
+    내용 주소 기반 임베딩 캐시
+
+    (모델 이름, 접두사, 정규화된 텍스트) 해시를 키로 사용하므로 컬렉션이나 파일 경로와 무관하게
+    같은 텍스트는 한 번만 임베딩됩니다. 벡터는 차원별 float32 파일(memmap)에 이어 쓰고,
+    키 → 슬롯 색인은 SQLite에 저장합니다. 전체 크기가 max_size_mb를 넘으면
+    가장 오래 사용되지 않은 항목부터 제거하고 벡터 파일을 압축합니다.
+    """
+
+    INDEX_FILE = "index.sqlite3"
+
+    def __init__(self, directory: str = "./cache/embeddings", max_size_mb: int = 2048):
+        """
+        Args:
+            directory: 캐시 저장 디렉토리
+            max_size_mb: 벡터 파일 최대 크기 (MB)
+        """
+        self.directory = Path(directory)
+        self.max_bytes = int(max_size_mb * 1024 * 1024)
+        self.hits = 0
+        self.misses = 0
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.directory / self.INDEX_FILE), check_same_thread=False)
+        self._maps: Dict[int, np.memmap] = {}
+        self._initialize()
+
+    def _initialize(self):
+        """색인 테이블 생성"""
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                model_name TEXT NOT NULL,
+                dim INTEGER NOT NULL,
+                slot INTEGER NOT NULL,
+                last_used REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_last_used ON entries(last_used)")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS slots (dim INTEGER PRIMARY KEY, next_slot INTEGER NOT NULL)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(model_name: str, prefix: str, text: str) -> str:
+        """
+        캐시 키 생성
+
+        Args:
+            model_name: 임베딩 모델 이름
+            prefix: 텍스트 접두사 (e5 모델의 "passage" 등)
+            text: 원본 텍스트 (유니코드 정규화 및 공백 정리 후 해시)
+
+        Returns:
+            캐시 키 (hex 문자열)
+        """
+        normalized = _WHITESPACE.sub(" ", unicodedata.normalize("NFC", text)).strip()
+        content = f"{model_name}\x00{prefix}\x00{normalized}"
+        return hashlib.sha1(content.encode("utf-8")).hexdigest()
+
+    def get_many(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        """
+        캐시된 벡터 조회
+
+        Args:
+            keys: 캐시 키 리스트
+
+        Returns:
+            찾은 키 → 벡터 딕셔너리 (없는 키는 포함되지 않음)
+        """
+        found = {}
+        if not keys:
+            return found
+
+        rows = []
+        unique_keys = list(dict.fromkeys(keys))
+        # SQLite 변수 개수 제한을 피하기 위해 나눠서 조회
+        for start in range(0, len(unique_keys), 500):
+            part = unique_keys[start:start + 500]
+            placeholders = ",".join("?" * len(part))
+            rows.extend(self._conn.execute(
+                f"SELECT key, dim, slot FROM entries WHERE key IN ({placeholders})", part
+            ).fetchall())
+
+        for key, dim, slot in rows:
+            vectors = self._vectors(dim)
+            if vectors is None or slot >= len(vectors):
+                continue
+            found[key] = np.array(vectors[slot])
+
+        if found:
+            now = time.time()
+            self._conn.executemany(
+                "UPDATE entries SET last_used = ? WHERE key = ?", [(now, key) for key in found]
+            )
+            self._conn.commit()
+
+        self.hits += sum(1 for key in keys if key in found)
+        self.misses += sum(1 for key in keys if key not in found)
+        return found
+
+    def put_many(self, keys: List[str], vectors: np.ndarray, model_name: str = ""):
+        """
+        벡터 저장 (새 키의 벡터만 벡터 파일 끝에 이어 씀)
+
+        Args:
+            keys: 캐시 키 리스트
+            vectors: (len(keys), dim) 크기의 벡터 배열
+            model_name: 통계용 모델 이름
+        """
+        if not keys:
+            return
+
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        dim = vectors.shape[1]
+
+        # 여러 프로세스가 같은 캐시를 쓸 수 있으므로 슬롯 할당과 파일 쓰기를 한 트랜잭션으로 묶음
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            # 이미 저장된 키(다른 프로세스가 먼저 저장한 경우 포함)와 같은 배치 안의 중복 키는
+            # 슬롯을 새로 잡지 않음 (버려진 슬롯이 파일 크기를 늘려 이른 정리를 일으키지 않도록)
+            first = {}
+            for idx, key in enumerate(keys):
+                first.setdefault(key, idx)
+            unique_keys = [*first]
+            for start in range(0, len(unique_keys), 500):
+                part = unique_keys[start:start + 500]
+                placeholders = ",".join("?" * len(part))
+                for (key,) in self._conn.execute(
+                    f"SELECT key FROM entries WHERE key IN ({placeholders})", part
+                ).fetchall():
+                    del first[key]
+
+            if not first:
+                self._conn.commit()
+                return
+
+            row = self._conn.execute("SELECT next_slot FROM slots WHERE dim = ?", (dim,)).fetchone()
+            next_slot = row[0] if row else 0
+
+            # 색인을 커밋하기 전에 벡터가 디스크에 있어야 전원이 꺼져도 슬롯이 빈 벡터를 가리키지 않음
+            path = self._vector_path(dim)
+            with open(path, "r+b" if path.exists() else "wb") as f:
+                f.seek(next_slot * dim * 4)
+                f.write(vectors[[*first.values()]].tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+
+            now = time.time()
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO entries VALUES (?, ?, ?, ?, ?)",
+                [(key, model_name, dim, next_slot + i, now) for i, key in enumerate(first)]
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO slots VALUES (?, ?)", (dim, next_slot + len(first))
+            )
+            self._conn.commit()
+        except Exception:
+            self._conn.rollback()
+            raise
+
+        self._maps.pop(dim, None)
+
+        if self.size_bytes() > self.max_bytes:
+            self.prune()
+
+    def stats(self) -> Dict:
+        """
+        캐시 통계
+
+        Returns:
+            항목 수, 파일 크기, 최대 크기, 모델별 항목 수, 이번 실행의 적중/실패 수
+        """
+        entries = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        models = dict(self._conn.execute(
+            "SELECT model_name, COUNT(*) FROM entries GROUP BY model_name"
+        ).fetchall())
+        return {
+            "directory": str(self.directory),
+            "entries": entries,
+            "size_bytes": self.size_bytes(),
+            "max_bytes": self.max_bytes,
+            "models": models,
+            "hits": self.hits,
+            "misses": self.misses
+        }
+
+    def size_bytes(self) -> int:
+        """벡터 파일 전체 크기 (바이트)"""
+        return sum(path.stat().st_size for path in self.directory.glob("vectors_*.f32"))
+
+    def prune(self, max_bytes: Optional[int] = None) -> int:
+        """
+        오래 사용되지 않은 항목을 제거하고 벡터 파일 압축
+
+        Args:
+            max_bytes: 목표 최대 크기 (None이면 설정값의 90%까지 줄임)
+
+        Returns:
+            제거된 항목 수
+        """
+        target = int(self.max_bytes * 0.9) if max_bytes is None else max_bytes
+
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            rows = self._conn.execute(
+                "SELECT key, dim, slot FROM entries ORDER BY last_used DESC"
+            ).fetchall()
+
+            # 최근 사용 순으로 목표 크기까지 남김
+            keep = []
+            total = 0
+            for key, dim, slot in rows:
+                size = dim * 4
+                if total + size > target:
+                    break
+                keep.append((key, dim, slot))
+                total += size
+
+            removed = len(rows) - len(keep)
+            self._compact(keep)
+            self._conn.commit()
+        except Exception:
+            self._conn.rollback()
+            raise
+
+        if removed:
+            logger.info(f"Pruned {removed} cached embeddings")
+        return removed
+
+    def clear(self) -> int:
+        """모든 항목 삭제"""
+        return self.prune(max_bytes=0)
+
+    def _compact(self, keep: List[tuple]):
+        """남길 항목만 새 벡터 파일에 연속으로 다시 씀 (트랜잭션 안에서 호출)"""
+        self._maps.clear()
+
+        keep_keys = {key for key, _, _ in keep}
+        stale = [
+            (key,) for (key,) in self._conn.execute("SELECT key FROM entries").fetchall()
+            if key not in keep_keys
+        ]
+        self._conn.executemany("DELETE FROM entries WHERE key = ?", stale)
+
+        by_dim: Dict[int, List[tuple]] = {}
+        for key, dim, slot in keep:
+            by_dim.setdefault(dim, []).append((slot, key))
+
+        dims = {int(path.stem.split("_")[1]) for path in self.directory.glob("vectors_*.f32")}
+        for dim in dims | set(by_dim):
+            items = sorted(by_dim.get(dim, []))
+            path = self._vector_path(dim)
+
+            if items and path.exists():
+                old = np.memmap(path, dtype=np.float32, mode="r").reshape(-1, dim)
+                tmp_path = path.with_suffix(".tmp")
+                with open(tmp_path, "wb") as f:
+                    for slot, _ in items:
+                        f.write(old[slot].tobytes())
+                del old
+                tmp_path.replace(path)
+            elif path.exists():
+                path.unlink()
+
+            self._conn.executemany(
+                "UPDATE entries SET slot = ? WHERE key = ?",
+                [(new_slot, key) for new_slot, (_, key) in enumerate(items)]
+            )
+            self._conn.execute("INSERT OR REPLACE INTO slots VALUES (?, ?)", (dim, len(items)))
+
+    def _vector_path(self, dim: int) -> Path:
+        return self.directory / f"vectors_{dim}.f32"
+
+    def _vectors(self, dim: int) -> Optional[np.memmap]:
+        """차원별 벡터 파일 memmap (파일이 커졌으면 다시 엶)"""
+        path = self._vector_path(dim)
+        if not path.exists():
+            return None
+
+        rows = path.stat().st_size // (dim * 4)
+        vectors = self._maps.get(dim)
+        if vectors is None or len(vectors) != rows:
+            if rows == 0:
+                return None
+            vectors = np.memmap(path, dtype=np.float32, mode="r", shape=(rows, dim))
+            self._maps[dim] = vectors
+        return vectors
+
+    def close(self):
+        """캐시 닫기"""
+        self._maps.clear()
+        self._conn.close()
+
+    def __repr__(self) -> str:
+        return f"EmbeddingCache(directory={self.directory}, max_size_mb={self.max_bytes // (1024 * 1024)})"
@@ -0,0 +1,257 @@
+"""ONNX Runtime 임베딩 백엔드 - torch 없이 CPU에서 sentence-transformers 모델 실행"""
+from pathlib import Path
+from typing import List, Optional
+import json
+import logging
+import re
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# 내보낸 모델 디렉토리 안의 파일
+MODEL_FILE = "model.onnx"
+QUANTIZED_FILE = "model_int8.onnx"
+CONFIG_FILE = "memorag_onnx.json"
+
+# 모델에 넘길 수 있는 토크나이저 출력 (내보낸 그래프가 실제로 받는 것만 사용)
+_INPUT_NAMES = ["input_ids", "attention_mask", "token_type_ids"]
+
+
+def onnx_model_dir(model_name: str, onnx_dir: str) -> Path:
+    """모델 이름별 ONNX 내보내기 디렉토리 (intfloat/multilingual-e5-base → intfloat__multilingual-e5-base)"""
+    return Path(onnx_dir) / re.sub(r"[^\w.-]+", "__", model_name)
+
+
+def export_onnx(model_name: str, output_dir: Path, quantize: bool = False, opset: int = 17) -> Path:
+    """
+    sentence-transformers 모델을 ONNX로 내보내기 (torch 필요, 한 번만 실행)
+
+    트랜스포머, 풀링, 정규화 등 모델의 모든 모듈을 하나의 그래프로 내보내므로 실행할 때는
+    토크나이저와 onnxruntime만 있으면 torch 경로와 같은 문장 임베딩을 얻습니다.
+
+    Args:
+        model_name: sentence-transformers 모델 이름 또는 경로
+        output_dir: 저장할 디렉토리
+        quantize: int8 동적 양자화 모델도 함께 생성
+        opset: ONNX opset 버전
+
+    Returns:
+        output_dir
+    """
+    try:
+        import torch
+        from sentence_transformers import SentenceTransformer
+    except ImportError:
+        raise ImportError("Exporting to ONNX requires torch and sentence-transformers")
+
+    model = SentenceTransformer(model_name, device="cpu")
+    model.eval()
+
+    sample = model.tokenize(["memoRAG ONNX export", "문서 검색 예시 문장"])
+    input_names = [name for name in _INPUT_NAMES if name in sample]
+
+    class SentenceEmbedding(torch.nn.Module):
+        """위치 인자로 토크나이저 출력을 받아 문장 임베딩을 반환 (torch.onnx.export용)"""
+
+        def __init__(self):
+            super().__init__()
+            self.model = model
+
+        def forward(self, *inputs):
+            return self.model(dict(zip(input_names, inputs)))["sentence_embedding"]
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes["sentence_embedding"] = {0: "batch"}
+
+    logger.info(f"Exporting {model_name} to ONNX: {output_dir}")
+    with torch.no_grad():
+        torch.onnx.export(
+            SentenceEmbedding(),
+            tuple(sample[name] for name in input_names),
+            str(output_dir / MODEL_FILE),
+            input_names=input_names,
+            output_names=["sentence_embedding"],
+            dynamic_axes=dynamic_axes,
+            opset_version=opset,
+            dynamo=False
+        )
+
+    model.tokenizer.save_pretrained(str(output_dir))
+    config = {
+        "model_name": model_name,
+        "max_seq_length": model.max_seq_length,
+        "dimension": getattr(model, "get_embedding_dimension", model.get_sentence_embedding_dimension)(),
+        "do_lower_case": bool(getattr(model[0], "do_lower_case", False))
+    }
+    (output_dir / CONFIG_FILE).write_text(json.dumps(config, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    if quantize:
+        quantize_onnx(output_dir)
+    return output_dir
+
+
+def quantize_onnx(model_dir: Path) -> Path:
+    """
+    내보낸 ONNX 모델을 int8 동적 양자화 (가중치만 int8, 활성값은 실행 중 양자화)
+
+    Returns:
+        양자화된 모델 파일 경로
+    """
+    try:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+    except ImportError:
+        raise ImportError("onnxruntime and onnx are required for quantization. Install: pip install onnx onnxruntime")
+
+    model_dir = Path(model_dir)
+    output = model_dir / QUANTIZED_FILE
+    logger.info(f"Quantizing {model_dir / MODEL_FILE} to int8")
+    quantize_dynamic(str(model_dir / MODEL_FILE), str(output), weight_type=QuantType.QInt8)
+    return output
+
+
+class OnnxSentenceEncoder:
+    """
+    ONNX Runtime 문장 인코더
+
+    SentenceTransformer 대신 EmbeddingEngine.model로 쓰도록 encode(), tokenizer, max_seq_length,
+    get_sentence_embedding_dimension()을 같은 방식으로 제공합니다.
+    """
+
+    def __init__(self, model_dir: Path, quantize: bool = False, threads: int = 0):
+        """
+        Args:
+            model_dir: export_onnx로 내보낸 디렉토리
+            quantize: int8 양자화 모델 사용 (없으면 만듦)
+            threads: 연산 스레드 수 (0이면 onnxruntime 기본값, 보통 물리 코어 수)
+        """
+        try:
+            import onnxruntime as ort
+            from transformers import AutoTokenizer
+        except ImportError:
+            raise ImportError("onnxruntime and transformers are required. Install: pip install onnxruntime")
+
+        self.model_dir = Path(model_dir)
+        config = json.loads((self.model_dir / CONFIG_FILE).read_text(encoding="utf-8"))
+        self.max_seq_length: int = config["max_seq_length"]
+        self._dimension: int = config["dimension"]
+        self._lower_case: bool = config.get("do_lower_case", False)
+
+        model_file = self.model_dir / (QUANTIZED_FILE if quantize else MODEL_FILE)
+        if quantize and not model_file.exists():
+            quantize_onnx(self.model_dir)
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads:
+            options.intra_op_num_threads = threads
+        self.session = ort.InferenceSession(str(model_file), options, providers=["CPUExecutionProvider"])
+        self._input_names = [node.name for node in self.session.get_inputs()]
+        self.tokenizer = AutoTokenizer.from_pretrained(str(self.model_dir))
+
+    def encode(
+        self,
+        texts: List[str],
+        batch_size: int = 32,
+        show_progress_bar: bool = False,
+        convert_to_numpy: bool = True
+    ) -> np.ndarray:
+        """
+        텍스트를 문장 임베딩으로 변환 (SentenceTransformer.encode와 같은 결과)
+
+        SentenceTransformer처럼 길이순으로 정렬해 배치를 만들어 패딩을 줄이고, 결과는 입력 순서로 되돌립니다.
+
+        Returns:
+            (len(texts), dim) float32 배열
+        """
+        if not texts:
+            return np.zeros((0, self._dimension), dtype=np.float32)
+
+        order = np.argsort([-len(text) for text in texts], kind="stable")
+        embeddings = []
+        for start in range(0, len(texts), batch_size):
+            batch = [texts[idx] for idx in order[start:start + batch_size]]
+            if self._lower_case:
+                batch = [text.lower() for text in batch]
+            features = self.tokenizer(
+                batch,
+                padding=True,
+                truncation=True,
+                max_length=self.max_seq_length,
+                return_tensors="np"
+            )
+            inputs = {name: features[name].astype(np.int64) for name in self._input_names}
+            embeddings.append(self.session.run(None, inputs)[0])
+
+        result = np.empty((len(texts), self._dimension), dtype=np.float32)
+        result[order] = np.concatenate(embeddings)
+        return result
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self._dimension
+
+    def __repr__(self) -> str:
+        return f"OnnxSentenceEncoder(model_dir={self.model_dir}, inputs={self._input_names})"
+
+
+def load_onnx_encoder(
+    model_name: str,
+    onnx_dir: str = "./models/onnx",
+    quantize: bool = False,
+    threads: int = 0
+) -> OnnxSentenceEncoder:
+    """
+    모델의 ONNX 인코더 로드 (내보낸 적이 없으면 먼저 내보냄 - 이때만 torch 필요)
+
+    Args:
+        model_name: sentence-transformers 모델 이름
+        onnx_dir: ONNX 모델 저장 디렉토리
+        quantize: int8 양자화 모델 사용
+        threads: 연산 스레드 수 (0이면 기본값)
+
+    Returns:
+        OnnxSentenceEncoder
+    """
+    model_dir = onnx_model_dir(model_name, onnx_dir)
+    if not (model_dir / CONFIG_FILE).exists():
+        export_onnx(model_name, model_dir, quantize=quantize)
+    return OnnxSentenceEncoder(model_dir, quantize=quantize, threads=threads)
+
+
+def cosine_parity(reference: np.ndarray, candidate: np.ndarray) -> np.ndarray:
+    """같은 텍스트의 두 임베딩 사이 코사인 유사도 (행별)"""
+    reference = reference / np.linalg.norm(reference, axis=1, keepdims=True)
+    candidate = candidate / np.linalg.norm(candidate, axis=1, keepdims=True)
+    return (reference * candidate).sum(axis=1)
+
+
+def score_drift(
+    reference_docs: np.ndarray,
+    reference_queries: np.ndarray,
+    candidate_docs: np.ndarray,
+    candidate_queries: np.ndarray,
+    top_k: Optional[int] = 5
+) -> dict:
+    """
+    검색 점수(질의-문서 코사인) 차이와 상위 k개 일치율
+
+    Returns:
+        {"max_abs": 최대 점수 차, "mean_abs": 평균 점수 차, "top_k_overlap": 상위 k개 겹침 비율}
+    """
+    def scores(docs, queries):
+        docs = docs / np.linalg.norm(docs, axis=1, keepdims=True)
+        queries = queries / np.linalg.norm(queries, axis=1, keepdims=True)
+        return queries @ docs.T
+
+    expected = scores(reference_docs, reference_queries)
+    actual = scores(candidate_docs, candidate_queries)
+    diff = np.abs(expected - actual)
+
+    k = min(top_k or expected.shape[1], expected.shape[1])
+    expected_top = np.argsort(-expected, axis=1)[:, :k]
+    actual_top = np.argsort(-actual, axis=1)[:, :k]
+    overlap = np.mean([len(set(e) & set(a)) / k for e, a in zip(expected_top, actual_top)])
+
+    return {"max_abs": float(diff.max()), "mean_abs": float(diff.mean()), "top_k_overlap": float(overlap)}
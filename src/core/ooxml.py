@@ -0,0 +1,138 @@
+"""ZIP + XML 문서(DOCX, PPTX, HWPX) 텍스트 스트리밍 추출"""
+from pathlib import PurePosixPath
+from typing import IO, Iterator, List
+import re
+import zipfile
+
+# DOCX 머리글/바닥글/각주 파트 (본문 앞뒤에 붙임)
+_DOCX_HEADER = re.compile(r"^word/header\d*\.xml$")
+_DOCX_FOOTER = re.compile(r"^word/footer\d*\.xml$")
+_DOCX_NOTES = ["word/footnotes.xml", "word/endnotes.xml"]
+
+
+def natural_key(name: str) -> tuple:
+    """숫자를 크기순으로 비교하는 정렬 키 (section2 < section10)"""
+    return tuple(int(part) if part.isdigit() else part for part in re.split(r"(\d+)", name))
+
+
+def iter_xml_paragraphs(source: IO[bytes], paragraph_tag: str = "p", text_tag: str = "t") -> Iterator[str]:
+    """
+    XML에서 단락 텍스트를 문서 순서대로 생성
+
+    전체 트리를 만들지 않고 iterparse로 읽으며, 처리한 단락은 바로 비워 메모리를 돌려줍니다.
+    표 셀이나 글상자처럼 단락 안에 중첩된 단락이 시작되면 바깥 단락의 앞부분을 먼저 내보내
+    순서를 유지합니다. 네임스페이스와 관계없이 로컬 이름으로 요소를 찾습니다.
+
+    Args:
+        source: XML 파일 객체
+        paragraph_tag: 단락 요소 이름 (hp:p, w:p, a:p)
+        text_tag: 텍스트 요소 이름 (hp:t, w:t, a:t)
+
+    Yields:
+        단락 텍스트 (빈 단락 제외)
+    """
+    from lxml import etree
+
+    # 열린 단락마다 지금까지 모은 텍스트 조각
+    stack: List[List[str]] = []
+
+    for event, element in etree.iterparse(
+        source, events=("start", "end"), tag=(f"{{*}}{paragraph_tag}", f"{{*}}{text_tag}")
+    ):
+        is_paragraph = etree.QName(element).localname == paragraph_tag
+
+        if event == "start":
+            if is_paragraph:
+                if stack and stack[-1]:
+                    text = "".join(stack[-1]).strip()
+                    stack[-1] = []
+                    if text:
+                        yield text
+                stack.append([])
+            continue
+
+        if not is_paragraph:
+            if stack:
+                stack[-1].append("".join(element.itertext()))
+            element.clear(keep_tail=True)
+            continue
+
+        text = "".join(stack.pop()).strip() if stack else ""
+        if text:
+            yield text
+
+        if not stack:
+            # 최상위 단락: 내용과 앞서 처리한 형제 요소를 지워 트리가 커지지 않게 함
+            element.clear(keep_tail=True)
+            parent = element.getparent()
+            if parent is not None:
+                while element.getprevious() is not None:
+                    del parent[0]
+
+
+def iter_docx_paragraphs(z: zipfile.ZipFile) -> Iterator[str]:
+    """
+    DOCX 단락 텍스트 생성 (머리글 → 본문(표 셀 포함) → 각주/미주 → 바닥글 순)
+
+    머리글/바닥글은 구역마다 같은 내용이 반복되는 경우가 많으므로 같은 단락은 한 번만 냅니다.
+
+    Raises:
+        KeyError: word/document.xml이 없음 (DOCX가 아님)
+    """
+    names = z.namelist()
+    if "word/document.xml" not in names:
+        raise KeyError("word/document.xml not found")
+
+    def iter_parts(parts, unique: bool):
+        seen = set()
+        for name in parts:
+            with z.open(name) as f:
+                for text in iter_xml_paragraphs(f):
+                    if unique:
+                        if text in seen:
+                            continue
+                        seen.add(text)
+                    yield text
+
+    yield from iter_parts(sorted((n for n in names if _DOCX_HEADER.match(n)), key=natural_key), unique=True)
+    yield from iter_parts(["word/document.xml"], unique=False)
+    yield from iter_parts([n for n in _DOCX_NOTES if n in names], unique=False)
+    yield from iter_parts(sorted((n for n in names if _DOCX_FOOTER.match(n)), key=natural_key), unique=True)
+
+
+def pptx_slide_parts(z: zipfile.ZipFile) -> List[str]:
+    """
+    PPTX 슬라이드 파트 이름을 발표 순서대로 반환
+
+    슬라이드 순서는 파일 이름이 아니라 presentation.xml의 슬라이드 목록이 정합니다
+    (슬라이드를 옮겨도 파일 이름은 바뀌지 않음).
+
+    Raises:
+        KeyError: ppt/presentation.xml이 없음 (PPTX가 아님)
+    """
+    from lxml import etree
+
+    with z.open("ppt/presentation.xml") as f:
+        presentation = etree.parse(f)
+    with z.open("ppt/_rels/presentation.xml.rels") as f:
+        rels = etree.parse(f)
+
+    targets = {
+        rel.get("Id"): rel.get("Target")
+        for rel in rels.getroot()
+        if rel.get("Type", "").endswith("/slide")
+    }
+
+    parts = []
+    for slide_id in presentation.iterfind(".//{*}sldIdLst/{*}sldId"):
+        rel_id = next((value for key, value in slide_id.attrib.items() if key.endswith("}id")), None)
+        target = targets.get(rel_id)
+        if target is None:
+            continue
+        # 대상 경로는 ppt/ 기준 상대 경로 (절대 경로로 적힌 경우도 처리)
+        if target.startswith("/"):
+            parts.append(target.lstrip("/"))
+        else:
+            parts.append(str(PurePosixPath("ppt") / target))
+    return parts
+
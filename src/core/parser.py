@@ -1,11 +1,49 @@
 """문서 파서 모듈 - PDF, DOCX, HWPX, TXT, MD 지원"""
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Callable, List, Dict, Iterable, Iterator, Optional, Tuple
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import groupby
 import logging
+import math
+import os
+import zipfile
 from dataclasses import dataclass
 
+from .chunking import TokenChunker
+from .ooxml import iter_docx_paragraphs, iter_xml_paragraphs, natural_key, pptx_slide_parts
+from .pdf_backends import PdfBackend, PypdfBackend, get_pdf_backend, iter_pdf_pages
+from .text_cache import TextCache
+from .text_reader import iter_text_windows
+
 logger = logging.getLogger(__name__)
 
+# 추출 결과(레코드 형식이나 추출 방식)가 바뀌면 올려서 이전 파싱 텍스트 캐시를 무효화
+PARSED_TEXT_VERSION = 1
+
+# 병렬 PDF 추출에서 워커 하나가 맡는 최소 페이지 수 (파일 열기 비용 분산)
+_PDF_MIN_PAGE_RANGE = 16
+
+
+def _extract_pdf_pages(
+    file_path: Path, start: int, end: int, backend_name: str
+) -> Tuple[List[Tuple[int, str]], bool]:
+    """
+    PDF의 [start, end) 페이지 텍스트 추출 (워커 프로세스에서 실행되므로 모듈 최상위에 둠)
+
+    Returns:
+        ((페이지 번호(1부터), 텍스트) 리스트, pypdf로 대체했는지 여부)
+    """
+    fell_back = []
+    pages = list(iter_pdf_pages(
+        get_pdf_backend(backend_name), file_path, start, end, on_fallback=lambda: fell_back.append(True)
+    ))
+    return pages, bool(fell_back)
+
+
+class _FallbackUsed(Exception):
+    """추출 도중 대체 추출기로 바뀜 (그 결과는 요청한 추출 방식의 캐시에 저장하지 않음)"""
+
 
 @dataclass
 class DocumentChunk:
@@ -19,16 +57,69 @@ class DocumentChunk:
 class DocumentParser:
     """다양한 문서 포맷을 파싱하는 클래스"""
     
-    SUPPORTED_EXTENSIONS = {".pdf", ".docx", ".hwpx", ".txt", ".md", ".pptx", ".xlsx"}
+    # 확장자별 파싱 메서드 이름. 형식별 라이브러리(pypdf, python-docx, openpyxl, lxml 등)는
+    # 각 메서드가 처음 호출될 때 import하므로, 파서를 만들거나 지원 여부를 확인할 때는 로드되지 않음
+    PARSERS = {
+        ".pdf": "_parse_pdf",
+        ".docx": "_parse_docx",
+        ".hwpx": "_parse_hwpx",
+        ".pptx": "_parse_pptx",
+        ".xlsx": "_parse_xlsx",
+        ".txt": "_parse_text",
+        ".md": "_parse_text",
+    }
     
-    def __init__(self, chunk_size: int = 512, chunk_overlap: int = 50):
+    SUPPORTED_EXTENSIONS = set(PARSERS)
+    
+    def __init__(
+        self,
+        chunk_size: int = 512,
+        chunk_overlap: int = 50,
+        pdf_parallel_pages: int = 200,
+        pdf_workers: int = 0,
+        pdf_backend: str = "auto",
+        xlsx_repeat_header: bool = True,
+        ooxml_fast_path: bool = True,
+        text_cache: Optional[TextCache] = None
+    ):
         """
         Args:
             chunk_size: 청크 크기 (문자 단위)
             chunk_overlap: 청크 간 중복 (문자 단위)
+            pdf_parallel_pages: 이 페이지 수 이상인 PDF는 페이지 범위로 나눠 병렬 추출 (0이면 사용 안 함)
+            pdf_workers: 병렬 PDF 추출 프로세스 수 (0이면 CPU 코어 수)
+            pdf_backend: PDF 텍스트 추출 백엔드 (auto, pdfium, pymupdf, pypdf).
+                auto면 설치된 것 중 가장 빠른 백엔드를 쓰고, 실패하면 파일별로 pypdf로 대체
+            xlsx_repeat_header: XLSX 시트의 첫 행(머리글)을 모든 청크 앞에 반복
+            ooxml_fast_path: DOCX/PPTX를 객체 모델 없이 XML에서 직접 추출 (실패하면 python-docx/pptx 사용)
+            text_cache: 파싱 텍스트 캐시 (있으면 같은 내용의 문서는 추출하지 않고 캐시된 텍스트를 다시 분할)
         """
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
+        self.pdf_parallel_pages = pdf_parallel_pages
+        self.pdf_workers = pdf_workers
+        self.pdf_backend = pdf_backend
+        self.xlsx_repeat_header = xlsx_repeat_header
+        self.ooxml_fast_path = ooxml_fast_path
+        self.text_cache = text_cache
+        # 설정되면 청크 길이를 임베딩 모델의 토큰 수로 측정
+        self._token_chunker: Optional[TokenChunker] = None
+    
+    def use_tokenizer(self, tokenizer, max_tokens: int):
+        """
+        청크 길이를 임베딩 모델 토크나이저의 토큰 수로 측정하도록 설정
+        
+        이후 chunk_size와 chunk_overlap은 토큰 단위가 되며, chunk_size가 모델이 한 번에 받을 수 있는
+        토큰 수보다 크면 max_tokens로 줄여 청크 끝이 잘려 버려지지 않게 합니다.
+        
+        Args:
+            tokenizer: Hugging Face fast 토크나이저
+            max_tokens: 모델이 청크 하나에서 받을 수 있는 최대 토큰 수 (특수 토큰 제외)
+        """
+        limit = min(self.chunk_size, max_tokens)
+        if limit < self.chunk_size:
+            logger.info(f"chunk_size {self.chunk_size} exceeds the model limit; using {limit} tokens")
+        self._token_chunker = TokenChunker(tokenizer, limit, self.chunk_overlap)
     
     def parse(self, file_path: Path) -> List[DocumentChunk]:
         """
@@ -40,6 +131,25 @@ class DocumentParser:
         Returns:
             DocumentChunk 리스트
             
+        Raises:
+            ValueError: 지원하지 않는 파일 형식
+            FileNotFoundError: 파일이 존재하지 않음
+        """
+        chunks = list(self.iter_chunks(file_path))
+        logger.info(f"Parsed {len(chunks)} chunks from {file_path.suffix[1:].upper()}")
+        return chunks
+    
+    def iter_chunks(self, file_path: Path, content_hash: Optional[str] = None) -> Iterator[DocumentChunk]:
+        """
+        파일을 파싱하여 청크를 하나씩 생성 (큰 파일도 전체 청크를 메모리에 올리지 않음)
+        
+        Args:
+            file_path: 파싱할 파일 경로
+            content_hash: 이미 계산한 파일 내용 해시 (파싱 텍스트 캐시 키, None이면 필요할 때 계산)
+            
+        Yields:
+            DocumentChunk
+            
         Raises:
             ValueError: 지원하지 않는 파일 형식
             FileNotFoundError: 파일이 존재하지 않음
@@ -48,140 +158,238 @@ class DocumentParser:
             raise FileNotFoundError(f"File not found: {file_path}")
         
         extension = file_path.suffix.lower()
-        if extension not in self.SUPPORTED_EXTENSIONS:
+        method = self.PARSERS.get(extension)
+        if method is None:
             raise ValueError(f"Unsupported file type: {extension}")
         
         logger.info(f"Parsing file: {file_path}")
         
         # 파일 타입별 파싱
-        if extension == ".pdf":
-            return self._parse_pdf(file_path)
-        elif extension == ".docx":
-            return self._parse_docx(file_path)
-        elif extension == ".hwpx":
-            return self._parse_hwpx(file_path)
-        elif extension == ".pptx":
-            return self._parse_pptx(file_path)
-        elif extension == ".xlsx":
-            return self._parse_xlsx(file_path)
-        elif extension in {".txt", ".md"}:
-            return self._parse_text(file_path)
-        
-        return []
-    
-    def _parse_pdf(self, file_path: Path) -> List[DocumentChunk]:
-        """PDF 파일 파싱 (pypdf 사용)"""
+        yield from getattr(self, method)(file_path, content_hash)
+    
+    def _parse_pdf(self, file_path: Path, content_hash: Optional[str] = None) -> Iterator[DocumentChunk]:
+        """PDF 파일 파싱 (PDF 백엔드 사용, 페이지 단위로 생성)"""
+        backend = get_pdf_backend(self.pdf_backend)
+        pages = self._extract(
+            file_path,
+            content_hash,
+            f"pdf:{backend.name}",
+            lambda path, on_fallback: self._extract_pdf(path, backend, on_fallback)
+        )
+        
+        for page_num, total_pages, text in pages:
+            # 페이지 텍스트를 청크로 분할
+            for chunk_text in self._split_text(text):
+                yield DocumentChunk(
+                    text=chunk_text,
+                    page=page_num,
+                    metadata={
+                        "file_path": str(file_path),
+                        "file_name": file_path.name,
+                        "file_type": "pdf",
+                        "page": page_num,
+                        "total_pages": total_pages
+                    }
+                )
+    
+    def _extract_pdf(
+        self,
+        file_path: Path,
+        backend: PdfBackend,
+        on_fallback: Optional[Callable[[], None]] = None
+    ) -> Iterator[Tuple[int, int, str]]:
+        """
+        PDF 페이지 텍스트 추출 (빈 페이지 제외)
+        
+        Args:
+            file_path: PDF 파일 경로
+            backend: 우선 사용할 백엔드
+            on_fallback: pypdf로 바꿀 때 호출
+            
+        Yields:
+            (페이지 번호, 전체 페이지 수, 페이지 텍스트)
+        """
         try:
-            import pypdf
-        except ImportError:
-            raise ImportError("pypdf is required for PDF parsing. Install: pip install pypdf")
+            total_pages = backend.page_count(file_path)
+        except Exception as e:
+            if isinstance(backend, PypdfBackend):
+                raise
+            logger.warning(f"{backend.name} could not open {file_path}: {e}; falling back to pypdf")
+            if on_fallback is not None:
+                on_fallback()
+            backend = PypdfBackend()
+            total_pages = backend.page_count(file_path)
         
-        chunks = []
-        with open(file_path, "rb") as f:
-            reader = pypdf.PdfReader(f)
+        workers = self._pdf_worker_count(total_pages)
+        if workers > 1:
+            pages = self._iter_pdf_pages_parallel(file_path, total_pages, workers, backend, on_fallback)
+        else:
+            pages = iter_pdf_pages(backend, file_path, on_fallback=on_fallback)
+        
+        for page_num, text in pages:
+            if text.strip():
+                yield page_num, total_pages, text
+    
+    def _pdf_worker_count(self, total_pages: int) -> int:
+        """PDF 페이지 수에 따른 병렬 추출 프로세스 수 (1이면 순차 추출)"""
+        if not self.pdf_parallel_pages or total_pages < self.pdf_parallel_pages:
+            return 1
+        workers = self.pdf_workers or os.cpu_count() or 1
+        return max(1, min(workers, total_pages // _PDF_MIN_PAGE_RANGE))
+    
+    def _iter_pdf_pages_parallel(
+        self,
+        file_path: Path,
+        total_pages: int,
+        workers: int,
+        backend: PdfBackend,
+        on_fallback: Optional[Callable[[], None]] = None
+    ) -> Iterator[Tuple[int, str]]:
+        """
+        PDF를 페이지 범위로 나눠 워커 프로세스에서 추출하고 페이지 순서대로 생성
+        
+        결과는 범위 순서대로 꺼내므로 청크 순서는 순차 추출과 같습니다. 진행 중인 범위 수를
+        제한하여 소비가 느려도 추출된 텍스트가 무한정 쌓이지 않게 합니다.
+        
+        Args:
+            file_path: PDF 파일 경로
+            total_pages: 전체 페이지 수
+            workers: 워커 프로세스 수
+            backend: 추출 백엔드 (워커마다 같은 이름의 백엔드를 새로 생성)
+            on_fallback: 어느 범위든 pypdf로 바꿔 추출했으면 그 범위를 내보내기 전에 호출
             
-            for page_num, page in enumerate(reader.pages, start=1):
-                text = page.extract_text()
-                if text.strip():
-                    # 페이지 텍스트를 청크로 분할
-                    page_chunks = self._split_text(text)
-                    for chunk_text in page_chunks:
-                        chunks.append(DocumentChunk(
-                            text=chunk_text,
-                            page=page_num,
-                            metadata={
-                                "file_path": str(file_path),
-                                "file_name": file_path.name,
-                                "file_type": "pdf",
-                                "page": page_num,
-                                "total_pages": len(reader.pages)
-                            }
-                        ))
-        
-        logger.info(f"Parsed {len(chunks)} chunks from PDF")
-        return chunks
+        Yields:
+            (페이지 번호, 페이지 텍스트)
+        """
+        # 범위를 워커 수보다 잘게 나눠 페이지마다 추출 시간이 달라도 워커가 고르게 일하게 함
+        step = max(_PDF_MIN_PAGE_RANGE, math.ceil(total_pages / (workers * 4)))
+        ranges = iter([(start, min(start + step, total_pages)) for start in range(0, total_pages, step)])
+        logger.debug(f"Extracting {total_pages} PDF pages with {workers} workers: {file_path}")
+        
+        executor = ProcessPoolExecutor(max_workers=workers)
+        try:
+            pending = deque()
+            for start, end in ranges:
+                pending.append(executor.submit(_extract_pdf_pages, file_path, start, end, backend.name))
+                if len(pending) >= workers * 2:
+                    break
+            
+            while pending:
+                pages, fell_back = pending.popleft().result()
+                if fell_back and on_fallback is not None:
+                    on_fallback()
+                next_range = next(ranges, None)
+                if next_range is not None:
+                    pending.append(executor.submit(_extract_pdf_pages, file_path, *next_range, backend.name))
+                yield from pages
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+    
+    def _parse_docx(self, file_path: Path, content_hash: Optional[str] = None) -> Iterator[DocumentChunk]:
+        """DOCX 파일 파싱 (단락을 이어 붙이며 청크로 분할)"""
+        paragraphs = self._extract(file_path, content_hash, self._ooxml_variant("docx"), self._extract_docx)
+        yield from self._make_chunks(file_path, "docx", self._split_stream(self._join_lines(paragraphs)))
+    
+    def _extract_docx(self, file_path: Path, on_fallback: Optional[Callable[[], None]] = None) -> Iterator[str]:
+        """DOCX 단락 추출 (XML 직접 스트리밍, 실패하면 python-docx 사용)"""
+        if self.ooxml_fast_path:
+            yield from self._with_fallback(
+                file_path, self._extract_docx_fast, self._extract_docx_library, on_fallback
+            )
+        else:
+            yield from self._extract_docx_library(file_path)
     
-    def _parse_docx(self, file_path: Path) -> List[DocumentChunk]:
-        """DOCX 파일 파싱 (python-docx 사용)"""
+    def _extract_docx_fast(self, file_path: Path) -> Iterator[str]:
+        """word/document.xml을 iterparse로 읽어 단락(표 셀, 머리글/각주 포함) 생성"""
+        with zipfile.ZipFile(file_path, 'r') as z:
+            yield from iter_docx_paragraphs(z)
+    
+    def _extract_docx_library(self, file_path: Path) -> Iterator[str]:
+        """DOCX 단락 추출 (python-docx 사용)"""
         try:
             from docx import Document
         except ImportError:
             raise ImportError("python-docx is required. Install: pip install python-docx")
         
-        chunks = []
         doc = Document(file_path)
-        
-        # 모든 단락 텍스트 추출
-        full_text = "\n".join([para.text for para in doc.paragraphs if para.text.strip()])
-        
-        # 청크로 분할
-        chunk_texts = self._split_text(full_text)
-        for idx, chunk_text in enumerate(chunk_texts):
-            chunks.append(DocumentChunk(
-                text=chunk_text,
-                metadata={
-                    "file_path": str(file_path),
-                    "file_name": file_path.name,
-                    "file_type": "docx",
-                    "chunk_index": idx
-                }
-            ))
-        
-        logger.info(f"Parsed {len(chunks)} chunks from DOCX")
-        return chunks
+        for para in doc.paragraphs:
+            if para.text.strip():
+                yield para.text
     
-    def _parse_hwpx(self, file_path: Path) -> List[DocumentChunk]:
-        """HWPX 파일 파싱 (zip + XML 구조)"""
+    def _parse_hwpx(self, file_path: Path, content_hash: Optional[str] = None) -> Iterator[DocumentChunk]:
+        """HWPX 파일 파싱 (zip + XML 구조, 단락 단위로 스트리밍)"""
         try:
-            from lxml import etree
-            import zipfile
+            from lxml import etree  # noqa: F401
         except ImportError:
             raise ImportError("lxml is required. Install: pip install lxml")
         
-        chunks = []
-        
         try:
-            with zipfile.ZipFile(file_path, 'r') as z:
-                # HWPX는 ZIP 구조이며, Contents/section*.xml에 텍스트가 있음
-                section_files = [name for name in z.namelist() if name.startswith('Contents/section')]
-                
-                full_text = ""
-                for section_file in sorted(section_files):
-                    with z.open(section_file) as f:
-                        tree = etree.parse(f)
-                        # 텍스트 노드 추출 (간단 버전)
-                        text_nodes = tree.xpath("//text()")
-                        section_text = " ".join([t.strip() for t in text_nodes if t.strip()])
-                        full_text += section_text + "\n"
-                
-                # 청크로 분할
-                chunk_texts = self._split_text(full_text)
-                for idx, chunk_text in enumerate(chunk_texts):
-                    chunks.append(DocumentChunk(
-                        text=chunk_text,
-                        metadata={
-                            "file_path": str(file_path),
-                            "file_name": file_path.name,
-                            "file_type": "hwpx",
-                            "chunk_index": idx
-                        }
-                    ))
+            paragraphs = self._extract(
+                file_path, content_hash, "hwpx", lambda path, _: self._extract_hwpx(path)
+            )
+            chunk_texts = self._split_stream(self._join_lines(paragraphs))
+            yield from self._make_chunks(file_path, "hwpx", chunk_texts)
         except Exception as e:
             logger.error(f"Error parsing HWPX: {e}")
             raise
+    
+    def _extract_hwpx(self, file_path: Path) -> Iterator[str]:
+        """HWPX 단락 추출"""
+        with zipfile.ZipFile(file_path, 'r') as z:
+            # HWPX는 ZIP 구조이며, Contents/section*.xml에 텍스트가 있음 (section2가 section10보다 앞)
+            section_files = [
+                name for name in z.namelist()
+                if name.startswith('Contents/section') and name.endswith('.xml')
+            ]
+            for section_file in sorted(section_files, key=natural_key):
+                with z.open(section_file) as f:
+                    yield from iter_xml_paragraphs(f)
+    
+    def _parse_pptx(self, file_path: Path, content_hash: Optional[str] = None) -> Iterator[DocumentChunk]:
+        """PPTX 파일 파싱 (슬라이드 단위로 생성)"""
+        slides = self._extract(file_path, content_hash, self._ooxml_variant("pptx"), self._extract_pptx)
+        for slide_num, total_slides, full_text in slides:
+            yield from self._make_slide_chunks(file_path, slide_num, total_slides, full_text)
+    
+    def _extract_pptx(
+        self,
+        file_path: Path,
+        on_fallback: Optional[Callable[[], None]] = None
+    ) -> Iterator[Tuple[int, int, str]]:
+        """
+        PPTX 슬라이드 텍스트 추출 (XML 직접 스트리밍, 실패하면 python-pptx 사용)
         
-        logger.info(f"Parsed {len(chunks)} chunks from HWPX")
-        return chunks
+        Yields:
+            (슬라이드 번호, 전체 슬라이드 수, 슬라이드 텍스트)
+        """
+        if self.ooxml_fast_path:
+            yield from self._with_fallback(
+                file_path, self._extract_pptx_fast, self._extract_pptx_library, on_fallback
+            )
+        else:
+            yield from self._extract_pptx_library(file_path)
+    
+    def _extract_pptx_fast(self, file_path: Path) -> Iterator[Tuple[int, int, str]]:
+        """슬라이드 XML을 발표 순서대로 iterparse로 읽어 슬라이드 텍스트 생성 (표 셀 포함)"""
+        with zipfile.ZipFile(file_path, 'r') as z:
+            slide_parts = pptx_slide_parts(z)
+            total_slides = len(slide_parts)
+            
+            for slide_num, slide_part in enumerate(slide_parts, start=1):
+                with z.open(slide_part) as f:
+                    full_text = "\n".join(iter_xml_paragraphs(f))
+                if full_text.strip():
+                    yield slide_num, total_slides, full_text
     
-    def _parse_pptx(self, file_path: Path) -> List[DocumentChunk]:
-        """PPTX 파일 파싱 (python-pptx 사용)"""
+    def _extract_pptx_library(self, file_path: Path) -> Iterator[Tuple[int, int, str]]:
+        """PPTX 슬라이드 텍스트 추출 (python-pptx 사용)"""
         try:
             from pptx import Presentation
         except ImportError:
             raise ImportError("python-pptx is required. Install: pip install python-pptx")
         
-        chunks = []
         prs = Presentation(file_path)
+        total_slides = len(prs.slides)
         
         for slide_num, slide in enumerate(prs.slides, start=1):
             slide_text = []
@@ -197,104 +405,245 @@ class DocumentParser:
             
             # 슬라이드 텍스트 결합
             full_text = "\n".join(slide_text)
-            
             if full_text.strip():
-                # 슬라이드별로 청크 생성
-                chunk_texts = self._split_text(full_text)
-                for idx, chunk_text in enumerate(chunk_texts):
-                    chunks.append(DocumentChunk(
-                        text=chunk_text,
-                        page=slide_num,
-                        metadata={
-                            "file_path": str(file_path),
-                            "file_name": file_path.name,
-                            "file_type": "pptx",
-                            "slide": slide_num,
-                            "total_slides": len(prs.slides),
-                            "chunk_index": idx
-                        }
-                    ))
-        
-        logger.info(f"Parsed {len(chunks)} chunks from PPTX")
-        return chunks
+                yield slide_num, total_slides, full_text
     
-    def _parse_xlsx(self, file_path: Path) -> List[DocumentChunk]:
-        """XLSX 파일 파싱 (openpyxl 사용)"""
+    def _make_slide_chunks(
+        self,
+        file_path: Path,
+        slide_num: int,
+        total_slides: int,
+        full_text: str
+    ) -> Iterator[DocumentChunk]:
+        """슬라이드 하나의 텍스트를 청크로 분할"""
+        if not full_text.strip():
+            return
+        
+        for idx, chunk_text in enumerate(self._split_text(full_text)):
+            yield DocumentChunk(
+                text=chunk_text,
+                page=slide_num,
+                metadata={
+                    "file_path": str(file_path),
+                    "file_name": file_path.name,
+                    "file_type": "pptx",
+                    "slide": slide_num,
+                    "total_slides": total_slides,
+                    "chunk_index": idx
+                }
+            )
+    
+    def _parse_xlsx(self, file_path: Path, content_hash: Optional[str] = None) -> Iterator[DocumentChunk]:
+        """XLSX 파일 파싱 (시트별 행 묶음 단위로 생성)"""
+        rows = self._extract(file_path, content_hash, "xlsx", lambda path, _: self._extract_xlsx(path))
+        
+        for sheet_name, sheet_rows in groupby(rows, key=lambda row: row[0]):
+            for idx, (chunk_text, row_start, row_end) in enumerate(self._iter_row_windows(sheet_rows)):
+                yield DocumentChunk(
+                    text=chunk_text,
+                    section=sheet_name,
+                    metadata={
+                        "file_path": str(file_path),
+                        "file_name": file_path.name,
+                        "file_type": "xlsx",
+                        "sheet_name": sheet_name,
+                        "row_start": row_start,
+                        "row_end": row_end,
+                        "chunk_index": idx
+                    }
+                )
+    
+    def _extract_xlsx(self, file_path: Path) -> Iterator[Tuple[str, int, str]]:
+        """
+        XLSX 행 텍스트 추출 (openpyxl 읽기 전용 모드, 빈 행 제외)
+        
+        Yields:
+            (시트 이름, 행 번호, 행 텍스트)
+        """
         try:
             from openpyxl import load_workbook
         except ImportError:
             raise ImportError("openpyxl is required. Install: pip install openpyxl")
         
-        chunks = []
-        wb = load_workbook(file_path, data_only=True)
+        # 읽기 전용 모드는 셀 객체 모델을 만들지 않고 시트 XML을 행 단위로 스트리밍
+        wb = load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            for sheet in wb.worksheets:
+                # 일부 프로그램이 잘못 기록한 시트 크기 정보 때문에 행이 잘리지 않도록 다시 계산
+                if hasattr(sheet, "reset_dimensions"):
+                    sheet.reset_dimensions()
+                
+                for row_num, row in enumerate(sheet.iter_rows(values_only=True), start=1):
+                    row_text = " | ".join(str(cell) for cell in row if cell is not None)
+                    if row_text.strip():
+                        yield sheet.title, row_num, row_text
+        finally:
+            wb.close()
+    
+    def _iter_row_windows(self, rows: Iterable[Tuple[str, int, str]]) -> Iterator[Tuple[str, int, int]]:
+        """
+        시트의 행을 chunk_size 이내의 묶음으로 모아 청크 텍스트 생성
+        
+        행 중간에서 자르지 않으며, xlsx_repeat_header가 켜져 있으면 시트의 첫 행(머리글)을
+        이후 청크 앞에도 붙여 열 의미를 유지합니다. 한 행이 청크 한도보다 길면 그 행만 나눕니다.
+        길이는 청크 분할과 같은 기준(토큰 또는 문자)으로 측정합니다.
+        
+        Args:
+            rows: 한 시트의 (시트 이름, 행 번호, 행 텍스트) (빈 행 제외)
+            
+        Yields:
+            (청크 텍스트, 시작 행 번호, 끝 행 번호)
+        """
+        limit = self.chunk_limit
+        header: Optional[str] = None
+        header_row = 0
+        # 머리글을 반복할 때 청크마다 머리글이 차지하는 크기
+        header_size = 0
+        window: List[str] = []
+        window_start = window_end = 0
+        size = 0
+        
+        def window_text() -> str:
+            lines = window if not header_size or window_start == header_row else [header] + window
+            return "\n".join(lines)
         
-        for sheet_name in wb.sheetnames:
-            sheet = wb[sheet_name]
+        for _, row_num, row_text in rows:
+            row_size = self.measure(row_text)
             
-            # 시트의 모든 셀 데이터 수집
-            sheet_data = []
-            for row in sheet.iter_rows(values_only=True):
-                # 빈 행 제외
-                row_text = [str(cell) for cell in row if cell is not None]
-                if row_text:
-                    sheet_data.append(" | ".join(row_text))
+            if header is None:
+                header, header_row = row_text, row_num
+                # 머리글이 청크의 절반을 넘으면 반복하지 않음
+                if self.xlsx_repeat_header and row_size * 2 <= limit:
+                    header_size = row_size + 1
             
-            # 시트 텍스트 결합
-            full_text = "\n".join(sheet_data)
+            if window and size + 1 + row_size > limit:
+                yield window_text(), window_start, window_end
+                window = []
             
-            if full_text.strip():
-                # 시트별로 청크 생성
-                chunk_texts = self._split_text(full_text)
-                for idx, chunk_text in enumerate(chunk_texts):
-                    chunks.append(DocumentChunk(
-                        text=chunk_text,
-                        section=sheet_name,
-                        metadata={
-                            "file_path": str(file_path),
-                            "file_name": file_path.name,
-                            "file_type": "xlsx",
-                            "sheet_name": sheet_name,
-                            "chunk_index": idx
-                        }
-                    ))
-        
-        logger.info(f"Parsed {len(chunks)} chunks from XLSX")
-        return chunks
+            reserved = header_size if row_num != header_row else 0
+            if not window and row_size + reserved > limit:
+                # 긴 행은 단독으로 나눔
+                for piece in self._split_text(row_text):
+                    yield piece, row_num, row_num
+                continue
+            
+            if window:
+                size += 1 + row_size
+            else:
+                window_start, size = row_num, reserved + row_size
+            window.append(row_text)
+            window_end = row_num
+        
+        if window:
+            yield window_text(), window_start, window_end
     
-    def _parse_text(self, file_path: Path) -> List[DocumentChunk]:
-        """TXT, MD 파일 파싱"""
-        chunks = []
+    def _parse_text(self, file_path: Path, content_hash: Optional[str] = None) -> Iterator[DocumentChunk]:
+        """TXT, MD 파일 파싱 (앞부분으로 인코딩 감지, mmap 구간 단위로 디코딩하며 분할)"""
+        chunk_texts = self._split_stream(iter_text_windows(file_path))
+        yield from self._make_chunks(file_path, file_path.suffix[1:], chunk_texts)
+    
+    def _extract(self, file_path: Path, content_hash: Optional[str], variant: str, extract) -> Iterator:
+        """
+        문서에서 텍스트 레코드 추출 (파싱 텍스트 캐시가 있으면 캐시에서 읽음)
         
-        # 인코딩 자동 감지
-        encodings = ['utf-8', 'cp949', 'euc-kr']
-        text = None
+        캐시에 없으면 추출하면서 레코드를 캐시에 기록하고, 추출이 끝까지 완료된 경우에만 저장합니다.
+        도중에 대체 추출기(pypdf, python-docx 등)로 바뀐 결과는 variant의 추출 방식으로 만든 것이
+        아니므로 저장하지 않습니다.
         
-        for encoding in encodings:
-            try:
-                with open(file_path, 'r', encoding=encoding) as f:
-                    text = f.read()
-                break
-            except UnicodeDecodeError:
-                continue
+        Args:
+            file_path: 문서 경로
+            content_hash: 파일 내용 해시 (None이면 캐시를 쓸 때 계산)
+            variant: 추출 방식 (형식과 추출 결과에 영향을 주는 설정, 캐시 키에 포함)
+            extract: 레코드 추출 함수 ((file_path, on_fallback) -> 레코드 반복자,
+                대체 추출기로 바꾸면 그 레코드를 내기 전에 on_fallback() 호출)
+            
+        Yields:
+            레코드 (JSON으로 저장 가능한 값; 캐시에서 읽으면 튜플 대신 리스트)
+        """
+        if self.text_cache is None:
+            yield from extract(file_path, None)
+            return
+        
+        if content_hash is None:
+            content_hash = TextCache.hash_file(file_path)
+        key = self.text_cache.make_key(content_hash, f"{variant}:{PARSED_TEXT_VERSION}")
+        cached = self.text_cache.read(key)
+        if cached is not None:
+            logger.debug(f"Using cached text for {file_path}")
+            yield from cached
+            return
         
-        if text is None:
-            raise ValueError(f"Could not decode file: {file_path}")
+        fell_back = []
+        records = extract(file_path, lambda: fell_back.append(True))
+        rest = ()
+        try:
+            with self.text_cache.writer(key) as write:
+                for record in records:
+                    if fell_back:
+                        rest = (record,)
+                        break
+                    write(record)
+                    yield record
+                if fell_back:
+                    raise _FallbackUsed()
+        except _FallbackUsed:
+            logger.debug(f"Not caching text of {file_path}: extracted with a fallback parser")
+            yield from rest
+            yield from records
+    
+    def _ooxml_variant(self, file_type: str) -> str:
+        """DOCX/PPTX 추출 방식 (빠른 추출과 라이브러리 추출은 결과가 다르므로 캐시를 구분)"""
+        return f"{file_type}:{'fast' if self.ooxml_fast_path else 'library'}"
+    
+    def _with_fallback(
+        self,
+        file_path: Path,
+        fast,
+        fallback,
+        on_fallback: Optional[Callable[[], None]] = None
+    ) -> Iterator:
+        """
+        빠른 추출기로 추출하고, 레코드를 내기 전에 실패하면 라이브러리 기반 추출기로 다시 추출
         
-        # 청크로 분할
-        chunk_texts = self._split_text(text)
+        이미 레코드를 낸 뒤의 실패는 중복을 막기 위해 그대로 전달합니다. 다시 추출할 때는
+        on_fallback()을 먼저 호출합니다.
+        """
+        emitted = False
+        try:
+            for record in fast(file_path):
+                emitted = True
+                yield record
+        except Exception as e:
+            if emitted:
+                raise
+            logger.warning(f"Fast extraction failed for {file_path}: {e}; using the library parser")
+            if on_fallback is not None:
+                on_fallback()
+            yield from fallback(file_path)
+    
+    def _make_chunks(
+        self,
+        file_path: Path,
+        file_type: str,
+        chunk_texts: Iterable[str]
+    ) -> Iterator[DocumentChunk]:
+        """파일 전체에 걸친 chunk_index를 붙여 DocumentChunk 생성"""
         for idx, chunk_text in enumerate(chunk_texts):
-            chunks.append(DocumentChunk(
+            yield DocumentChunk(
                 text=chunk_text,
                 metadata={
                     "file_path": str(file_path),
                     "file_name": file_path.name,
-                    "file_type": file_path.suffix[1:],
+                    "file_type": file_type,
                     "chunk_index": idx
                 }
-            ))
-        
-        logger.info(f"Parsed {len(chunks)} chunks from text file")
-        return chunks
+            )
+    
+    @staticmethod
+    def _join_lines(lines: Iterable[str]) -> Iterator[str]:
+        """줄 사이에 줄바꿈을 넣어 이어 붙일 조각 생성 ("\n".join과 같은 결과)"""
+        for idx, line in enumerate(lines):
+            yield line if idx == 0 else "\n" + line
     
     def _split_text(self, text: str) -> List[str]:
         """
@@ -309,32 +658,103 @@ class DocumentParser:
         if not text.strip():
             return []
         
+        if self._token_chunker is not None:
+            return self._token_chunker.split(text)
+        
         chunks = []
         start = 0
         text_length = len(text)
         
         while start < text_length:
-            end = start + self.chunk_size
-            
-            # 마지막 청크가 아니면 단어 경계에서 자르기
-            if end < text_length:
-                # 공백이나 줄바꿈 찾기
-                while end > start and text[end] not in [' ', '\n', '\t', '.', ',', '!', '?']:
-                    end -= 1
-                
-                # 적절한 분할점을 못 찾으면 그냥 자르기
-                if end == start:
-                    end = start + self.chunk_size
+            end = self._find_chunk_end(text, start)
             
             chunk = text[start:end].strip()
             if chunk:
                 chunks.append(chunk)
             
             # 다음 청크 시작점 (오버랩 적용)
-            start = end - self.chunk_overlap if end < text_length else text_length
+            start = self._next_start(start, end) if end < text_length else text_length
         
         return chunks
     
+    def _split_stream(self, pieces: Iterable[str]) -> Iterator[str]:
+        """
+        이어지는 텍스트 조각들을 청크로 분할 (_split_text와 같은 결과를 조각 단위로 생성)
+        
+        전체 텍스트를 만들지 않고, 아직 청크로 내보내지 않은 꼬리 부분만 버퍼에 유지합니다.
+        
+        Args:
+            pieces: 순서대로 이어 붙일 텍스트 조각
+            
+        Yields:
+            청크 텍스트
+        """
+        if self._token_chunker is not None:
+            yield from self._token_chunker.split_stream(pieces)
+            return
+        
+        buffer = ""
+        # 분할점을 뒤로 찾아가므로 chunk_size보다 충분히 긴 버퍼가 모였을 때만 자름
+        lookahead = self.chunk_size * 2
+        
+        for piece in pieces:
+            buffer += piece
+            
+            start = 0
+            while len(buffer) - start > lookahead:
+                end = self._find_chunk_end(buffer, start)
+                
+                chunk = buffer[start:end].strip()
+                if chunk:
+                    yield chunk
+                
+                start = self._next_start(start, end)
+            
+            if start:
+                buffer = buffer[start:]
+        
+        yield from self._split_text(buffer)
+    
+    @property
+    def tokenizer(self):
+        """청크 길이를 재는 토크나이저 (문자 수 기준이면 None)"""
+        if self._token_chunker is not None:
+            return self._token_chunker.tokenizer
+        return None
+    
+    @property
+    def chunk_limit(self) -> int:
+        """청크 하나의 최대 길이 (토큰 기준이면 토큰 수, 아니면 문자 수)"""
+        if self._token_chunker is not None:
+            return self._token_chunker.max_tokens
+        return self.chunk_size
+    
+    def measure(self, text: str) -> int:
+        """청크 길이 기준으로 텍스트 길이 측정 (토큰 수 또는 문자 수)"""
+        if self._token_chunker is not None:
+            return self._token_chunker.length(text)
+        return len(text)
+    
+    def _find_chunk_end(self, text: str, start: int) -> int:
+        """start에서 시작하는 청크의 끝 위치 (가능하면 단어 경계)"""
+        end = start + self.chunk_size
+        
+        # 마지막 청크가 아니면 단어 경계에서 자르기
+        if end < len(text):
+            # 공백이나 줄바꿈 찾기
+            while end > start and text[end] not in [' ', '\n', '\t', '.', ',', '!', '?']:
+                end -= 1
+            
+            # 적절한 분할점을 못 찾으면 그냥 자르기
+            if end == start:
+                end = start + self.chunk_size
+        
+        return end
+    
+    def _next_start(self, start: int, end: int) -> int:
+        """다음 청크 시작점 (오버랩 적용, 분할점이 너무 앞이어도 항상 앞으로 진행)"""
+        return max(end - self.chunk_overlap, start + 1)
+    
     @classmethod
     def is_supported(cls, file_path: Path) -> bool:
         """파일이 지원되는 형식인지 확인"""
@@ -0,0 +1,225 @@
+"""PDF 텍스트 추출 백엔드 - pdfium, MuPDF, pypdf"""
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Type
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class PdfBackend:
+    """
+    PDF 텍스트 추출 백엔드 인터페이스
+
+    백엔드는 파일 하나를 열어 페이지 수를 알려 주고, 페이지 범위의 텍스트를 순서대로 생성합니다.
+    라이브러리를 불러오지 못하면 available()이 False를 반환하며 자동 선택에서 빠집니다.
+    """
+
+    name = "base"
+
+    @classmethod
+    def available(cls) -> bool:
+        """백엔드 라이브러리가 설치되어 있는지 확인"""
+        return False
+
+    def page_count(self, file_path: Path) -> int:
+        """전체 페이지 수"""
+        raise NotImplementedError
+
+    def iter_pages(self, file_path: Path, start: int = 0, end: Optional[int] = None) -> Iterator[Tuple[int, str]]:
+        """
+        [start, end) 페이지의 텍스트를 순서대로 생성
+
+        Args:
+            file_path: PDF 파일 경로
+            start: 시작 페이지 (0부터)
+            end: 끝 페이지 (포함하지 않음, None이면 마지막까지)
+
+        Yields:
+            (페이지 번호(1부터), 텍스트)
+        """
+        raise NotImplementedError
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}()"
+
+
+class PdfiumBackend(PdfBackend):
+    """pypdfium2 (Chrome의 PDF 엔진) 기반 추출"""
+
+    name = "pdfium"
+
+    @classmethod
+    def available(cls) -> bool:
+        try:
+            import pypdfium2  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+    def page_count(self, file_path: Path) -> int:
+        import pypdfium2
+
+        pdf = pypdfium2.PdfDocument(str(file_path))
+        try:
+            return len(pdf)
+        finally:
+            pdf.close()
+
+    def iter_pages(self, file_path: Path, start: int = 0, end: Optional[int] = None) -> Iterator[Tuple[int, str]]:
+        import pypdfium2
+
+        pdf = pypdfium2.PdfDocument(str(file_path))
+        try:
+            end = len(pdf) if end is None else min(end, len(pdf))
+            for page_index in range(start, end):
+                page = pdf[page_index]
+                text_page = page.get_textpage()
+                try:
+                    # pdfium은 줄바꿈을 CRLF로 돌려주므로 pypdf와 맞춤
+                    text = text_page.get_text_range().replace("\r\n", "\n")
+                finally:
+                    text_page.close()
+                    page.close()
+                yield page_index + 1, text
+        finally:
+            pdf.close()
+
+
+class PyMuPDFBackend(PdfBackend):
+    """PyMuPDF (MuPDF) 기반 추출"""
+
+    name = "pymupdf"
+
+    @staticmethod
+    def _module():
+        try:
+            import pymupdf
+        except ImportError:
+            import fitz as pymupdf
+        return pymupdf
+
+    @classmethod
+    def available(cls) -> bool:
+        try:
+            cls._module()
+        except ImportError:
+            return False
+        return True
+
+    def page_count(self, file_path: Path) -> int:
+        with self._module().open(str(file_path)) as doc:
+            return doc.page_count
+
+    def iter_pages(self, file_path: Path, start: int = 0, end: Optional[int] = None) -> Iterator[Tuple[int, str]]:
+        with self._module().open(str(file_path)) as doc:
+            end = doc.page_count if end is None else min(end, doc.page_count)
+            for page_index in range(start, end):
+                yield page_index + 1, doc.load_page(page_index).get_text()
+
+
+class PypdfBackend(PdfBackend):
+    """pypdf (순수 파이썬) 기반 추출 - 기본 의존성이며 다른 백엔드가 실패할 때의 대체 경로"""
+
+    name = "pypdf"
+
+    @classmethod
+    def available(cls) -> bool:
+        try:
+            import pypdf  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+    def page_count(self, file_path: Path) -> int:
+        import pypdf
+
+        with open(file_path, "rb") as f:
+            return len(pypdf.PdfReader(f).pages)
+
+    def iter_pages(self, file_path: Path, start: int = 0, end: Optional[int] = None) -> Iterator[Tuple[int, str]]:
+        import pypdf
+
+        with open(file_path, "rb") as f:
+            reader = pypdf.PdfReader(f)
+            end = len(reader.pages) if end is None else min(end, len(reader.pages))
+            for page_index in range(start, end):
+                yield page_index + 1, reader.pages[page_index].extract_text()
+
+
+# 자동 선택 우선순위 (빠른 순)
+PDF_BACKENDS: Dict[str, Type[PdfBackend]] = {
+    PdfiumBackend.name: PdfiumBackend,
+    PyMuPDFBackend.name: PyMuPDFBackend,
+    PypdfBackend.name: PypdfBackend,
+}
+
+
+def available_pdf_backends() -> List[str]:
+    """설치된 백엔드 이름 (우선순위 순)"""
+    return [name for name, backend in PDF_BACKENDS.items() if backend.available()]
+
+
+def get_pdf_backend(name: str = "auto") -> PdfBackend:
+    """
+    이름으로 PDF 백엔드 생성
+
+    Args:
+        name: 백엔드 이름 (pdfium, pymupdf, pypdf) 또는 auto (설치된 것 중 가장 빠른 백엔드)
+
+    Returns:
+        PdfBackend
+
+    Raises:
+        ValueError: 알 수 없는 백엔드 이름
+        ImportError: 백엔드 라이브러리가 설치되어 있지 않음
+    """
+    if name == "auto":
+        for backend in PDF_BACKENDS.values():
+            if backend.available():
+                return backend()
+        raise ImportError("pypdf is required for PDF parsing. Install: pip install pypdf")
+
+    backend = PDF_BACKENDS.get(name)
+    if backend is None:
+        raise ValueError(f"Unknown PDF backend: {name} (choose from auto, {', '.join(PDF_BACKENDS)})")
+    if not backend.available():
+        raise ImportError(f"PDF backend '{name}' is not installed")
+    return backend()
+
+
+def iter_pdf_pages(
+    backend: PdfBackend,
+    file_path: Path,
+    start: int = 0,
+    end: Optional[int] = None,
+    on_fallback: Optional[Callable[[], None]] = None
+) -> Iterator[Tuple[int, str]]:
+    """
+    백엔드로 페이지 텍스트를 생성하고, 실패하면 실패한 페이지부터 pypdf로 이어서 추출
+
+    이미 생성한 페이지는 다시 내보내지 않으므로 도중에 실패해도 페이지가 중복되거나 빠지지 않습니다.
+
+    Args:
+        backend: 우선 사용할 백엔드
+        file_path: PDF 파일 경로
+        start: 시작 페이지 (0부터)
+        end: 끝 페이지 (포함하지 않음, None이면 마지막까지)
+        on_fallback: pypdf로 바꿀 때 호출 (대체 페이지를 내보내기 전)
+
+    Yields:
+        (페이지 번호(1부터), 텍스트)
+    """
+    next_index = start
+    try:
+        for page_num, text in backend.iter_pages(file_path, start, end):
+            yield page_num, text
+            next_index = page_num
+    except Exception as e:
+        if isinstance(backend, PypdfBackend):
+            raise
+        logger.warning(
+            f"{backend.name} failed on {file_path} (page {next_index + 1}): {e}; falling back to pypdf"
+        )
+        if on_fallback is not None:
+            on_fallback()
+        yield from PypdfBackend().iter_pages(file_path, next_index, end)
@@ -0,0 +1,205 @@
+"""파싱 텍스트 캐시 - 청크 설정을 바꿔도 문서를 다시 추출하지 않도록 추출 결과를 저장"""
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+import gzip
+import hashlib
+import json
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+# 파일 내용 해시를 계산할 때 한 번에 읽는 크기
+_HASH_BLOCK = 1024 * 1024
+
+
+class TextCache:
+    """
+    파싱 텍스트 캐시
+
+    파서가 문서에서 추출한 레코드(페이지/슬라이드/단락/행 텍스트)를 (파일 내용 해시, 추출 방식)을
+    키로 gzip 압축 JSON Lines 파일 하나에 저장합니다. 내용 해시는 인덱싱 매니페스트와 같은 방식이라
+    인덱싱 중에는 매니페스트가 계산한 해시를 그대로 받아 파일을 다시 읽지 않습니다. 청크 크기나 분할 방식만 바뀌었을 때는
+    캐시된 텍스트로 다시 분할하므로 PDF/HWPX/XLSX를 다시 추출하지 않습니다.
+
+    항목마다 파일 하나이고 임시 파일에 쓴 뒤 이름을 바꿔 저장하므로, 파싱 워커 프로세스 여러 개가
+    잠금 없이 같이 써도 됩니다 (객체는 경로와 설정값만 가지므로 워커로 pickle 가능).
+    전체 크기가 max_size_mb를 넘으면 가장 오래 읽지 않은 항목부터 지웁니다.
+    """
+
+    SUFFIX = ".jsonl.gz"
+
+    def __init__(self, directory: str = "./cache/parsed", max_size_mb: int = 4096):
+        """
+        Args:
+            directory: 캐시 저장 디렉토리
+            max_size_mb: 최대 크기 (MB)
+        """
+        self.directory = Path(directory)
+        self.max_bytes = int(max_size_mb * 1024 * 1024)
+        self.hits = 0
+        self.misses = 0
+        # 이 프로세스에서 추정한 전체 크기 (처음 필요할 때 계산)
+        self._size: Optional[int] = None
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def make_key(content_hash: str, variant: str) -> str:
+        """
+        캐시 키 생성
+
+        Args:
+            content_hash: 원본 문서의 내용 해시 (hash_file, 경로/수정 시각과 무관)
+            variant: 추출 방식 (형식, 백엔드, 파서 버전 등 추출 결과에 영향을 주는 값)
+
+        Returns:
+            캐시 키 (hex 문자열)
+        """
+        return hashlib.sha256(f"{content_hash}:{variant}".encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def hash_file(file_path: Path) -> str:
+        """문서 내용 해시 (인덱싱 매니페스트의 hash_file과 같은 MD5)"""
+        digest = hashlib.md5()
+        with open(file_path, "rb") as f:
+            for block in iter(lambda: f.read(_HASH_BLOCK), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def read(self, key: str) -> Optional[Iterator[list]]:
+        """
+        캐시된 레코드 반환
+
+        Args:
+            key: 캐시 키
+
+        Returns:
+            레코드를 순서대로 생성하는 반복자 (캐시에 없으면 None)
+        """
+        path = self._path(key)
+        try:
+            # 최근 사용 시각을 수정 시각으로 기록 (정리 순서 기준)
+            os.utime(path)
+        except OSError:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return self._iter_records(path)
+
+    @contextmanager
+    def writer(self, key: str):
+        """
+        레코드를 캐시에 쓰는 컨텍스트
+
+        블록이 정상적으로 끝나야 저장되며, 예외나 중단(생성기 close)으로 빠져나가면 버립니다.
+
+        Yields:
+            레코드를 받는 함수 (record -> None)
+        """
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+
+        f = gzip.open(tmp_path, "wt", encoding="utf-8", compresslevel=6)
+        try:
+            yield lambda record: f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            f.close()
+            tmp_path.replace(path)
+        except BaseException:
+            f.close()
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+        if self._size is not None:
+            self._size += path.stat().st_size
+        if self.size_bytes() > self.max_bytes:
+            self.prune()
+
+    def stats(self) -> Dict:
+        """
+        캐시 통계
+
+        Returns:
+            항목 수, 크기, 최대 크기, 이번 실행의 적중/실패 수
+        """
+        files = self._entries()
+        size = sum(file_size for _, file_size, _ in files)
+        self._size = size
+        return {
+            "directory": str(self.directory),
+            "entries": len(files),
+            "size_bytes": size,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses
+        }
+
+    def size_bytes(self) -> int:
+        """캐시 전체 크기 (바이트)"""
+        if self._size is None:
+            self._size = sum(file_size for _, file_size, _ in self._entries())
+        return self._size
+
+    def prune(self, max_bytes: Optional[int] = None) -> int:
+        """
+        오래 읽지 않은 항목 제거
+
+        Args:
+            max_bytes: 목표 최대 크기 (None이면 설정값의 90%까지 줄임)
+
+        Returns:
+            제거된 항목 수
+        """
+        target = int(self.max_bytes * 0.9) if max_bytes is None else max_bytes
+
+        # 최근 사용 순으로 목표 크기까지 남김
+        entries = sorted(self._entries(), key=lambda entry: entry[2], reverse=True)
+        total = 0
+        removed = 0
+        for path, size, _ in entries:
+            if total + size <= target:
+                total += size
+                continue
+            try:
+                path.unlink()
+                removed += 1
+            except OSError:
+                total += size
+
+        self._size = total
+        if removed:
+            logger.info(f"Pruned {removed} cached parse results")
+        return removed
+
+    def clear(self) -> int:
+        """모든 항목 삭제"""
+        return self.prune(max_bytes=0)
+
+    def close(self):
+        """EmbeddingCache와 같은 사용법을 위한 메서드 (항목마다 파일을 열고 닫으므로 할 일 없음)"""
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}{self.SUFFIX}"
+
+    def _entries(self) -> List[tuple]:
+        """(경로, 크기, 최근 사용 시각) 목록"""
+        entries = []
+        for path in self.directory.glob(f"*/*{self.SUFFIX}"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((path, stat.st_size, stat.st_mtime))
+        return entries
+
+    @staticmethod
+    def _iter_records(path: Path) -> Iterator[list]:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                yield json.loads(line)
+
+    def __repr__(self) -> str:
+        return f"TextCache(directory={self.directory}, max_size_mb={self.max_bytes // (1024 * 1024)})"
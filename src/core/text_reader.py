@@ -0,0 +1,125 @@
+"""큰 텍스트 파일(TXT, MD, 로그) 스트리밍 읽기 - 앞부분으로 인코딩을 추정하고 mmap 구간 단위로 디코딩"""
+from pathlib import Path
+from typing import Iterator, Tuple
+import codecs
+import logging
+import mmap
+
+logger = logging.getLogger(__name__)
+
+# 시도할 인코딩 (앞에서부터, euc-kr은 cp949의 부분집합이지만 기존 순서 유지)
+TEXT_ENCODINGS = ["utf-8", "cp949", "euc-kr"]
+
+# 인코딩을 추정할 때 보는 앞부분 크기
+SAMPLE_BYTES = 64 * 1024
+
+# 한 번에 디코딩하여 청크 분할기에 넘기는 크기
+WINDOW_BYTES = 1024 * 1024
+
+# 바이트 순서 표시 → 인코딩 (표시 자체는 텍스트에서 제외)
+_BOMS = [
+    (codecs.BOM_UTF8, "utf-8"),
+    (codecs.BOM_UTF16_LE, "utf-16-le"),
+    (codecs.BOM_UTF16_BE, "utf-16-be"),
+]
+
+
+def sniff_encoding(sample: bytes, complete: bool = False) -> Tuple[str, int]:
+    """
+    파일 앞부분으로 인코딩 추정
+
+    Args:
+        sample: 파일 앞부분 바이트
+        complete: sample이 파일 전체인지 (아니면 끝에서 잘린 멀티바이트 문자를 허용)
+
+    Returns:
+        (인코딩, 건너뛸 BOM 길이)
+
+    Raises:
+        ValueError: 어떤 인코딩으로도 디코딩할 수 없음
+    """
+    for bom, encoding in _BOMS:
+        if sample.startswith(bom):
+            return encoding, len(bom)
+
+    for encoding in TEXT_ENCODINGS:
+        try:
+            codecs.getincrementaldecoder(encoding)().decode(sample, final=complete)
+            return encoding, 0
+        except UnicodeDecodeError:
+            continue
+    raise ValueError("Could not detect text encoding")
+
+
+def iter_text_windows(
+    file_path: Path,
+    window_bytes: int = WINDOW_BYTES,
+    sample_bytes: int = SAMPLE_BYTES
+) -> Iterator[str]:
+    """
+    텍스트 파일을 구간 단위로 디코딩하여 생성 (파일 전체를 읽거나 문자열로 만들지 않음)
+
+    파일을 mmap으로 열어 앞부분으로 인코딩을 한 번 정하고, window_bytes씩 증분 디코딩합니다.
+    구간 경계에서 잘린 멀티바이트 문자는 다음 구간과 이어서 디코딩하고, 줄바꿈(\\r\\n, \\r)은
+    텍스트 모드로 읽을 때처럼 \\n으로 바꿉니다.
+
+    앞부분이 ASCII뿐이라 UTF-8로 추정했는데 뒤에서 UTF-8이 아닌 바이트가 나오면, 그때까지 읽은
+    구간이 모두 ASCII인 경우에 한해 다음 후보 인코딩으로 바꿔 이어서 디코딩합니다
+    (ASCII는 후보 인코딩에서 모두 같은 문자).
+
+    Args:
+        file_path: 텍스트 파일 경로
+        window_bytes: 한 번에 디코딩할 바이트 수
+        sample_bytes: 인코딩 추정에 쓰는 앞부분 바이트 수
+
+    Yields:
+        디코딩된 텍스트 구간 (이어 붙이면 파일 전체 텍스트)
+
+    Raises:
+        ValueError: 디코딩할 수 없는 파일
+    """
+    size = file_path.stat().st_size
+    if size == 0:
+        return
+
+    with open(file_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        try:
+            encoding, position = sniff_encoding(mm[:sample_bytes], complete=size <= sample_bytes)
+        except ValueError:
+            raise ValueError(f"Could not decode file: {file_path}")
+
+        decoder = codecs.getincrementaldecoder(encoding)()
+        ascii_only = True
+        # 구간 끝의 \r은 다음 구간이 \n으로 시작할 수 있으므로 보류
+        carry = ""
+
+        while position < size:
+            block = mm[position:position + window_bytes]
+            position += len(block)
+            final = position >= size
+
+            while True:
+                try:
+                    text = decoder.decode(block, final=final)
+                    break
+                except UnicodeDecodeError:
+                    encoding, decoder = _next_decoder(file_path, encoding, ascii_only)
+            ascii_only = ascii_only and block.isascii()
+
+            text = carry + text
+            carry = ""
+            if not final and text.endswith("\r"):
+                text, carry = text[:-1], "\r"
+            if text:
+                yield text.replace("\r\n", "\n").replace("\r", "\n")
+
+
+def _next_decoder(file_path: Path, encoding: str, ascii_only: bool):
+    """디코딩 중 오류가 나면 다음 후보 인코딩의 디코더 반환 (앞 구간이 ASCII뿐일 때만)"""
+    remaining = TEXT_ENCODINGS[TEXT_ENCODINGS.index(encoding) + 1:] if encoding in TEXT_ENCODINGS else []
+    if not ascii_only or not remaining:
+        raise ValueError(f"Could not decode file: {file_path} (invalid {encoding} data)")
+
+    candidate = remaining[0]
+    logger.info(f"{file_path} is not {encoding} past its ASCII prefix; decoding as {candidate}")
+    return candidate, codecs.getincrementaldecoder(candidate)()
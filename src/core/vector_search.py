@@ -1,12 +1,36 @@
 """벡터 검색 엔진 - ChromaDB 기반"""
-from typing import List, Dict, Optional
+from typing import TYPE_CHECKING, Callable, Hashable, List, Dict, Optional, Sequence, Union
 from pathlib import Path
 import logging
-import chromadb
-from chromadb.config import Settings
+import time
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import chromadb
 
 logger = logging.getLogger(__name__)
 
+# 임베딩 벡터 묶음: (n, dim) float32 배열 (float 리스트의 리스트도 받음)
+Embeddings = Union[np.ndarray, Sequence[Sequence[float]]]
+
+
+def as_embedding_matrix(embeddings: Embeddings) -> np.ndarray:
+    """임베딩을 (n, dim) float32 배열로 변환 (이미 float32 배열이면 복사하지 않음)"""
+    return np.asarray(embeddings, dtype=np.float32)
+
+
+def release_clients():
+    """
+    프로세스에 캐시된 ChromaDB 클라이언트를 모두 닫음
+    
+    ChromaDB는 같은 경로의 클라이언트를 프로세스 안에서 공유하고 벡터 인덱스를 메모리에 둡니다.
+    다른 프로세스가 쓴 내용을 오래 실행 중인 프로세스(검색 데몬)가 보려면 클라이언트를 닫고
+    VectorSearch를 새로 만들어야 합니다.
+    """
+    import chromadb.api.client
+    chromadb.api.client.SharedSystemClient.clear_system_cache()
+
 
 class VectorSearch:
     """ChromaDB를 사용한 벡터 검색 엔진"""
@@ -25,11 +49,16 @@ class VectorSearch:
         self.collection_name = collection_name
         self.client = None
         self.collection = None
+        self._max_batch_size: Optional[int] = None
         
         self._initialize_client()
     
     def _initialize_client(self):
         """ChromaDB 클라이언트 초기화"""
+        # chromadb는 import가 무거우므로 벡터 DB를 실제로 열 때 import
+        import chromadb
+        from chromadb.config import Settings
+        
         try:
             # 저장 디렉토리 생성
             self.persist_directory.mkdir(parents=True, exist_ok=True)
@@ -49,7 +78,7 @@ class VectorSearch:
             logger.error(f"Failed to initialize ChromaDB: {e}")
             raise
     
-    def get_or_create_collection(self, collection_name: Optional[str] = None) -> chromadb.Collection:
+    def get_or_create_collection(self, collection_name: Optional[str] = None) -> "chromadb.Collection":
         """
         컬렉션 가져오기 또는 생성
         
@@ -73,41 +102,102 @@ class VectorSearch:
             logger.error(f"Failed to get/create collection: {e}")
             raise
     
+    @property
+    def max_batch_size(self) -> int:
+        """클라이언트가 한 번의 add/upsert/delete로 받을 수 있는 최대 항목 수"""
+        if self._max_batch_size is None:
+            try:
+                self._max_batch_size = self.client.get_max_batch_size()
+            except Exception as e:
+                logger.debug(f"Could not query max batch size: {e}")
+                self._max_batch_size = 5000
+        return self._max_batch_size
+    
     def add_documents(
         self,
         ids: List[str],
-        embeddings: List[List[float]],
+        embeddings: Embeddings,
         documents: List[str],
-        metadatas: List[Dict]
+        metadatas: List[Dict],
+        upsert: bool = False
     ):
         """
-        문서 임베딩 추가
+        문서 임베딩 추가 (최대 배치 크기를 넘으면 나눠서 저장)
         
         Args:
             ids: 문서 ID 리스트
-            embeddings: 임베딩 벡터 리스트
+            embeddings: (len(ids), dim) 임베딩 배열 (벡터 리스트도 가능)
             documents: 원본 텍스트 리스트
             metadatas: 메타데이터 리스트
+            upsert: True면 같은 ID의 기존 문서를 덮어씀
         """
+        if not ids:
+            return
+        
+        embeddings = as_embedding_matrix(embeddings)
+        
         if not self.collection:
             self.get_or_create_collection()
         
+        write = self.collection.upsert if upsert else self.collection.add
+        step = self.max_batch_size
+        
         try:
-            self.collection.add(
-                ids=ids,
-                embeddings=embeddings,
-                documents=documents,
-                metadatas=metadatas
-            )
-            logger.info(f"Added {len(ids)} documents to collection")
+            for start in range(0, len(ids), step):
+                end = start + step
+                write(
+                    ids=ids[start:end],
+                    embeddings=embeddings[start:end],
+                    documents=documents[start:end],
+                    metadatas=metadatas[start:end]
+                )
+            logger.info(f"{'Upserted' if upsert else 'Added'} {len(ids)} documents to collection")
             
         except Exception as e:
             logger.error(f"Failed to add documents: {e}")
             raise
     
+    def delete_documents(self, ids: List[str]):
+        """
+        문서 청크 삭제
+        
+        Args:
+            ids: 삭제할 문서 ID 리스트
+        """
+        if not ids:
+            return
+        
+        if not self.collection:
+            self.get_or_create_collection()
+        
+        step = self.max_batch_size
+        
+        try:
+            for start in range(0, len(ids), step):
+                self.collection.delete(ids=ids[start:start + step])
+            logger.info(f"Deleted {len(ids)} documents from collection")
+            
+        except Exception as e:
+            logger.error(f"Failed to delete documents: {e}")
+            raise
+    
+    def bulk_writer(self, batch_size: Optional[int] = None) -> "BulkWriter":
+        """
+        여러 파일의 청크를 모아 한 번에 쓰는 버퍼 생성
+        
+        Args:
+            batch_size: 한 번에 쓸 청크 수 (None이면 클라이언트 최대 배치 크기)
+            
+        Returns:
+            BulkWriter
+        """
+        if not self.collection:
+            self.get_or_create_collection()
+        return BulkWriter(self, batch_size)
+    
     def search(
         self,
-        query_embedding: List[float],
+        query_embedding: Union[np.ndarray, Sequence[float]],
         top_k: int = 5,
         where: Optional[Dict] = None
     ) -> Dict:
@@ -115,7 +205,7 @@ class VectorSearch:
         벡터 검색
         
         Args:
-            query_embedding: 쿼리 임베딩 벡터
+            query_embedding: (dim,) 쿼리 임베딩 벡터 (float 리스트도 가능)
             top_k: 반환할 결과 수
             where: 메타데이터 필터 조건
             
@@ -127,7 +217,7 @@ class VectorSearch:
         
         try:
             results = self.collection.query(
-                query_embeddings=[query_embedding],
+                query_embeddings=as_embedding_matrix(query_embedding).reshape(1, -1),
                 n_results=top_k,
                 where=where,
                 include=["documents", "metadatas", "distances"]
@@ -205,3 +295,173 @@ class VectorSearch:
     def __repr__(self) -> str:
         return f"VectorSearch(persist_directory={self.persist_directory}, collection={self.collection_name})"
 
+
+
+
+class BulkWriteError(Exception):
+    """
+    쓰기 버퍼 플러시 실패
+    
+    Attributes:
+        owners: 실패한 플러시에 추가/삭제/콜백이 들어 있던 소유자 (파일) 목록
+    """
+    
+    def __init__(self, owners: List[Hashable], cause: Exception):
+        super().__init__(f"vector DB write failed: {type(cause).__name__}: {cause}")
+        self.owners = owners
+
+
+class BulkWriter:
+    """
+    ChromaDB 쓰기 버퍼
+    
+    작은 파일마다 add를 호출하면 작은 SQLite 트랜잭션이 많이 생기므로, 여러 파일의 청크를 모아
+    batch_size 단위로 upsert합니다. 삭제도 모아 두었다가 다음 플러시에서 먼저 적용합니다.
+    같은 ID의 추가/삭제는 호출 순서대로 적용한 것과 같은 결과가 되도록 버퍼 안에서 정리합니다.
+    
+    추가/삭제/콜백마다 소유자(파일)를 지정하면, 플러시가 실패했을 때 그 버퍼에 들어 있던 모든
+    소유자를 BulkWriteError로 알려 주어 호출한 쪽이 파일별로 되돌릴 수 있습니다.
+    """
+    
+    def __init__(self, vector_db: VectorSearch, batch_size: Optional[int] = None):
+        """
+        Args:
+            vector_db: 벡터 검색 엔진
+            batch_size: 한 번에 쓸 청크 수 (클라이언트 최대 배치 크기를 넘지 않음)
+        """
+        self.vector_db = vector_db
+        self.batch_size = min(batch_size or vector_db.max_batch_size, vector_db.max_batch_size)
+        
+        # ID → (임베딩 행, 텍스트, 메타데이터)
+        self._upserts: Dict[str, tuple] = {}
+        self._deletes: Dict[str, None] = {}
+        self._callbacks: List[Callable[[], None]] = []
+        # 버퍼에 추가/삭제/콜백이 들어 있는 소유자 (순서 유지)
+        self._owners: Dict[Hashable, None] = {}
+        
+        # 통계: 플러시 횟수, 쓴 항목 수(추가+삭제), DB 쓰기에 걸린 시간
+        self.flushes = 0
+        self.written = 0
+        self.wall_seconds = 0.0
+        self.cpu_seconds = 0.0
+    
+    def upsert(
+        self,
+        ids: List[str],
+        embeddings: Embeddings,
+        documents: List[str],
+        metadatas: List[Dict],
+        owner: Optional[Hashable] = None
+    ):
+        """
+        청크 추가/덮어쓰기 (버퍼가 batch_size만큼 차면 플러시)
+        
+        Args:
+            ids: 문서 ID 리스트
+            embeddings: (len(ids), dim) 임베딩 배열 (벡터 리스트도 가능, 행은 복사하지 않고 보관)
+            documents: 원본 텍스트 리스트
+            metadatas: 메타데이터 리스트
+            owner: 청크를 쓰는 소유자 (플러시 실패 시 BulkWriteError.owners에 포함)
+            
+        Raises:
+            BulkWriteError: 이 호출로 시작된 플러시가 실패한 경우
+        """
+        for chunk_id, embedding, document, metadata in zip(ids, embeddings, documents, metadatas):
+            self._deletes.pop(chunk_id, None)
+            self._upserts[chunk_id] = (embedding, document, metadata)
+        if ids:
+            self._add_owner(owner)
+        
+        if len(self._upserts) >= self.batch_size:
+            self.flush()
+    
+    def delete(self, ids: List[str], owner: Optional[Hashable] = None):
+        """
+        청크 삭제 (아직 쓰지 않은 같은 ID의 추가는 취소)
+        
+        Args:
+            ids: 삭제할 문서 ID 리스트
+            owner: 삭제하는 소유자 (플러시 실패 시 BulkWriteError.owners에 포함)
+        """
+        for chunk_id in ids:
+            self._upserts.pop(chunk_id, None)
+            self._deletes[chunk_id] = None
+        if ids:
+            self._add_owner(owner)
+    
+    def on_flush(self, callback: Callable[[], None], owner: Optional[Hashable] = None):
+        """
+        지금까지 버퍼에 넣은 내용이 DB에 반영된 뒤 실행할 콜백 등록
+        
+        버퍼가 비어 있으면 바로 실행합니다. 플러시가 실패하면 실행하지 않습니다.
+        
+        Args:
+            callback: 실행할 함수
+            owner: 콜백을 등록한 소유자 (플러시 실패 시 BulkWriteError.owners에 포함)
+        """
+        if self._upserts or self._deletes:
+            self._callbacks.append(callback)
+            self._add_owner(owner)
+        else:
+            callback()
+    
+    def flush(self):
+        """
+        버퍼의 삭제와 추가를 DB에 반영하고 대기 중인 콜백 실행
+        
+        Raises:
+            BulkWriteError: DB 쓰기 실패 (버퍼는 비워지고 콜백은 실행되지 않음)
+        """
+        deletes = list(self._deletes)
+        upserts = self._upserts
+        callbacks = self._callbacks
+        owners = list(self._owners)
+        self._deletes, self._upserts, self._callbacks, self._owners = {}, {}, [], {}
+        wall, cpu = time.perf_counter(), time.thread_time()
+        
+        try:
+            if deletes:
+                self.vector_db.delete_documents(deletes)
+            
+            if upserts:
+                ids = list(upserts)
+                values = list(upserts.values())
+                self.vector_db.add_documents(
+                    ids=ids,
+                    embeddings=[value[0] for value in values],
+                    documents=[value[1] for value in values],
+                    metadatas=[value[2] for value in values],
+                    upsert=True
+                )
+        except Exception as e:
+            # 같은 쓰기를 다시 시도하지 않고 소유자들에게 실패를 알림 (되돌리기는 호출한 쪽이 처리)
+            logger.error(f"Failed to write {len(upserts)} chunks and {len(deletes)} deletes: {e}")
+            raise BulkWriteError(owners, e) from e
+        
+        if deletes or upserts:
+            self.flushes += 1
+            self.written += len(deletes) + len(upserts)
+            self.wall_seconds += time.perf_counter() - wall
+            self.cpu_seconds += time.thread_time() - cpu
+        
+        for callback in callbacks:
+            callback()
+    
+    def close(self):
+        """남은 버퍼 플러시"""
+        self.flush()
+    
+    def _add_owner(self, owner: Optional[Hashable]):
+        if owner is not None:
+            self._owners[owner] = None
+    
+    def __len__(self) -> int:
+        return len(self._upserts)
+    
+    def __enter__(self) -> "BulkWriter":
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        # 예외로 빠져나갈 때는 쓰지 않음 (저널이 다음 실행에서 되돌림)
+        if exc_type is None:
+            self.close()
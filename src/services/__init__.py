@@ -1,7 +1,37 @@
-"""Service layer for business logic"""
-from .indexing import IndexingService
-from .query import QueryService
-from .management import ManagementService
+"""Service layer for business logic
 
-__all__ = ["IndexingService", "QueryService", "ManagementService"]
+서비스 모듈은 처음 사용할 때 import합니다 (src.core와 같은 이유).
+"""
+from importlib import import_module
+from typing import TYPE_CHECKING
 
+# 공개 이름 → 정의된 하위 모듈
+_EXPORTS = {
+    "IndexingService": ".indexing",
+    "QueryService": ".query",
+    "ManagementService": ".management",
+    "WatchService": ".watcher",
+    "QueryDaemon": ".daemon",
+}
+
+__all__ = list(_EXPORTS)
+
+if TYPE_CHECKING:
+    from .indexing import IndexingService
+    from .query import QueryService
+    from .management import ManagementService
+    from .watcher import WatchService
+    from .daemon import QueryDaemon
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
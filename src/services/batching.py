@@ -0,0 +1,211 @@
+"""청크 누적기 - 여러 파일의 청크를 모아 임베딩 배치를 채움"""
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional
+import logging
+import time
+
+from ..core.parser import DocumentChunk
+from .profiling import IndexProfiler
+
+if TYPE_CHECKING:
+    import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class _FileState:
+    """임베딩 진행 중인 파일 하나의 상태"""
+
+    __slots__ = ("file_path", "ready", "emitted", "remaining", "final", "failed")
+
+    def __init__(self, file_path: Path):
+        self.file_path = file_path
+        # 임베딩은 끝났지만 아직 전달하지 않은 (청크, 임베딩)
+        self.ready: List[tuple] = []
+        # 이미 전달한 청크 수 (다음 조각의 시작 인덱스)
+        self.emitted = 0
+        # 대기열에 남아 있는 청크 수
+        self.remaining = 0
+        self.final = False
+        self.failed = False
+
+
+class ChunkAccumulator:
+    """
+    파일 경계를 넘어 청크를 모아 batch_size 단위로 임베딩
+
+    작은 파일이 많을 때 model.encode 호출이 1~3개 텍스트로 잘게 쪼개지는 것을 막습니다.
+    배치가 가득 차거나 가장 오래된 청크가 max_wait 초를 넘기면 임베딩합니다.
+    큰 파일은 청크를 여러 번에 나눠 add할 수 있으며, 배치가 임베딩될 때마다 파일별로
+    on_chunks_ready(file_path, start_index, chunks, embeddings, is_last)를 호출하므로
+    메모리에 머무는 청크 수는 파일 크기가 아니라 배치 크기에 비례합니다.
+    """
+
+    def __init__(
+        self,
+        embedder,
+        on_chunks_ready: Callable[[Path, int, List[DocumentChunk], List["np.ndarray"], bool], None],
+        on_file_error: Callable[[Path, Exception], None],
+        batch_size: Optional[int] = None,
+        max_wait: float = 2.0,
+        profiler: Optional[IndexProfiler] = None
+    ):
+        """
+        Args:
+            embedder: 임베딩 엔진 (embed_documents 제공)
+            on_chunks_ready: 파일의 청크 일부가 임베딩될 때마다 순서대로 호출
+                (is_last=True면 그 파일의 마지막 조각, 임베딩은 배치 배열의 행 뷰 리스트,
+                청크가 없는 파일은 빈 마지막 조각으로 한 번 호출)
+            on_file_error: 파일이 포함된 배치의 임베딩이 실패했을 때 호출
+            batch_size: embed_documents 한 번에 넘길 청크 수 (None이면 embedder.embed_window,
+                없으면 embedder.batch_size)
+            max_wait: 배치를 채우기 위해 기다리는 최대 시간 (초)
+            profiler: 임베딩 시간을 기록할 프로파일러 (선택)
+        """
+        self.embedder = embedder
+        self.on_chunks_ready = on_chunks_ready
+        self.on_file_error = on_file_error
+        self.batch_size = max(
+            1, batch_size or getattr(embedder, "embed_window", None) or getattr(embedder, "batch_size", 32)
+        )
+        self.max_wait = max_wait
+        self.profiler = profiler
+
+        # (파일 상태, 청크) 대기열
+        self._pending: List[tuple] = []
+        self._oldest: Optional[float] = None
+        # 아직 마지막 조각을 전달하지 않은 파일
+        self._states: Dict[Path, _FileState] = {}
+
+    def add(self, file_path: Path, chunks: List[DocumentChunk], final: bool = True):
+        """
+        파일의 청크를 대기열에 추가하고 가득 찬 배치를 임베딩
+
+        Args:
+            file_path: 원본 파일 경로
+            chunks: 파싱된 청크 리스트 (파일의 일부여도 됨)
+            final: 이 파일의 마지막 청크까지 추가했는지 여부
+        """
+        state = self._states.get(file_path)
+        if state is None:
+            # 청크가 하나도 없는 파일도 빈 마지막 조각을 전달 (이전 버전의 청크 삭제와 매니페스트 기록)
+            if not chunks and not final:
+                return
+            state = self._states[file_path] = _FileState(file_path)
+
+        if state.failed:
+            return
+
+        if chunks:
+            if self._oldest is None:
+                self._oldest = time.monotonic()
+            self._pending.extend((state, chunk) for chunk in chunks)
+            state.remaining += len(chunks)
+        state.final = final
+
+        # 마지막 add가 빈 리스트이고 앞선 청크가 모두 임베딩되었으면 바로 마무리
+        if final and state.remaining == 0:
+            self._emit(state)
+
+        while len(self._pending) >= self.batch_size:
+            self._embed_batch(self.batch_size)
+
+    def discard(self, file_path: Path) -> bool:
+        """
+        파일의 남은 청크를 버리고 이후 add도 무시 (파싱/저장 도중 실패한 파일)
+
+        Args:
+            file_path: 원본 파일 경로
+
+        Returns:
+            이미 실패 처리된 파일이면 False
+        """
+        state = self._states.get(file_path)
+        if state is None:
+            state = self._states[file_path] = _FileState(file_path)
+        elif state.failed:
+            return False
+
+        state.failed = True
+        state.ready.clear()
+        return True
+
+    def time_until_due(self) -> Optional[float]:
+        """시간 기준 플러시까지 남은 시간 (대기 중인 청크가 없으면 None)"""
+        if self._oldest is None:
+            return None
+        return max(0.0, self._oldest + self.max_wait - time.monotonic())
+
+    def flush_if_due(self):
+        """가장 오래된 청크가 max_wait를 넘겼으면 덜 찬 배치라도 임베딩"""
+        remaining = self.time_until_due()
+        if remaining is not None and remaining <= 0:
+            self.flush()
+
+    def flush(self):
+        """대기 중인 모든 청크 임베딩"""
+        while self._pending:
+            self._embed_batch(self.batch_size)
+
+    def close(self):
+        """남은 청크를 모두 처리"""
+        self.flush()
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def _embed_batch(self, size: int):
+        """대기열 앞에서 size개를 꺼내 한 번에 임베딩하고 파일별로 되돌려 줌"""
+        batch = self._pending[:size]
+        del self._pending[:size]
+        self._oldest = time.monotonic() if self._pending else None
+
+        # 이미 실패한 파일의 청크는 건너뜀
+        batch = [(state, chunk) for state, chunk in batch if not state.failed]
+        if not batch:
+            return
+
+        texts = [chunk.text for _, chunk in batch]
+        logger.debug(f"Embedding batch of {len(texts)} chunks")
+
+        try:
+            if self.profiler is not None:
+                with self.profiler.stage("embed", items=len(texts)):
+                    embeddings = self.embedder.embed_documents(texts)
+            else:
+                embeddings = self.embedder.embed_documents(texts)
+        except Exception as e:
+            failed_states = []
+            for state, _ in batch:
+                if not state.failed:
+                    self.discard(state.file_path)
+                    failed_states.append(state)
+            for state in failed_states:
+                self.on_file_error(state.file_path, e)
+            return
+
+        # 대기열은 FIFO이므로 파일별 청크 순서가 유지됨
+        touched = {}
+        for (state, chunk), embedding in zip(batch, embeddings):
+            state.ready.append((chunk, embedding))
+            state.remaining -= 1
+            touched[id(state)] = state
+
+        for state in touched.values():
+            self._emit(state)
+
+    def _emit(self, state: _FileState):
+        """임베딩이 끝난 청크를 파일 단위 조각으로 전달"""
+        is_last = state.final and state.remaining == 0
+        if not state.ready and not is_last:
+            return
+
+        chunks = [chunk for chunk, _ in state.ready]
+        embeddings = [embedding for _, embedding in state.ready]
+        start_index = state.emitted
+        state.emitted += len(chunks)
+        state.ready = []
+        if is_last:
+            self._states.pop(state.file_path, None)
+
+        self.on_chunks_ready(state.file_path, start_index, chunks, embeddings, is_last)
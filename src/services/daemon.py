@@ -0,0 +1,313 @@
+"""검색 데몬 - 모델과 컬렉션을 메모리에 올려 두고 유닉스 소켓으로 검색 요청 처리"""
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+import json
+import logging
+import os
+import signal
+import socket
+import socketserver
+import threading
+
+from .query import QueryResult
+
+if TYPE_CHECKING:
+    from ..core import EmbeddingEngine
+    from .query import QueryService
+
+logger = logging.getLogger(__name__)
+
+# 요청이 데몬에 닿지 않았다고 보고 직접 검색으로 넘어가기까지 기다리는 시간 (초)
+CONNECT_TIMEOUT = 1.0
+# 검색 응답을 기다리는 최대 시간 (초, DB가 바뀌어 다시 여는 경우 포함)
+QUERY_TIMEOUT = 60.0
+
+# 벡터 DB가 바뀌었는지 확인할 때 보는 파일 (다른 프로세스의 인덱싱이 쓰는 SQLite 파일)
+_DB_FILES = ("chroma.sqlite3", "chroma.sqlite3-wal")
+
+
+def is_supported() -> bool:
+    """유닉스 도메인 소켓을 쓸 수 있는 플랫폼인지"""
+    return hasattr(socket, "AF_UNIX")
+
+
+def send_request(socket_path: Path, message: Dict, timeout: float = QUERY_TIMEOUT) -> Optional[Dict]:
+    """
+    데몬에 요청 하나를 보내고 응답 받기
+
+    Args:
+        socket_path: 데몬 소켓 경로
+        message: 요청 ({"op": "query", ...})
+        timeout: 연결 후 응답을 기다리는 최대 시간 (초)
+
+    Returns:
+        응답 딕셔너리 (데몬이 실행 중이 아니거나 응답이 없으면 None)
+    """
+    if not is_supported() or not Path(socket_path).exists():
+        return None
+
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(CONNECT_TIMEOUT)
+            sock.connect(str(socket_path))
+            sock.settimeout(timeout)
+            sock.sendall(json.dumps(message, ensure_ascii=False).encode("utf-8") + b"\n")
+            with sock.makefile("rb") as reader:
+                line = reader.readline()
+    except OSError as e:
+        logger.debug(f"Query daemon not reachable at {socket_path}: {e}")
+        return None
+
+    if not line:
+        return None
+    return json.loads(line)
+
+
+def query_daemon(
+    socket_path: Path,
+    query: str,
+    collection_name: Optional[str] = None,
+    top_k: Optional[int] = None,
+    filters: Optional[Dict] = None,
+    expect: Optional[Dict] = None
+) -> Optional[List[QueryResult]]:
+    """
+    실행 중인 데몬으로 검색
+
+    Args:
+        socket_path: 데몬 소켓 경로
+        query: 검색 쿼리
+        collection_name: 검색할 컬렉션 이름 (None이면 데몬의 기본값)
+        top_k: 반환할 결과 수 (None이면 데몬의 기본값)
+        filters: 메타데이터 필터
+        expect: 데몬 설정이 이 값들과 같을 때만 사용 (모델, DB 경로 등 - QueryDaemon.identity 참고)
+
+    Returns:
+        검색 결과 (데몬이 없거나, 설정이 다르거나, 실패하면 None - 직접 검색으로 대체)
+    """
+    response = send_request(socket_path, {
+        "op": "query",
+        "query": query,
+        "collection": collection_name,
+        "top_k": top_k,
+        "filters": filters,
+        "expect": expect or {}
+    })
+    if response is None:
+        return None
+    if not response.get("ok"):
+        logger.warning(f"Query daemon could not answer ({response.get('error')}); searching in-process")
+        return None
+    return [QueryResult.from_dict(item) for item in response["results"]]
+
+
+class QueryDaemon:
+    """
+    검색 데몬
+
+    임베딩 모델과 컬렉션을 한 번만 로드해 두고 요청마다 쿼리 임베딩과 벡터 검색만 수행합니다.
+    다른 프로세스가 인덱싱하여 DB 파일이 바뀌면 다음 요청에서 컬렉션을 다시 엽니다.
+    """
+
+    def __init__(
+        self,
+        embedder: "EmbeddingEngine",
+        persist_directory: str = "./chroma",
+        default_collection: str = "default",
+        top_k: int = 5,
+        snippet_length: int = 200
+    ):
+        """
+        Args:
+            embedder: 임베딩 엔진 (이미 모델을 로드한 상태)
+            persist_directory: ChromaDB 저장 디렉토리
+            default_collection: 요청에 컬렉션이 없을 때 검색할 컬렉션
+            top_k: 기본 결과 수
+            snippet_length: 스니펫 길이 (문자 수)
+        """
+        self.embedder = embedder
+        self.persist_directory = Path(persist_directory)
+        self.default_collection = default_collection
+        self.top_k = top_k
+        self.snippet_length = snippet_length
+
+        self._services: Dict[str, "QueryService"] = {}
+        self._db_version: Optional[Tuple] = None
+        # 모델과 ChromaDB 클라이언트를 요청 스레드들이 함께 쓰므로 검색은 하나씩 처리
+        self._lock = threading.Lock()
+        self._server: Optional[socketserver.BaseServer] = None
+
+    @staticmethod
+    def identity(
+        model_name: str,
+        backend: str,
+        quantize: bool,
+        persist_directory: str
+    ) -> Dict:
+        """데몬과 클라이언트가 같은 설정인지 비교하는 값 (다르면 클라이언트가 직접 검색)"""
+        return {
+            "model_name": model_name,
+            "backend": backend,
+            "quantize": bool(quantize),
+            "persist_directory": str(Path(persist_directory).resolve())
+        }
+
+    @property
+    def own_identity(self) -> Dict:
+        return self.identity(
+            self.embedder.model_name, self.embedder.backend, self.embedder.quantize, str(self.persist_directory)
+        )
+
+    def warm_up(self):
+        """첫 요청이 느리지 않도록 모델 추론과 기존 컬렉션을 미리 실행/로드"""
+        from ..core.vector_search import VectorSearch
+
+        self.embedder.embed_query("memoRAG")
+        with self._lock:
+            self._reload_if_changed()
+            names = VectorSearch(persist_directory=str(self.persist_directory)).list_collections()
+            for name in names:
+                self._service(name)
+        logger.info(f"Query daemon warmed up with {len(names)} collections")
+
+    def handle(self, request: Dict) -> Dict:
+        """
+        요청 하나 처리
+
+        Args:
+            request: {"op": "ping" | "query" | "shutdown", ...}
+
+        Returns:
+            응답 ({"ok": True, ...} 또는 {"ok": False, "error": ...})
+        """
+        op = request.get("op")
+        if op == "ping":
+            return {"ok": True, "pid": os.getpid(), **self.own_identity}
+
+        if op == "shutdown":
+            if self._server is not None:
+                threading.Thread(target=self._server.shutdown, daemon=True).start()
+            return {"ok": True}
+
+        if op != "query":
+            return {"ok": False, "error": f"unknown op: {op}"}
+
+        own = self.own_identity
+        mismatched = [key for key, value in (request.get("expect") or {}).items() if own.get(key) != value]
+        if mismatched:
+            return {"ok": False, "error": f"daemon settings differ: {', '.join(mismatched)}"}
+
+        try:
+            with self._lock:
+                self._reload_if_changed()
+                service = self._service(request.get("collection") or self.default_collection)
+                results = service.search(
+                    query=request["query"],
+                    top_k=request.get("top_k") or self.top_k,
+                    filters=request.get("filters")
+                )
+        except Exception as e:
+            logger.exception("Daemon query failed")
+            return {"ok": False, "error": f"{type(e).__name__}: {e}"}
+        return {"ok": True, "results": [result.to_dict() for result in results]}
+
+    def serve(self, socket_path: Path):
+        """
+        소켓에서 요청을 받으며 shutdown 요청이나 SIGTERM/SIGINT까지 실행
+
+        Args:
+            socket_path: 유닉스 소켓 경로 (이미 실행 중인 데몬이 있으면 RuntimeError)
+        """
+        if not is_supported():
+            raise RuntimeError("Unix domain sockets are not supported on this platform")
+
+        socket_path = Path(socket_path)
+        socket_path.parent.mkdir(parents=True, exist_ok=True)
+        if socket_path.exists():
+            if send_request(socket_path, {"op": "ping"}, timeout=CONNECT_TIMEOUT) is not None:
+                raise RuntimeError(f"A query daemon is already running on {socket_path}")
+            # 비정상 종료한 데몬이 남긴 소켓 파일
+            socket_path.unlink()
+
+        daemon = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                for line in self.rfile:
+                    try:
+                        response = daemon.handle(json.loads(line))
+                    except (ValueError, KeyError) as e:
+                        response = {"ok": False, "error": f"bad request: {e}"}
+                    self.wfile.write(json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n")
+
+        # 문서 내용이 오가므로 소켓은 소유자만 접근
+        umask = os.umask(0o177)
+        try:
+            server = socketserver.ThreadingUnixStreamServer(str(socket_path), Handler)
+        finally:
+            os.umask(umask)
+        server.daemon_threads = True
+        self._server = server
+
+        def stop(signum, frame):
+            threading.Thread(target=server.shutdown, daemon=True).start()
+
+        previous = {}
+        if threading.current_thread() is threading.main_thread():
+            previous = {sig: signal.signal(sig, stop) for sig in (signal.SIGTERM, signal.SIGINT)}
+        logger.info(f"Query daemon listening on {socket_path} (pid {os.getpid()})")
+        try:
+            server.serve_forever()
+        finally:
+            for sig, handler in previous.items():
+                signal.signal(sig, handler)
+            server.server_close()
+            self._server = None
+            try:
+                socket_path.unlink()
+            except FileNotFoundError:
+                pass
+            logger.info("Query daemon stopped")
+
+    def _service(self, collection_name: str) -> "QueryService":
+        """컬렉션별 검색 서비스 (처음 요청할 때 컬렉션을 열어 둠)"""
+        service = self._services.get(collection_name)
+        if service is None:
+            from ..core.vector_search import VectorSearch
+            from .query import QueryService
+
+            vector_db = VectorSearch(persist_directory=str(self.persist_directory), collection_name=collection_name)
+            vector_db.get_or_create_collection()
+            service = self._services[collection_name] = QueryService(
+                embedder=self.embedder,
+                vector_db=vector_db,
+                top_k=self.top_k,
+                snippet_length=self.snippet_length
+            )
+            # 컬렉션을 새로 만들었으면 DB 파일이 바뀌므로, 자기 변경으로 다시 열지 않도록 갱신
+            self._db_version = self._current_db_version()
+        return service
+
+    def _reload_if_changed(self):
+        """다른 프로세스가 DB를 바꿨으면 열어 둔 컬렉션을 닫음 (다음 요청에서 다시 열림)"""
+        version = self._current_db_version()
+        if version == self._db_version:
+            return
+        if self._services:
+            from ..core.vector_search import release_clients
+
+            logger.info("Vector DB changed on disk; reopening collections")
+            self._services.clear()
+            release_clients()
+        self._db_version = version
+
+    def _current_db_version(self) -> Tuple:
+        """DB 파일들의 (수정 시각, 크기)"""
+        version = []
+        for name in _DB_FILES:
+            try:
+                stat = (self.persist_directory / name).stat()
+                version.append((stat.st_mtime_ns, stat.st_size))
+            except FileNotFoundError:
+                version.append(None)
+        return tuple(version)
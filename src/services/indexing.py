@@ -1,16 +1,35 @@
 """인덱싱 서비스 - 문서 폴더를 스캔하여 벡터 DB에 저장"""
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional
 import logging
+from dataclasses import dataclass, field
 from datetime import datetime
 import hashlib
 from tqdm import tqdm
 
 from ..core import DocumentParser, EmbeddingEngine, VectorSearch
+from ..core.parser import DocumentChunk
+from ..core.vector_search import BulkWriteError, BulkWriter, Embeddings
+from .batching import ChunkAccumulator
+from .manifest import IndexManifest, FileSignature, file_signature, hash_file
+from .journal import IndexJournal, PendingWrite
+from .pipeline import IndexingPipeline
+from .scanner import FolderScanner
+from .profiling import IndexProfiler, TimedIterator
+from .supervisor import ParseError, ParseEvent, ParseSupervisor
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class _FileWrite:
+    """조각 단위로 쓰는 중인 파일 하나의 상태"""
+    previous_ids: List[str]
+    written_ids: List[str] = field(default_factory=list)
+    # 저장을 마쳐 통계에 넣은 청크 수 (실패하면 통계에서 뺌)
+    stored: int = 0
+
+
 class IndexingService:
     """문서 인덱싱 서비스"""
     
@@ -18,24 +37,70 @@ class IndexingService:
         self,
         parser: DocumentParser,
         embedder: EmbeddingEngine,
-        vector_db: VectorSearch
+        vector_db: VectorSearch,
+        workers: int = 1,
+        queue_size: int = 16,
+        batch_max_wait: float = 2.0,
+        write_batch_size: int = 1024,
+        scanner: Optional[FolderScanner] = None,
+        parse_timeout: float = 0,
+        parse_memory_mb: int = 0,
+        quarantine: bool = True
     ):
         """
         Args:
             parser: 문서 파서
             embedder: 임베딩 엔진
             vector_db: 벡터 검색 엔진
+            workers: 파싱 워커 프로세스 수 (1이면 순차 처리)
+            queue_size: 파이프라인 단계 간 큐 크기 (파일 수)
+            batch_max_wait: 파일 간 임베딩 배치를 채우기 위해 기다리는 최대 시간 (초)
+            write_batch_size: 벡터 DB에 한 번에 쓰는 청크 수 (클라이언트 최대 배치 크기 이하)
+            scanner: 폴더 스캐너 (None이면 기본 제외 패턴 사용)
+            parse_timeout: 파일당 최대 파싱 시간 (초, 0이면 제한 없음). 넘기면 워커를 종료
+            parse_memory_mb: 파일당 파싱 중 늘어날 수 있는 최대 메모리 (MB, 0이면 제한 없음)
+            quarantine: 예산을 넘긴 파일을 격리하여 바뀌기 전까지 다음 실행에서 건너뛸지 여부
         """
         self.parser = parser
         self.embedder = embedder
         self.vector_db = vector_db
+        self.workers = workers
+        self.queue_size = queue_size
+        self.batch_max_wait = batch_max_wait
+        self.write_batch_size = write_batch_size
+        self.scanner = scanner or FolderScanner()
+        self.parse_timeout = parse_timeout
+        self.parse_memory_mb = parse_memory_mb
+        self.quarantine = quarantine
+        
+        # 인덱싱 중에만 열리는 컬렉션 매니페스트
+        self.manifest: Optional[IndexManifest] = None
+        self._signatures = {}
+        
+        # index_folder 실행 중에만 설정되는 작업 저널
+        self._journal: Optional[IndexJournal] = None
+        self._job_id: Optional[int] = None
+        
+        # 인덱싱 중에만 열리는 벡터 DB 쓰기 버퍼
+        self._writer: Optional[BulkWriter] = None
+        # 조각 단위로 쓰는 중인 파일 키 → 쓰기 상태
+        self._writes: Dict[str, _FileWrite] = {}
+        # 마지막 조각까지 버퍼에 넣었지만 아직 DB에 반영되지 않은 파일 키 → 쓰기 상태
+        self._completed: Dict[str, _FileWrite] = {}
+        
+        # index_folder 실행 중에만 설정되는 단계별 시간 집계기
+        self._profiler: Optional[IndexProfiler] = None
     
     def index_folder(
         self,
         folder_path: Path,
         collection_name: Optional[str] = None,
         recursive: bool = True,
-        show_progress: bool = True
+        show_progress: bool = True,
+        workers: Optional[int] = None,
+        incremental: bool = True,
+        resume: bool = False,
+        retry_quarantined: bool = False
     ) -> dict:
         """
         폴더 내 모든 지원 문서를 인덱싱
@@ -45,6 +110,10 @@ class IndexingService:
             collection_name: 저장할 컬렉션 이름 (None이면 기본값)
             recursive: 하위 폴더 포함 여부
             show_progress: 진행률 표시 여부
+            workers: 파싱 워커 프로세스 수 (None이면 생성 시 설정값, 2 이상이면 파이프라인 모드)
+            incremental: True면 매니페스트를 기준으로 변경되지 않은 파일을 건너뜀
+            resume: True면 이 폴더의 중단된 작업을 같은 옵션으로 이어서 진행
+            retry_quarantined: True면 격리된 파일의 격리를 풀고 다시 시도
             
         Returns:
             인덱싱 결과 통계
@@ -53,56 +122,473 @@ class IndexingService:
             raise FileNotFoundError(f"Folder not found: {folder_path}")
         
         logger.info(f"Starting indexing: {folder_path}")
+        profiler = IndexProfiler()
         
         # 컬렉션 생성/가져오기
         self.vector_db.get_or_create_collection(collection_name)
         
-        # 문서 파일 찾기
-        file_list = self._scan_folder(folder_path, recursive)
-        logger.info(f"Found {len(file_list)} supported documents")
+        self._open_manifest(collection_name)
+        journal = IndexJournal.for_collection(
+            self.vector_db.persist_directory, collection_name or self.vector_db.collection_name
+        )
+        try:
+            # 이전 실행이 쓰기 도중 중단되었다면 그 파일의 청크를 되돌림
+            self._rollback_pending(journal)
+            
+            if retry_quarantined:
+                released = self.manifest.release()
+                if released:
+                    logger.info(f"Released {released} quarantined files for retry")
+            
+            folder_key = self._file_key(folder_path)
+            job = journal.last_incomplete_job(folder_key) if resume else None
+            if job is not None:
+                recursive = job.options.get("recursive", recursive)
+                incremental = job.options.get("incremental", incremental)
+                committed = journal.committed_paths(job.job_id)
+                job_id = job.job_id
+                logger.info(f"Resuming job {job_id} started at {job.started_at} ({len(committed)} files done)")
+            else:
+                if resume:
+                    logger.info("No interrupted job to resume; starting a new one")
+                committed = set()
+                job_id = journal.start_job(folder_key, {"recursive": recursive, "incremental": incremental})
+            
+            # 통계
+            stats = {
+                "total_files": 0,
+                "total_chunks": 0,
+                "skipped_files": 0,
+                "resumed_files": 0,
+                "quarantined_files": 0,
+                "deleted_files": 0,
+                "errors": 0,
+                "error_files": []
+            }
+            
+            # 문서 파일을 찾는 대로 변경 사항을 분류하여 바로 인덱싱으로 넘김
+            # (새/수정 파일만 처리하고, 사라진 파일의 청크는 스캔이 끝난 뒤 삭제)
+            # 스캔(변경 감지 포함)은 인덱싱과 번갈아 실행되므로 next() 시간만 따로 측정
+            file_list = TimedIterator(self._plan_changes(
+                folder_path,
+                recursive,
+                self._scan_folder(folder_path, recursive),
+                stats,
+                incremental,
+                committed
+            ))
+            
+            self._journal, self._job_id = journal, job_id
+            self._writer = self.vector_db.bulk_writer(self.write_batch_size)
+            self._profiler = profiler
+            workers = workers or self.workers
+            if workers > 1:
+                self._run_pipelined(file_list, stats, workers, show_progress)
+            else:
+                self._run_sequential(file_list, stats, show_progress)
+            
+            # 남은 쓰기 버퍼 반영 (이때 마지막 파일들의 매니페스트/저널이 기록됨)
+            self._close_writer(stats)
+            
+            profiler.record(
+                "scan", file_list.wall_seconds, file_list.cpu_seconds, items=stats["total_files"]
+            )
+            profiler.record(
+                "write",
+                self._writer.wall_seconds,
+                self._writer.cpu_seconds,
+                items=self._writer.written,
+                calls=self._writer.flushes
+            )
+            stats["timing"] = profiler.report(stats["total_chunks"])
+            
+            if stats["total_files"] == 0:
+                logger.warning("No supported files found")
+            else:
+                logger.info(
+                    f"Found {stats['total_files']} supported documents "
+                    f"({stats['skipped_files']} unchanged, {stats['resumed_files']} already done, "
+                    f"{stats['quarantined_files']} quarantined); "
+                    f"wrote chunks in {self._writer.flushes} transactions"
+                )
+            
+            # 여기까지 오면 작업 완료 (중간에 예외/중단되면 작업은 재개 가능한 상태로 남음)
+            journal.finish_job(job_id)
+        finally:
+            # 예외로 빠져나가면 버퍼는 쓰지 않음 (저널의 PENDING 기록으로 다음 실행에서 정리)
+            self._writer = None
+            self._writes, self._completed = {}, {}
+            self._profiler = None
+            self._journal, self._job_id = None, None
+            journal.close()
+            self._close_manifest()
+        
+        logger.info(f"Indexing complete: {stats}")
+        return stats
+    
+    def _rollback_pending(self, journal: IndexJournal):
+        """저널에 PENDING으로 남은 파일(쓰기 도중 중단)의 청크와 매니페스트 항목 삭제"""
+        pending = journal.pending_writes()
+        if not pending:
+            return
+        
+        logger.warning(f"Rolling back {len(pending)} interrupted writes from a previous run")
+        # 같은 ID가 새 청크와 이전 청크 양쪽에 기록될 수 있으므로 중복 제거
+        self.vector_db.delete_documents(
+            list(dict.fromkeys(chunk_id for write in pending for chunk_id in write.chunk_ids))
+        )
+        self.manifest.delete(write.path for write in pending)
+        journal.discard_pending(pending)
+    
+    def _is_unchanged(self, file_path: Path, signature: FileSignature, entry) -> bool:
+        """
+        매니페스트 항목과 비교하여 파일이 바뀌지 않았는지 확인
+        
+        Args:
+            file_path: 파일 경로
+            signature: 현재 파일 정보 (내용 해시를 계산하면 채워 넣음)
+            entry: 매니페스트 항목 (없으면 None)
+        """
+        if entry is None:
+            return False
         
-        if not file_list:
-            logger.warning("No supported files found")
-            return {"total_files": 0, "total_chunks": 0, "errors": 0}
+        # 크기와 수정 시각이 같으면 내용도 같다고 봄
+        if entry.size == signature.size and entry.mtime_ns == signature.mtime_ns:
+            return True
         
-        # 통계
-        stats = {
-            "total_files": len(file_list),
-            "total_chunks": 0,
-            "errors": 0,
-            "error_files": []
-        }
+        # 수정 시각만 바뀌고 내용이 같으면 매니페스트만 갱신
+        signature.content_hash = hash_file(file_path)
+        if signature.content_hash == entry.content_hash:
+            self.manifest.touch(entry.path, signature)
+            return True
         
-        # 파일별 처리
-        file_iterator = tqdm(file_list, desc="Indexing documents") if show_progress else file_list
+        return False
+    
+    def _run_pipelined(self, file_list: Iterable[Path], stats: dict, workers: int, show_progress: bool):
+        """파이프라인 모드: 파싱과 임베딩/저장을 겹쳐서 실행"""
+        logger.info(f"Pipelined indexing with {workers} parser workers")
+        # 스캔과 동시에 진행하므로 전체 파일 수는 미리 알 수 없음
+        progress = tqdm(desc="Indexing documents", unit="file") if show_progress else None
+        try:
+            IndexingPipeline(self, workers=workers, queue_size=self.queue_size).run(
+                file_list, stats, progress
+            )
+        finally:
+            if progress is not None:
+                progress.close()
+    
+    def _run_sequential(self, file_list: Iterable[Path], stats: dict, show_progress: bool):
+        """
+        순차 모드: 파일을 하나씩 파싱하고 임베딩 배치는 파일 간에 채움
         
-        for file_path in file_iterator:
+        파서가 생성하는 청크를 배치 크기만큼씩 넘기므로 큰 파일도 전체 청크를 메모리에 올리지 않습니다.
+        파싱 예산이 설정되어 있으면 파싱은 감독되는 워커 프로세스 하나에서 실행됩니다.
+        """
+        def store(file_path: Path, start_index: int, chunks, embeddings, is_last: bool):
             try:
-                chunks_count = self._index_file(file_path, collection_name)
-                stats["total_chunks"] += chunks_count
+                self._store_segment(file_path, start_index, chunks, embeddings, is_last)
+                stats["total_chunks"] += len(chunks)
+            except BulkWriteError as e:
+                # 실패한 트랜잭션에 청크가 들어 있던 모든 파일의 이후 조각을 버림
+                for failed_path in self._fail_flush(stats, e):
+                    accumulator.discard(failed_path)
+            except Exception as e:
+                # 같은 파일의 이후 조각은 버림
+                accumulator.discard(file_path)
+                fail(file_path, e)
+        
+        def fail(file_path: Path, error: Exception):
+            stats["total_chunks"] -= self._abort_file(file_path)
+            self._record_error(stats, file_path, error)
+        
+        # 파일 경계를 넘어 임베딩 배치를 채움
+        accumulator = self.create_accumulator(on_chunks_ready=store, on_file_error=fail)
+        
+        progress = tqdm(desc="Indexing documents", unit="file") if show_progress else None
+        try:
+            for event in self._parse_events(file_list, workers=1, batch_size=accumulator.batch_size):
+                file_path = event.file_path
                 
+                if event.error is not None:
+                    # 임베딩 단계에서 이미 실패 처리된 파일은 한 번만 기록
+                    if accumulator.discard(file_path):
+                        fail(file_path, event.error)
+                else:
+                    accumulator.add(file_path, event.chunks, final=event.final)
+                
+                if event.final or event.error is not None:
+                    self._record_parse(file_path, event.wall_seconds, event.cpu_seconds, event.count)
+                    if event.final and event.count == 0:
+                        logger.warning(f"No content extracted from: {file_path}")
+                    if progress is not None:
+                        progress.update(1)
+                
+                accumulator.flush_if_due()
+            
+            accumulator.close()
+        finally:
+            if progress is not None:
+                progress.close()
+    
+    def _parse_events(
+        self,
+        file_list: Iterable[Path],
+        workers: int = 1,
+        batch_size: int = 32
+    ) -> Iterator[ParseEvent]:
+        """
+        파일들을 파싱하며 청크를 batch_size개씩 이벤트로 생성
+        
+        워커가 여럿이거나 파싱 시간/메모리 예산이 설정되어 있으면 감독되는 워커 프로세스에서,
+        아니면 현재 프로세스에서 파싱합니다.
+        
+        Args:
+            file_list: 파싱할 파일 경로
+            workers: 워커 프로세스 수
+            batch_size: 이벤트 하나에 담을 최대 청크 수
+            
+        Yields:
+            ParseEvent
+        """
+        if workers > 1 or self.parse_timeout or self.parse_memory_mb:
+            supervisor = ParseSupervisor(
+                self.parser,
+                workers=workers,
+                timeout=self.parse_timeout,
+                memory_limit_mb=self.parse_memory_mb,
+                batch_size=batch_size
+            )
+            yield from supervisor.run(file_list, content_hash=self._content_hash)
+            return
+        
+        for file_path in file_list:
+            # 파싱 생성기는 임베딩과 번갈아 실행되므로 next() 시간만 파싱 시간으로 측정
+            chunk_iterator = TimedIterator(self.parser.iter_chunks(file_path, self._content_hash(file_path)))
+            buffer = []
+            try:
+                for chunk in chunk_iterator:
+                    buffer.append(chunk)
+                    if len(buffer) >= batch_size:
+                        yield ParseEvent(file_path, chunks=buffer)
+                        buffer = []
             except Exception as e:
-                logger.error(f"Failed to index {file_path}: {e}")
-                stats["errors"] += 1
-                stats["error_files"].append(str(file_path))
+                yield ParseEvent(
+                    file_path,
+                    error=ParseError(f"{type(e).__name__}: {e}"),
+                    count=chunk_iterator.count,
+                    wall_seconds=chunk_iterator.wall_seconds,
+                    cpu_seconds=chunk_iterator.cpu_seconds
+                )
+                continue
+            
+            yield ParseEvent(
+                file_path,
+                chunks=buffer,
+                final=True,
+                count=chunk_iterator.count,
+                wall_seconds=chunk_iterator.wall_seconds,
+                cpu_seconds=chunk_iterator.cpu_seconds
+            )
+    
+    def _open_manifest(self, collection_name: Optional[str] = None):
+        """컬렉션의 매니페스트 열기"""
+        name = collection_name or self.vector_db.collection_name
+        self.manifest = IndexManifest.for_collection(self.vector_db.persist_directory, name)
+        self._signatures = {}
         
-        logger.info(f"Indexing complete: {stats}")
-        return stats
+        # 컬렉션이 비었는데 매니페스트가 남아 있으면 (외부에서 삭제됨) 매니페스트를 신뢰할 수 없음
+        if len(self.manifest) > 0 and self.vector_db.get_collection_count() == 0:
+            logger.warning(f"Collection '{name}' is empty; discarding stale manifest")
+            self.manifest.clear()
+    
+    def _close_manifest(self):
+        """매니페스트 닫기"""
+        if self.manifest is not None:
+            self.manifest.close()
+        self.manifest = None
+        self._signatures = {}
     
-    def _scan_folder(self, folder_path: Path, recursive: bool) -> List[Path]:
-        """폴더에서 지원 문서 찾기"""
-        files = []
+    def _plan_changes(
+        self,
+        folder_path: Path,
+        recursive: bool,
+        file_list: Iterable[Path],
+        stats: dict,
+        incremental: bool,
+        committed: frozenset = frozenset()
+    ) -> Iterator[Path]:
+        """
+        매니페스트와 비교하여 인덱싱할 파일을 하나씩 고르고, 끝까지 돌면 삭제된 파일의 청크를 정리
         
-        if recursive:
-            pattern = "**/*"
-        else:
-            pattern = "*"
+        Args:
+            folder_path: 인덱싱 대상 폴더
+            recursive: 하위 폴더 포함 여부
+            file_list: 스캔된 파일 (생성기여도 됨)
+            stats: 통계 딕셔너리 (total_files, skipped_files, resumed_files, quarantined_files,
+                deleted_files 갱신)
+            incremental: False면 모든 파일을 다시 인덱싱
+            committed: 재개 중인 작업에서 이미 반영된 파일 키 (건너뜀)
+            
+        Yields:
+            인덱싱할 파일 경로
+        """
+        entries = self.manifest.entries()
+        quarantined = self.manifest.quarantined() if self.quarantine else {}
+        seen = set()
         
-        for file_path in folder_path.glob(pattern):
-            if file_path.is_file() and DocumentParser.is_supported(file_path):
-                files.append(file_path)
+        for file_path in file_list:
+            key = self._file_key(file_path)
+            seen.add(key)
+            stats["total_files"] += 1
+            
+            if key in committed:
+                stats["resumed_files"] += 1
+                continue
+            
+            try:
+                signature = file_signature(file_path)
+            except OSError as e:
+                self._record_error(stats, file_path, e)
+                continue
+            
+            # 이전 실행에서 예산을 넘겨 격리된 파일은 바뀌지 않았으면 건너뜀
+            entry = quarantined.get(key)
+            if entry is not None and entry.matches(signature):
+                stats["quarantined_files"] += 1
+                continue
+            
+            if incremental and self._is_unchanged(file_path, signature, entries.get(key)):
+                stats["skipped_files"] += 1
+                continue
+            
+            # 파싱 텍스트 캐시 키로 쓸 내용 해시를 여기서 한 번만 계산 (매니페스트 기록에도 재사용)
+            if self.parser.text_cache is not None and signature.content_hash is None:
+                try:
+                    signature.content_hash = hash_file(file_path)
+                except OSError as e:
+                    self._record_error(stats, file_path, e)
+                    continue
+            
+            self._signatures[key] = signature
+            yield file_path
+        
+        # 이 폴더에서 사라진 파일의 청크 삭제
+        # (포함/제외 패턴으로 이번 스캔에서 빠졌을 뿐 디스크에 남아 있는 파일과
+        #  권한 문제 등으로 읽지 못한 폴더 아래의 파일은 유지)
+        folder_key = Path(self._file_key(folder_path))
+        failed_dirs = self.scanner.failed_dirs
+        removed = []
+        for key, entry in entries.items():
+            if key in seen:
+                continue
+            parent = Path(key).parent
+            if parent != folder_key and not (recursive and folder_key in parent.parents):
+                continue
+            if failed_dirs and any(d == parent or d in parent.parents for d in failed_dirs):
+                continue
+            if not Path(entry.path).exists():
+                removed.append(entry)
         
-        return sorted(files)
+        if removed:
+            self.vector_db.delete_documents(
+                [chunk_id for entry in removed for chunk_id in entry.chunk_ids]
+            )
+            self.manifest.delete(entry.path for entry in removed)
+            stats["deleted_files"] = len(removed)
+            logger.info(f"Removed chunks of {len(removed)} deleted files")
+    
+    def create_accumulator(self, on_chunks_ready, on_file_error) -> ChunkAccumulator:
+        """
+        임베딩 배치 누적기 생성
+        
+        Args:
+            on_chunks_ready: 파일의 청크 일부가 임베딩될 때마다 호출
+                (file_path, start_index, chunks, embeddings, is_last)
+            on_file_error: 임베딩 실패 시 호출 (file_path, error)
+            
+        Returns:
+            ChunkAccumulator
+        """
+        return ChunkAccumulator(
+            self.embedder,
+            on_chunks_ready=on_chunks_ready,
+            on_file_error=on_file_error,
+            max_wait=self.batch_max_wait,
+            profiler=self._profiler
+        )
+    
+    def _record_parse(self, file_path: Path, wall_seconds: float, cpu_seconds: float, chunks: int):
+        """파일 하나의 파싱 시간을 형식별 단계와 느린 파일 목록에 기록"""
+        if self._profiler is None:
+            return
+        signature = self._signatures.get(self._file_key(file_path))
+        size = signature.size if signature is not None else 0
+        self._profiler.record(
+            IndexProfiler.stage_name(file_path), wall_seconds, cpu_seconds, items=chunks, bytes_read=size
+        )
+        self._profiler.record_file(file_path, wall_seconds, chunks, size)
+    
+    def _record_error(self, stats: dict, file_path: Path, error: Exception):
+        """실패한 파일을 사유와 함께 통계에 기록하고, 예산 초과 파일은 격리"""
+        logger.error(f"Failed to index {file_path}: {error}")
+        stats["errors"] += 1
+        stats["error_files"].append({"path": str(file_path), "reason": str(error)})
+        self._quarantine_file(file_path, error)
+    
+    def _fail_flush(self, stats: dict, error: BulkWriteError) -> List[Path]:
+        """
+        플러시에 실패한 쓰기 버퍼에 들어 있던 파일을 모두 실패 처리
+        
+        파일마다 이미 쓴 청크와 이전 청크의 삭제를 예약하고 매니페스트 항목을 없앱니다. 저널의
+        PENDING 기록은 그 삭제가 반영된 뒤에 지우므로, 삭제까지 실패해도 다음 실행에서 되돌린 뒤
+        다시 인덱싱합니다.
+        
+        Args:
+            stats: 실패를 기록할 통계
+            error: 플러시 실패
+            
+        Returns:
+            실패 처리한 파일 (이미 실패 처리된 파일 제외, 남은 조각은 버려야 함)
+        """
+        failed = []
+        for file_path in error.owners:
+            key = self._file_key(file_path)
+            if key not in self._writes and key not in self._completed:
+                continue
+            stats["total_chunks"] -= self._abort_file(file_path)
+            self._record_error(stats, file_path, error)
+            failed.append(file_path)
+        return failed
+    
+    def _close_writer(self, stats: dict):
+        """남은 쓰기 버퍼 반영 (실패하면 버퍼에 있던 파일을 실패 처리하고 정리 삭제를 한 번 더 시도)"""
+        try:
+            self._writer.close()
+            return
+        except BulkWriteError as e:
+            self._fail_flush(stats, e)
+        
+        try:
+            self._writer.close()
+        except BulkWriteError as e:
+            logger.error(f"Could not clean up failed writes; they will be rolled back on the next run: {e}")
+    
+    def _quarantine_file(self, file_path: Path, error: Exception):
+        """시간/메모리 예산을 넘긴 파일을 매니페스트에 격리 (파일이 바뀌기 전까지 건너뜀)"""
+        if not (self.quarantine and getattr(error, "quarantine", False) and self.manifest is not None):
+            return
+        
+        key = self._file_key(file_path)
+        try:
+            signature = self._signatures.get(key) or file_signature(file_path)
+        except OSError:
+            return
+        self.manifest.quarantine(key, signature, str(error))
+        logger.warning(f"Quarantined {file_path}; it will be skipped until it changes")
+    
+    def _scan_folder(self, folder_path: Path, recursive: bool) -> Iterator[Path]:
+        """폴더에서 지원 문서 찾기 (찾는 대로 생성)"""
+        return self.scanner.iter_files(folder_path, recursive)
     
     def _index_file(self, file_path: Path, collection_name: Optional[str] = None) -> int:
         """
@@ -115,25 +601,66 @@ class IndexingService:
         Returns:
             생성된 청크 수
         """
-        # 파일 파싱
-        chunks = self.parser.parse(file_path)
+        errors = []
+        
+        def store(path: Path, start_index: int, chunks, embeddings, is_last: bool):
+            self._store_segment(path, start_index, chunks, embeddings, is_last)
         
-        if not chunks:
+        # 큰 파일도 배치 크기만큼씩 파싱 → 임베딩 → 저장
+        accumulator = self.create_accumulator(
+            on_chunks_ready=store,
+            on_file_error=lambda path, e: errors.append(e)
+        )
+        
+        count = 0
+        try:
+            for event in self._parse_events([file_path], batch_size=accumulator.batch_size):
+                if event.error is not None:
+                    raise event.error
+                accumulator.add(file_path, event.chunks, final=event.final)
+                count = event.count
+            accumulator.close()
+            if errors:
+                raise errors[0]
+            self._writer.close()
+        except Exception:
+            self._abort_file(file_path)
+            self._writer.close()
+            raise
+        
+        if count == 0:
             logger.warning(f"No content extracted from: {file_path}")
             return 0
         
-        # 텍스트 추출
-        texts = [chunk.text for chunk in chunks]
+        logger.debug(f"Indexed {count} chunks from {file_path.name}")
+        return count
+    
+    def _store_segment(
+        self,
+        file_path: Path,
+        start_index: int,
+        chunks: List[DocumentChunk],
+        embeddings: Embeddings,
+        is_last: bool
+    ):
+        """
+        임베딩된 청크 조각을 벡터 DB에 저장 (큰 파일은 여러 조각으로 나눠 호출됨)
         
-        # 임베딩 생성
-        embeddings = self.embedder.embed_documents(texts)
+        첫 조각에서 이전 버전의 청크를 지우고, 마지막 조각에서 매니페스트를 기록합니다.
         
+        Args:
+            file_path: 원본 파일 경로
+            start_index: 조각의 첫 청크가 파일에서 몇 번째 청크인지
+            chunks: 파싱된 청크 리스트
+            embeddings: 청크별 임베딩 벡터 (float32 배열 또는 행 벡터 시퀀스)
+            is_last: 파일의 마지막 조각인지 여부
+        """
         # ID 생성 (파일 경로 + 청크 인덱스의 해시)
         ids = []
         documents = []
         metadatas = []
         
-        for idx, (chunk, embedding) in enumerate(zip(chunks, embeddings)):
+        for idx, (chunk, embedding) in enumerate(zip(chunks, embeddings), start=start_index):
             # 고유 ID 생성
             chunk_id = self._generate_chunk_id(file_path, idx)
             ids.append(chunk_id)
@@ -144,16 +671,89 @@ class IndexingService:
             metadata["indexed_at"] = datetime.now().isoformat()
             metadatas.append(metadata)
         
-        # 벡터 DB에 저장
-        self.vector_db.add_documents(
-            ids=ids,
-            embeddings=embeddings,
-            documents=documents,
-            metadatas=metadatas
+        key = self._file_key(file_path)
+        write = self._writes.get(key)
+        
+        if write is None:
+            # 첫 조각
+            previous = self.manifest.get(key) if self.manifest is not None else None
+            write = self._writes[key] = _FileWrite(previous.chunk_ids if previous is not None else [])
+            
+            # 쓰기 전에 저널에 기록: 중단되면 다음 실행에서 이 ID들을 되돌림
+            if self._journal is not None:
+                self._journal.begin_file(self._job_id, key, ids + write.previous_ids)
+        elif self._journal is not None and ids:
+            self._journal.extend_file(self._job_id, key, start_index, ids)
+        
+        # 쓰기 버퍼에 추가 (같은 ID의 이전 청크는 upsert로 덮어씀)
+        # 버퍼 플러시가 실패해도 되돌릴 수 있도록 ID를 먼저 기록
+        write.written_ids.extend(ids)
+        self._writer.upsert(
+            ids=ids, embeddings=embeddings, documents=documents, metadatas=metadatas, owner=file_path
         )
         
-        logger.debug(f"Indexed {len(chunks)} chunks from {file_path.name}")
-        return len(chunks)
+        if not is_last:
+            write.stored += len(ids)
+            return
+        
+        del self._writes[key]
+        self._completed[key] = write
+        
+        # 파일이 줄어들어 더 이상 쓰이지 않는 이전 청크만 삭제
+        written = set(write.written_ids)
+        self._writer.delete(
+            [chunk_id for chunk_id in write.previous_ids if chunk_id not in written], owner=file_path
+        )
+        
+        signature = None
+        if self.manifest is not None:
+            signature = self._signatures.pop(key, None) or file_signature(file_path)
+            if signature.content_hash is None:
+                signature.content_hash = hash_file(file_path)
+        
+        manifest, journal, job_id = self.manifest, self._journal, self._job_id
+        completed = self._completed
+        
+        def commit():
+            # 버퍼가 실제로 DB에 반영된 뒤에 매니페스트/저널 기록
+            if completed.get(key) is write:
+                del completed[key]
+            if manifest is not None:
+                manifest.record(key, signature, write.written_ids)
+            if journal is not None:
+                journal.commit_file(job_id, key)
+        
+        write.stored += len(ids)
+        self._writer.on_flush(commit, owner=file_path)
+    
+    def _abort_file(self, file_path: Path) -> int:
+        """
+        쓰는 도중 실패한 파일의 이미 저장된 조각과 매니페스트 항목 정리
+        
+        Returns:
+            통계에서 빼야 할 청크 수 (이미 저장을 마친 조각의 청크 수)
+        """
+        key = self._file_key(file_path)
+        write = self._writes.pop(key, None) or self._completed.pop(key, None)
+        if write is None:
+            return 0
+        
+        # 이전 청크 일부가 이미 덮어써졌으므로 이전 버전도 함께 지우고 매니페스트 항목을 없앰
+        self._writer.delete(list(dict.fromkeys(write.written_ids + write.previous_ids)), owner=file_path)
+        if self.manifest is not None:
+            self.manifest.delete([key])
+        
+        journal, job_id = self._journal, self._job_id
+        if journal is not None:
+            self._writer.on_flush(
+                lambda: journal.discard_pending([PendingWrite(job_id, key, [])]), owner=file_path
+            )
+        return write.stored
+    
+    def _content_hash(self, file_path: Path) -> Optional[str]:
+        """변경 감지에서 계산해 둔 파일 내용 해시 (없으면 None)"""
+        signature = self._signatures.get(self._file_key(file_path))
+        return signature.content_hash if signature is not None else None
     
     def _generate_chunk_id(self, file_path: Path, chunk_index: int) -> str:
         """청크 고유 ID 생성"""
@@ -161,13 +761,24 @@ class IndexingService:
         content = f"{file_path.absolute()}:{chunk_index}"
         return hashlib.md5(content.encode()).hexdigest()
     
-    def index_file(self, file_path: Path, collection_name: Optional[str] = None) -> int:
+    @staticmethod
+    def _file_key(file_path: Path) -> str:
+        """매니페스트에서 사용하는 파일 키 (절대 경로)"""
+        return str(file_path.absolute())
+    
+    def index_file(
+        self,
+        file_path: Path,
+        collection_name: Optional[str] = None,
+        incremental: bool = False
+    ) -> int:
         """
         단일 파일 인덱싱 (공개 메서드)
         
         Args:
             file_path: 파일 경로
             collection_name: 컬렉션 이름
+            incremental: True면 매니페스트 기준으로 바뀌지 않은 파일은 건너뜀
             
         Returns:
             생성된 청크 수
@@ -183,5 +794,59 @@ class IndexingService:
         # 컬렉션 생성/가져오기
         self.vector_db.get_or_create_collection(collection_name)
         
-        return self._index_file(file_path, collection_name)
-
+        self._open_manifest(collection_name)
+        try:
+            key = self._file_key(file_path)
+            signature = file_signature(file_path)
+            if incremental and self._is_unchanged(file_path, signature, self.manifest.get(key)):
+                logger.debug(f"Unchanged, skipped: {file_path}")
+                return 0
+            
+            entry = self.manifest.quarantined().get(key) if self.quarantine else None
+            if entry is not None and entry.matches(signature):
+                logger.info(f"Quarantined ({entry.reason}), skipped: {file_path}")
+                return 0
+            
+            self._signatures[key] = signature
+            self._writer = self.vector_db.bulk_writer(self.write_batch_size)
+            try:
+                return self._index_file(file_path, collection_name)
+            except ParseError as e:
+                self._quarantine_file(file_path, e)
+                raise
+        finally:
+            self._writer = None
+            self._writes, self._completed = {}, {}
+            self._close_manifest()
+    
+    def remove_path(self, path: Path, collection_name: Optional[str] = None) -> int:
+        """
+        파일 또는 폴더(하위 파일 전체)의 청크를 컬렉션에서 삭제
+        
+        Args:
+            path: 삭제된 파일 또는 폴더 경로
+            collection_name: 컬렉션 이름
+            
+        Returns:
+            청크가 삭제된 파일 수
+        """
+        self.vector_db.get_or_create_collection(collection_name)
+        
+        self._open_manifest(collection_name)
+        try:
+            key = Path(self._file_key(path))
+            removed = [
+                entry for entry_key, entry in self.manifest.entries().items()
+                if Path(entry_key) == key or key in Path(entry_key).parents
+            ]
+            
+            if removed:
+                self.vector_db.delete_documents(
+                    [chunk_id for entry in removed for chunk_id in entry.chunk_ids]
+                )
+                self.manifest.delete(entry.path for entry in removed)
+                logger.info(f"Removed chunks of {len(removed)} files under {path}")
+            
+            return len(removed)
+        finally:
+            self._close_manifest()
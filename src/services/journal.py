@@ -0,0 +1,254 @@
+"""인덱싱 작업 저널 - 중단된 인덱싱을 중복 없이 이어서 진행하기 위한 선행 기록(write-ahead) 로그"""
+from pathlib import Path
+from typing import Dict, List, Optional
+from dataclasses import dataclass
+from datetime import datetime
+import json
+import logging
+import sqlite3
+import threading
+
+from .manifest import MANIFEST_DIR
+
+logger = logging.getLogger(__name__)
+
+# 작업 상태
+RUNNING = "running"
+COMPLETED = "completed"
+ABANDONED = "abandoned"
+
+# 파일 상태
+PENDING = "pending"        # 벡터 DB 쓰기 직전에 기록 (쓰기가 끝났는지 알 수 없음)
+COMMITTED = "committed"    # 벡터 DB와 매니페스트에 모두 반영됨
+
+
+@dataclass
+class IndexJob:
+    """인덱싱 작업 하나의 정보"""
+    job_id: int
+    folder: str
+    options: Dict
+    status: str
+    started_at: str
+
+
+@dataclass
+class PendingWrite:
+    """쓰기 도중 중단되었을 수 있는 파일"""
+    job_id: int
+    path: str
+    chunk_ids: List[str]
+
+
+class IndexJournal:
+    """
+    컬렉션별 인덱싱 작업 저널 (SQLite)
+
+    파일의 청크를 벡터 DB에 쓰기 전에 청크 ID를 PENDING으로 기록하고, 쓰기와 매니페스트 갱신이
+    끝나면 COMMITTED로 바꿉니다. 큰 파일은 조각마다 청크 ID를 한 행씩 추가하므로 기록 비용이
+    조각 크기에만 비례합니다. 프로세스가 중간에 죽으면 다음 실행에서 PENDING 파일의 청크를
+    되돌리고, --resume 시에는 COMMITTED 파일을 건너뛰어 이어서 진행합니다.
+    """
+
+    def __init__(self, db_path: Path):
+        """
+        Args:
+            db_path: 저널 SQLite 파일 경로
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._lock = threading.Lock()
+        self._initialize()
+
+    @classmethod
+    def for_collection(cls, persist_directory: Path, collection_name: str) -> "IndexJournal":
+        """컬렉션의 저널 열기"""
+        return cls(cls.path_for(persist_directory, collection_name))
+
+    @staticmethod
+    def path_for(persist_directory: Path, collection_name: str) -> Path:
+        """컬렉션의 저널 파일 경로"""
+        return Path(persist_directory) / MANIFEST_DIR / f"{collection_name}.journal"
+
+    def _initialize(self):
+        """테이블 생성"""
+        with self._lock:
+            # WAL + NORMAL: 프로세스 강제 종료(Ctrl-C, OOM)에도 커밋된 기록은 유지됨
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS jobs (
+                    job_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    folder TEXT NOT NULL,
+                    options TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    started_at TEXT NOT NULL,
+                    finished_at TEXT
+                )
+                """
+            )
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS files (
+                    job_id INTEGER NOT NULL,
+                    path TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    chunk_ids TEXT NOT NULL,
+                    PRIMARY KEY (job_id, path)
+                )
+                """
+            )
+            # 조각별 청크 ID (files.chunk_ids는 이전 버전 저널 호환용으로만 읽음)
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS segments (
+                    job_id INTEGER NOT NULL,
+                    path TEXT NOT NULL,
+                    start_index INTEGER NOT NULL,
+                    chunk_ids TEXT NOT NULL,
+                    PRIMARY KEY (job_id, path, start_index)
+                )
+                """
+            )
+            self._conn.commit()
+
+    def start_job(self, folder: str, options: Dict) -> int:
+        """
+        새 작업 시작 (같은 폴더의 이전 미완료 작업은 버림)
+
+        Args:
+            folder: 인덱싱 폴더 (절대 경로)
+            options: 재개 시 그대로 사용할 인덱싱 옵션
+
+        Returns:
+            작업 ID
+        """
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, finished_at = ? WHERE folder = ? AND status = ?",
+                (ABANDONED, datetime.now().isoformat(), folder, RUNNING)
+            )
+            self._conn.execute(
+                "DELETE FROM files WHERE status = ? AND job_id IN "
+                "(SELECT job_id FROM jobs WHERE status = ?)",
+                (COMMITTED, ABANDONED)
+            )
+            cursor = self._conn.execute(
+                "INSERT INTO jobs (folder, options, status, started_at) VALUES (?, ?, ?, ?)",
+                (folder, json.dumps(options), RUNNING, datetime.now().isoformat())
+            )
+            self._conn.commit()
+            return cursor.lastrowid
+
+    def last_incomplete_job(self, folder: str) -> Optional[IndexJob]:
+        """폴더의 가장 최근 미완료 작업"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT job_id, folder, options, status, started_at FROM jobs "
+                "WHERE folder = ? AND status = ? ORDER BY job_id DESC LIMIT 1",
+                (folder, RUNNING)
+            ).fetchone()
+        if row is None:
+            return None
+        return IndexJob(row[0], row[1], json.loads(row[2]), row[3], row[4])
+
+    def committed_paths(self, job_id: int) -> set:
+        """작업에서 반영이 끝난 파일 경로 집합"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT path FROM files WHERE job_id = ? AND status = ?", (job_id, COMMITTED)
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    def pending_writes(self) -> List[PendingWrite]:
+        """쓰기 도중 중단되었을 수 있는 모든 파일"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT job_id, path, chunk_ids FROM files WHERE status = ?", (PENDING,)
+            ).fetchall()
+            segments = self._conn.execute(
+                "SELECT s.job_id, s.path, s.chunk_ids FROM segments s JOIN files f "
+                "ON f.job_id = s.job_id AND f.path = s.path WHERE f.status = ? "
+                "ORDER BY s.job_id, s.path, s.start_index",
+                (PENDING,)
+            ).fetchall()
+
+        writes = {(row[0], row[1]): PendingWrite(row[0], row[1], json.loads(row[2])) for row in rows}
+        for job_id, path, chunk_ids in segments:
+            writes[(job_id, path)].chunk_ids.extend(json.loads(chunk_ids))
+        return [*writes.values()]
+
+    def begin_file(self, job_id: int, path: str, chunk_ids: List[str]):
+        """벡터 DB에 쓰기 직전 기록 (첫 조각의 청크 ID와 지워질 이전 청크 ID)"""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO files VALUES (?, ?, ?, '[]')", (job_id, path, PENDING)
+            )
+            self._conn.execute("DELETE FROM segments WHERE job_id = ? AND path = ?", (job_id, path))
+            self._conn.execute(
+                "INSERT INTO segments VALUES (?, ?, 0, ?)", (job_id, path, json.dumps(chunk_ids))
+            )
+            self._conn.commit()
+
+    def extend_file(self, job_id: int, path: str, start_index: int, chunk_ids: List[str]):
+        """
+        큰 파일을 나눠 쓸 때 다음 조각의 청크 ID를 쓰기 직전에 추가 기록
+
+        Args:
+            job_id: 작업 ID
+            path: 파일 키
+            start_index: 조각의 첫 청크가 파일에서 몇 번째 청크인지
+            chunk_ids: 조각의 청크 ID
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO segments VALUES (?, ?, ?, ?)",
+                (job_id, path, start_index, json.dumps(chunk_ids))
+            )
+            self._conn.commit()
+
+    def commit_file(self, job_id: int, path: str):
+        """벡터 DB와 매니페스트 반영 완료 기록"""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE files SET status = ?, chunk_ids = '[]' WHERE job_id = ? AND path = ?",
+                (COMMITTED, job_id, path)
+            )
+            self._conn.execute("DELETE FROM segments WHERE job_id = ? AND path = ?", (job_id, path))
+            self._conn.commit()
+
+    def discard_pending(self, writes: List[PendingWrite]):
+        """되돌린 PENDING 기록 삭제"""
+        with self._lock:
+            self._conn.executemany(
+                "DELETE FROM segments WHERE job_id = ? AND path = ? AND path IN "
+                "(SELECT path FROM files WHERE job_id = ? AND status = ?)",
+                [(w.job_id, w.path, w.job_id, PENDING) for w in writes]
+            )
+            self._conn.executemany(
+                "DELETE FROM files WHERE job_id = ? AND path = ? AND status = ?",
+                [(w.job_id, w.path, PENDING) for w in writes]
+            )
+            self._conn.commit()
+
+    def finish_job(self, job_id: int):
+        """작업 완료 (파일별 기록은 더 필요 없으므로 삭제)"""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, finished_at = ? WHERE job_id = ?",
+                (COMPLETED, datetime.now().isoformat(), job_id)
+            )
+            self._conn.execute("DELETE FROM files WHERE job_id = ?", (job_id,))
+            self._conn.execute("DELETE FROM segments WHERE job_id = ?", (job_id,))
+            self._conn.commit()
+
+    def close(self):
+        """연결 닫기"""
+        with self._lock:
+            self._conn.close()
+
+    def __repr__(self) -> str:
+        return f"IndexJournal(path={self.db_path})"
@@ -4,6 +4,7 @@ from pathlib import Path
 import logging
 
 from ..core import VectorSearch
+from .manifest import IndexManifest
 
 logger = logging.getLogger(__name__)
 
@@ -88,6 +89,7 @@ class ManagementService:
         """
         try:
             self.vector_db.delete_collection(collection_name)
+            IndexManifest.remove(self.vector_db.persist_directory, collection_name)
             logger.info(f"Deleted collection: {collection_name}")
             return True
             
@@ -111,6 +113,7 @@ class ManagementService:
         
         try:
             self.vector_db.reset()
+            IndexManifest.remove(self.vector_db.persist_directory)
             logger.warning("All data has been cleaned!")
             return True
             
@@ -0,0 +1,280 @@
+"""인덱스 매니페스트 - 컬렉션별로 인덱싱된 파일 상태를 기록하여 증분 인덱싱 지원"""
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+from dataclasses import dataclass
+from datetime import datetime
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_DIR = "manifests"
+
+# 컬렉션별 상태 파일 확장자 (매니페스트, 작업 저널)
+STATE_SUFFIXES = (".sqlite3", ".journal")
+
+
+@dataclass
+class FileSignature:
+    """파일 변경 감지용 정보"""
+    size: int
+    mtime_ns: int
+    content_hash: Optional[str] = None
+
+
+@dataclass
+class ManifestEntry:
+    """매니페스트에 기록된 파일 하나의 상태"""
+    path: str
+    size: int
+    mtime_ns: int
+    content_hash: str
+    chunk_ids: List[str]
+    indexed_at: str
+
+
+@dataclass
+class QuarantineEntry:
+    """격리된 파일 하나의 정보"""
+    path: str
+    size: int
+    mtime_ns: int
+    reason: str
+    added_at: str
+
+    def matches(self, signature: FileSignature) -> bool:
+        """격리 이후 파일이 바뀌지 않았는지 확인"""
+        return self.size == signature.size and self.mtime_ns == signature.mtime_ns
+
+
+def file_signature(file_path: Path) -> FileSignature:
+    """파일 크기/수정 시각 조회 (내용 해시는 계산하지 않음)"""
+    stat = file_path.stat()
+    return FileSignature(size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+
+
+def hash_file(file_path: Path, block_size: int = 1 << 20) -> str:
+    """파일 내용 해시 계산"""
+    digest = hashlib.md5()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class IndexManifest:
+    """
+    컬렉션별 파일 매니페스트 (SQLite)
+
+    경로, 크기, 수정 시각, 내용 해시, 청크 ID를 기록하여
+    재인덱싱 시 변경되지 않은 파일은 건너뛰고, 변경/삭제된 파일의 이전 청크를 정리합니다.
+    """
+
+    def __init__(self, db_path: Path):
+        """
+        Args:
+            db_path: 매니페스트 SQLite 파일 경로
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # 파이프라인 모드에서는 저장 스레드가 기록하므로 스레드 간 공유 허용
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._lock = threading.Lock()
+        self._initialize()
+
+    @classmethod
+    def for_collection(cls, persist_directory: Path, collection_name: str) -> "IndexManifest":
+        """컬렉션의 매니페스트 열기"""
+        return cls(cls.path_for(persist_directory, collection_name))
+
+    @staticmethod
+    def path_for(persist_directory: Path, collection_name: str) -> Path:
+        """컬렉션의 매니페스트 파일 경로"""
+        return Path(persist_directory) / MANIFEST_DIR / f"{collection_name}.sqlite3"
+
+    @classmethod
+    def remove(cls, persist_directory: Path, collection_name: Optional[str] = None):
+        """
+        매니페스트와 작업 저널 삭제
+
+        Args:
+            persist_directory: 벡터 DB 저장 디렉토리
+            collection_name: 컬렉션 이름 (None이면 모든 매니페스트 삭제)
+        """
+        state_dir = Path(persist_directory) / MANIFEST_DIR
+        if collection_name:
+            paths = [state_dir / f"{collection_name}{suffix}" for suffix in STATE_SUFFIXES]
+        else:
+            paths = [path for suffix in STATE_SUFFIXES for path in state_dir.glob(f"*{suffix}")]
+
+        for path in paths:
+            for suffix in ("", "-wal", "-shm"):
+                target = path.with_name(path.name + suffix)
+                if target.exists():
+                    target.unlink()
+                    logger.debug(f"Removed manifest file: {target}")
+
+    def _initialize(self):
+        """테이블 생성"""
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS files (
+                    path TEXT PRIMARY KEY,
+                    size INTEGER NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    content_hash TEXT NOT NULL,
+                    chunk_ids TEXT NOT NULL,
+                    indexed_at TEXT NOT NULL
+                )
+                """
+            )
+            # 파싱 예산을 넘겨 격리된 파일 (파일이 바뀌기 전까지 건너뜀)
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS quarantine (
+                    path TEXT PRIMARY KEY,
+                    size INTEGER NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    reason TEXT NOT NULL,
+                    added_at TEXT NOT NULL
+                )
+                """
+            )
+            self._conn.commit()
+
+    def get(self, path: str) -> Optional[ManifestEntry]:
+        """파일 항목 조회"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT path, size, mtime_ns, content_hash, chunk_ids, indexed_at FROM files WHERE path = ?",
+                (path,)
+            ).fetchone()
+        return self._to_entry(row) if row else None
+
+    def entries(self) -> Dict[str, ManifestEntry]:
+        """모든 항목을 경로 기준 딕셔너리로 반환"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT path, size, mtime_ns, content_hash, chunk_ids, indexed_at FROM files"
+            ).fetchall()
+        return {row[0]: self._to_entry(row) for row in rows}
+
+    def record(self, path: str, signature: FileSignature, chunk_ids: List[str]):
+        """
+        파일 인덱싱 결과 기록
+
+        Args:
+            path: 파일 경로 (절대 경로 문자열)
+            signature: 인덱싱 시점의 파일 정보 (content_hash 포함)
+            chunk_ids: 벡터 DB에 저장된 청크 ID 리스트
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    path,
+                    signature.size,
+                    signature.mtime_ns,
+                    signature.content_hash or "",
+                    json.dumps(chunk_ids),
+                    datetime.now().isoformat()
+                )
+            )
+            # 정상적으로 인덱싱되었으면 격리 해제
+            self._conn.execute("DELETE FROM quarantine WHERE path = ?", (path,))
+            self._conn.commit()
+
+    def quarantine(self, path: str, signature: FileSignature, reason: str):
+        """
+        파일 격리 (같은 크기/수정 시각인 동안 다음 실행에서 건너뜀)
+
+        Args:
+            path: 파일 경로 (절대 경로 문자열)
+            signature: 격리 시점의 파일 정보
+            reason: 격리 사유
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO quarantine VALUES (?, ?, ?, ?, ?)",
+                (path, signature.size, signature.mtime_ns, reason, datetime.now().isoformat())
+            )
+            self._conn.commit()
+
+    def quarantined(self) -> Dict[str, QuarantineEntry]:
+        """격리된 파일을 경로 기준 딕셔너리로 반환"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT path, size, mtime_ns, reason, added_at FROM quarantine"
+            ).fetchall()
+        return {row[0]: QuarantineEntry(*row) for row in rows}
+
+    def release(self, paths: Optional[Iterable[str]] = None) -> int:
+        """
+        격리 해제
+
+        Args:
+            paths: 해제할 파일 경로 (None이면 전체)
+
+        Returns:
+            해제된 파일 수
+        """
+        with self._lock:
+            if paths is None:
+                cursor = self._conn.execute("DELETE FROM quarantine")
+            else:
+                cursor = self._conn.executemany(
+                    "DELETE FROM quarantine WHERE path = ?", [(p,) for p in paths]
+                )
+            self._conn.commit()
+            return cursor.rowcount
+
+    def touch(self, path: str, signature: FileSignature):
+        """내용은 같고 수정 시각만 바뀐 파일의 정보 갱신"""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE files SET size = ?, mtime_ns = ? WHERE path = ?",
+                (signature.size, signature.mtime_ns, path)
+            )
+            self._conn.commit()
+
+    def delete(self, paths: Iterable[str]):
+        """파일 항목 삭제"""
+        with self._lock:
+            self._conn.executemany("DELETE FROM files WHERE path = ?", [(p,) for p in paths])
+            self._conn.commit()
+
+    def clear(self):
+        """모든 항목 삭제"""
+        with self._lock:
+            self._conn.execute("DELETE FROM files")
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+
+    def close(self):
+        """연결 닫기"""
+        with self._lock:
+            self._conn.close()
+
+    @staticmethod
+    def _to_entry(row) -> ManifestEntry:
+        return ManifestEntry(
+            path=row[0],
+            size=row[1],
+            mtime_ns=row[2],
+            content_hash=row[3],
+            chunk_ids=json.loads(row[4]),
+            indexed_at=row[5]
+        )
+
+    def __repr__(self) -> str:
+        return f"IndexManifest(path={self.db_path})"
@@ -0,0 +1,168 @@
+"""파이프라인 인덱싱 - 파싱(감독되는 워커 프로세스), 임베딩, DB 저장 단계를 겹쳐서 실행"""
+from pathlib import Path
+from typing import Iterable
+import logging
+import queue
+import threading
+
+from ..core.vector_search import BulkWriteError
+
+logger = logging.getLogger(__name__)
+
+# 단계 종료 신호
+_SENTINEL = None
+
+
+class IndexingPipeline:
+    """
+    파싱 → 임베딩 → 저장 3단계 파이프라인
+
+    파싱은 ParseSupervisor가 관리하는 워커 프로세스에서 병렬로 실행되고, 청크는 배치 크기
+    묶음으로 크기가 제한된 큐를 통해 단일 임베딩 스레드와 단일 ChromaDB 저장 스레드로 전달됩니다.
+    """
+
+    def __init__(self, service, workers: int = 2, queue_size: int = 16):
+        """
+        Args:
+            service: IndexingService 인스턴스 (임베딩/저장 로직 재사용)
+            workers: 파싱 워커 프로세스 수
+            queue_size: 단계 간 큐의 최대 항목 수 (청크 묶음, 메모리 상한)
+        """
+        self.service = service
+        self.workers = max(1, workers)
+        self.queue_size = max(1, queue_size)
+
+        self._embed_queue: "queue.Queue" = queue.Queue(maxsize=self.queue_size)
+        self._write_queue: "queue.Queue" = queue.Queue(maxsize=self.queue_size)
+        self._lock = threading.Lock()
+
+    def run(self, file_list: Iterable[Path], stats: dict, progress=None) -> dict:
+        """
+        파일 목록을 파이프라인으로 인덱싱
+
+        Args:
+            file_list: 인덱싱할 파일 경로 (스캔 중인 생성기여도 됨)
+            stats: 결과를 누적할 통계 딕셔너리
+            progress: 파일 단위로 갱신할 tqdm 진행률 (선택)
+
+        Returns:
+            통계 딕셔너리
+        """
+        # 누적기를 먼저 만들어 파싱 이벤트 크기를 순차 모드와 같은 임베딩 배치 크기로 맞춤
+        accumulator = self.service.create_accumulator(
+            on_chunks_ready=lambda file_path, start_index, chunks, embeddings, is_last: (
+                self._write_queue.put((file_path, start_index, chunks, embeddings, is_last, None))
+            ),
+            on_file_error=lambda file_path, e: self._write_queue.put(
+                (file_path, 0, None, None, True, e)
+            )
+        )
+        embed_thread = threading.Thread(
+            target=self._embed_stage, args=(accumulator,), name="memorag-embed", daemon=True
+        )
+        write_thread = threading.Thread(
+            target=self._write_stage, args=(stats, progress), name="memorag-write", daemon=True
+        )
+        embed_thread.start()
+        write_thread.start()
+
+        try:
+            self._parse_stage(file_list, stats, progress, accumulator.batch_size)
+        finally:
+            # 남은 작업을 모두 흘려보낸 뒤 종료
+            self._embed_queue.put(_SENTINEL)
+            embed_thread.join()
+            write_thread.join()
+
+        return stats
+
+    def _parse_stage(self, file_list: Iterable[Path], stats: dict, progress, batch_size: int):
+        """워커 프로세스의 파싱 이벤트를 임베딩 큐로 전달 (이벤트 하나에 최대 batch_size개 청크)"""
+        events = self.service._parse_events(file_list, workers=self.workers, batch_size=batch_size)
+        for event in events:
+            file_path = event.file_path
+
+            if event.final or event.error is not None:
+                self.service._record_parse(file_path, event.wall_seconds, event.cpu_seconds, event.count)
+
+            # 빈 파일도 저장 단계로 넘겨 이전 버전의 청크를 지우고 매니페스트에 기록
+            if event.final and event.count == 0:
+                logger.warning(f"No content extracted from: {file_path}")
+
+            # 큐가 가득 차면 블록되어 파싱 쪽에 배압(backpressure)이 걸림
+            # (감독기의 시간 예산은 이 대기 시간을 세지 않음)
+            self._embed_queue.put((file_path, event.chunks, event.final, event.error))
+
+    def _embed_stage(self, accumulator):
+        """임베딩 스레드: 여러 파일의 청크를 배치로 모아 임베딩한 뒤 파일 단위로 저장 큐에 전달"""
+        while True:
+            try:
+                item = self._embed_queue.get(timeout=accumulator.time_until_due())
+            except queue.Empty:
+                # 새 파일이 오지 않는 동안 덜 찬 배치가 너무 오래 머물지 않게 함
+                accumulator.flush_if_due()
+                continue
+
+            if item is _SENTINEL:
+                accumulator.close()
+                self._write_queue.put(_SENTINEL)
+                return
+
+            file_path, chunks, final, error = item
+            if error is not None:
+                # 임베딩 실패로 이미 저장 큐에 오류를 보낸 파일은 한 번만 기록
+                if accumulator.discard(file_path):
+                    self._write_queue.put((file_path, 0, None, None, True, error))
+            else:
+                accumulator.add(file_path, chunks, final=final)
+            accumulator.flush_if_due()
+
+    def _write_stage(self, stats: dict, progress):
+        """저장 스레드: 임베딩된 청크 조각을 ChromaDB에 기록"""
+        failed = set()
+        while True:
+            item = self._write_queue.get()
+            if item is _SENTINEL:
+                return
+
+            file_path, start_index, chunks, embeddings, is_last, error = item
+            if file_path in failed:
+                # 앞 조각에서 이미 실패한 파일의 나머지 조각
+                continue
+
+            if error is None:
+                try:
+                    self.service._store_segment(file_path, start_index, chunks, embeddings, is_last)
+                except BulkWriteError as e:
+                    # 실패한 트랜잭션에 청크가 들어 있던 모든 파일을 실패 처리하고 남은 조각은 버림
+                    in_progress = set(self.service._writes)
+                    with self._lock:
+                        aborted = self.service._fail_flush(stats, e)
+                    failed.update(aborted)
+                    # 마지막 조각까지 저장한 파일은 이미 진행률에 반영됨
+                    if progress is not None:
+                        progress.update(sum(self.service._file_key(path) in in_progress for path in aborted))
+                    continue
+                except Exception as e:
+                    error = e
+
+            if error is not None:
+                if not is_last:
+                    failed.add(file_path)
+                removed = self.service._abort_file(file_path)
+                with self._lock:
+                    stats["total_chunks"] -= removed
+                self._record_error(stats, file_path, error, progress)
+                continue
+
+            with self._lock:
+                stats["total_chunks"] += len(chunks)
+            if is_last and progress is not None:
+                progress.update(1)
+
+    def _record_error(self, stats: dict, file_path: Path, error: Exception, progress):
+        """실패한 파일을 통계에 기록 (예산 초과 파일은 격리)"""
+        with self._lock:
+            self.service._record_error(stats, file_path, error)
+        if progress is not None:
+            progress.update(1)
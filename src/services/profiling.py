@@ -0,0 +1,189 @@
+"""인덱싱 프로파일러 - 단계별 소요 시간과 처리량 집계"""
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List
+from contextlib import contextmanager
+from dataclasses import dataclass
+import heapq
+import os
+import threading
+import time
+
+# 보고서에 표시할 단계 순서 (파이프라인 순서, 그 외 단계는 뒤에 이름순)
+STAGE_ORDER = ["scan", "parse", "embed", "write"]
+
+
+@dataclass
+class StageTiming:
+    """단계 하나의 누적 측정값"""
+    calls: int = 0
+    wall_seconds: float = 0.0
+    cpu_seconds: float = 0.0
+    items: int = 0
+    bytes_read: int = 0
+
+    def to_dict(self) -> Dict:
+        return {
+            "calls": self.calls,
+            "wall_seconds": round(self.wall_seconds, 4),
+            "cpu_seconds": round(self.cpu_seconds, 4),
+            "items": self.items,
+            "bytes_read": self.bytes_read,
+            "items_per_sec": round(self.items / self.wall_seconds, 2) if self.wall_seconds > 0 else None
+        }
+
+
+class TimedIterator:
+    """next() 호출에 걸린 시간만 누적하는 반복자 (생성기가 다른 단계와 번갈아 실행될 때 사용)"""
+
+    def __init__(self, iterable: Iterable):
+        self._iterator = iter(iterable)
+        self.wall_seconds = 0.0
+        self.cpu_seconds = 0.0
+        self.count = 0
+
+    def __iter__(self) -> Iterator:
+        return self
+
+    def __next__(self):
+        wall, cpu = time.perf_counter(), time.thread_time()
+        try:
+            item = next(self._iterator)
+        finally:
+            self.wall_seconds += time.perf_counter() - wall
+            self.cpu_seconds += time.thread_time() - cpu
+        self.count += 1
+        return item
+
+
+class IndexProfiler:
+    """
+    인덱싱 단계별 시간/처리량 집계기
+
+    단계 이름(scan, parse.pdf, embed, write 등)별로 벽시계 시간, CPU 시간, 처리 항목 수,
+    읽은 바이트 수를 누적하고, 파싱이 가장 오래 걸린 파일 N개를 기록합니다.
+    CPU 시간은 측정한 스레드(파싱 워커는 해당 프로세스)의 시간이므로, 모델이 내부적으로
+    여러 스레드를 쓰는 임베딩 단계는 실제보다 작게 나올 수 있습니다. 전체 CPU 시간은
+    자식 프로세스를 포함한 프로세스 전체 기준입니다.
+    파이프라인 모드에서는 여러 스레드가 동시에 기록하므로 잠금으로 보호합니다.
+    """
+
+    def __init__(self, slowest: int = 10):
+        """
+        Args:
+            slowest: 기록할 느린 파일 수
+        """
+        self.slowest = slowest
+        self.stages: Dict[str, StageTiming] = {}
+        self._slow_files: List[tuple] = []
+        self._lock = threading.Lock()
+        self._started = time.perf_counter()
+        self._cpu_started = self._process_cpu()
+
+    @contextmanager
+    def stage(self, name: str, items: int = 0, bytes_read: int = 0):
+        """
+        with 블록의 소요 시간을 단계에 기록
+
+        Args:
+            name: 단계 이름
+            items: 처리한 항목 수
+            bytes_read: 읽은 바이트 수
+        """
+        wall, cpu = time.perf_counter(), time.thread_time()
+        try:
+            yield
+        finally:
+            self.record(
+                name,
+                time.perf_counter() - wall,
+                time.thread_time() - cpu,
+                items=items,
+                bytes_read=bytes_read
+            )
+
+    def record(self, name: str, wall_seconds: float, cpu_seconds: float,
+               items: int = 0, bytes_read: int = 0, calls: int = 1):
+        """측정값을 단계에 누적"""
+        with self._lock:
+            timing = self.stages.setdefault(name, StageTiming())
+            timing.calls += calls
+            timing.wall_seconds += wall_seconds
+            timing.cpu_seconds += cpu_seconds
+            timing.items += items
+            timing.bytes_read += bytes_read
+
+    def record_file(self, file_path: Path, seconds: float, chunks: int, size: int):
+        """
+        파일 하나의 파싱 시간을 느린 파일 목록 후보로 기록
+
+        Args:
+            file_path: 파일 경로
+            seconds: 파싱 소요 시간 (초)
+            chunks: 생성된 청크 수
+            size: 파일 크기 (바이트)
+        """
+        if self.slowest <= 0:
+            return
+        item = (seconds, str(file_path), chunks, size)
+        with self._lock:
+            if len(self._slow_files) < self.slowest:
+                heapq.heappush(self._slow_files, item)
+            elif item > self._slow_files[0]:
+                heapq.heapreplace(self._slow_files, item)
+
+    def report(self, total_chunks: int = 0) -> Dict:
+        """
+        집계 결과
+
+        Args:
+            total_chunks: 이번 실행에서 저장한 청크 수 (전체 처리량 계산용)
+
+        Returns:
+            전체/단계별 시간, 처리량, 느린 파일 목록 딕셔너리
+        """
+        wall = time.perf_counter() - self._started
+        with self._lock:
+            stages = {
+                name: self.stages[name].to_dict() for name in sorted(self.stages, key=self._stage_key)
+            }
+            bytes_read = sum(
+                timing.bytes_read for name, timing in self.stages.items() if name.startswith("parse.")
+            )
+            slowest = sorted(self._slow_files, reverse=True)
+
+        return {
+            "wall_seconds": round(wall, 4),
+            "cpu_seconds": round(self._process_cpu() - self._cpu_started, 4),
+            "bytes_read": bytes_read,
+            "chunks_per_sec": round(total_chunks / wall, 2) if wall > 0 else None,
+            "stages": stages,
+            "slowest_files": [
+                {
+                    "path": path,
+                    "file_type": Path(path).suffix.lower().lstrip("."),
+                    "seconds": round(seconds, 4),
+                    "chunks": chunks,
+                    "bytes": size
+                }
+                for seconds, path, chunks, size in slowest
+            ]
+        }
+
+    @staticmethod
+    def _process_cpu() -> float:
+        """이 프로세스와 종료된 자식 프로세스(파싱 워커)의 CPU 시간"""
+        times = os.times()
+        return times.user + times.system + times.children_user + times.children_system
+
+    @staticmethod
+    def _stage_key(name: str) -> tuple:
+        base = name.split(".", 1)[0]
+        return (STAGE_ORDER.index(base) if base in STAGE_ORDER else len(STAGE_ORDER), name)
+
+    @staticmethod
+    def stage_name(file_path: Path) -> str:
+        """파일 형식별 파싱 단계 이름 (parse.pdf 등)"""
+        return f"parse.{Path(file_path).suffix.lower().lstrip('.') or 'unknown'}"
+
+    def __repr__(self) -> str:
+        return f"IndexProfiler(stages={list(self.stages)})"
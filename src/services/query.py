@@ -1,8 +1,10 @@
 """쿼리 서비스 - 자연어 질의 처리"""
-from typing import List, Dict, Optional
+from typing import TYPE_CHECKING, List, Dict, Optional
 import logging
 
-from ..core import EmbeddingEngine, VectorSearch
+if TYPE_CHECKING:
+    # 데몬 클라이언트가 QueryResult만 쓸 때 모델/DB 모듈을 import하지 않도록 타입 검사용으로만 import
+    from ..core import EmbeddingEngine, VectorSearch
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +24,15 @@ class QueryResult:
         self.score = score
         self.snippet = snippet
     
+    def to_dict(self) -> Dict:
+        """JSON으로 보낼 수 있는 딕셔너리로 변환"""
+        return {"text": self.text, "metadata": self.metadata, "score": self.score, "snippet": self.snippet}
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> "QueryResult":
+        """to_dict()로 만든 딕셔너리에서 복원"""
+        return cls(text=data["text"], metadata=data["metadata"], score=data["score"], snippet=data.get("snippet"))
+    
     def __repr__(self) -> str:
         return f"QueryResult(score={self.score:.3f}, file={self.metadata.get('file_name', 'unknown')})"
 
@@ -31,8 +42,8 @@ class QueryService:
     
     def __init__(
         self,
-        embedder: EmbeddingEngine,
-        vector_db: VectorSearch,
+        embedder: "EmbeddingEngine",
+        vector_db: "VectorSearch",
         top_k: int = 5,
         snippet_length: int = 200
     ):
@@ -0,0 +1,180 @@
+"""폴더 스캐너 - os.scandir 기반으로 지원 문서를 찾으면서 바로 넘겨주는 생성기"""
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Set
+from fnmatch import fnmatch
+import logging
+import os
+import stat
+
+from ..core import DocumentParser
+
+logger = logging.getLogger(__name__)
+
+# 기본 제외 패턴 (파일/폴더 이름 기준)
+DEFAULT_EXCLUDES = [
+    "~$*",                        # Office 잠금 파일 (~$보고서.docx)
+    ".~lock.*",                   # LibreOffice 잠금 파일
+    "*.tmp",
+    "*.bak",
+    ".git",
+    ".svn",
+    ".hg",
+    "node_modules",
+    "__pycache__",
+    ".venv",
+    "venv",
+    "backup",
+    "backups",
+    "$RECYCLE.BIN",
+    "System Volume Information",
+]
+
+# Windows 숨김/시스템 속성
+_HIDDEN_ATTRIBUTES = getattr(stat, "FILE_ATTRIBUTE_HIDDEN", 0x2) | getattr(stat, "FILE_ATTRIBUTE_SYSTEM", 0x4)
+
+
+class FolderScanner:
+    """
+    지원 문서 스캐너
+
+    디렉토리 항목의 이름과 종류(d_type)만으로 확장자/제외 패턴을 먼저 거르므로 대부분의 항목은
+    stat 호출 없이 건너뜁니다. 결과는 찾는 즉시 생성되어 인덱싱 파이프라인이 스캔이 끝나기 전부터
+    작업을 시작할 수 있습니다. 같은 폴더 안에서는 이름순으로 생성하여 순서가 항상 같습니다.
+    """
+
+    def __init__(
+        self,
+        include: Optional[Iterable[str]] = None,
+        exclude: Optional[Iterable[str]] = None,
+        skip_hidden: bool = True
+    ):
+        """
+        Args:
+            include: 포함할 파일 이름 패턴 (None이면 지원 형식 전체)
+            exclude: 제외할 파일/폴더 패턴 (None이면 DEFAULT_EXCLUDES).
+                "/"가 들어간 패턴은 스캔 폴더 기준 상대 경로와 비교
+            skip_hidden: 숨김 파일/폴더 (이름이 "."으로 시작하거나 Windows 숨김/시스템 속성) 건너뛰기
+        """
+        self.include: List[str] = list(include) if include else []
+        self.exclude: List[str] = list(DEFAULT_EXCLUDES if exclude is None else exclude)
+        self.skip_hidden = skip_hidden
+
+        # 마지막 스캔에서 읽지 못한 폴더 (절대 경로, 그 아래 파일은 스캔 결과에 없음)
+        self.failed_dirs: Set[Path] = set()
+
+        self._name_patterns = [p for p in self.exclude if "/" not in p]
+        self._path_patterns = [p.strip("/") for p in self.exclude if "/" in p]
+
+    def iter_files(self, folder_path: Path, recursive: bool = True) -> Iterator[Path]:
+        """
+        폴더의 지원 문서를 하나씩 생성
+
+        Args:
+            folder_path: 스캔할 폴더
+            recursive: 하위 폴더 포함 여부
+
+        Yields:
+            파일 경로
+        """
+        root = Path(folder_path)
+        self.failed_dirs = set()
+        # 깊이 우선 탐색 (os.walk와 달리 폴더 전체 목록을 만들기 전에 파일을 내보냄)
+        stack = [(root, "")]
+
+        while stack:
+            dir_path, rel_dir = stack.pop()
+            try:
+                with os.scandir(dir_path) as it:
+                    entries = sorted(it, key=lambda entry: entry.name)
+            except OSError as e:
+                logger.warning(f"Cannot scan {dir_path}: {e}")
+                self.failed_dirs.add(dir_path.absolute())
+                continue
+
+            subdirs = []
+            for entry in entries:
+                rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                try:
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                except OSError:
+                    continue
+
+                if is_dir:
+                    if recursive and not self._is_excluded(entry, rel_path):
+                        subdirs.append((Path(entry.path), rel_path))
+                    continue
+
+                # 확장자부터 확인하여 대상이 아닌 항목은 stat 없이 건너뜀
+                if not self._is_candidate(entry.name):
+                    continue
+                if self._is_excluded(entry, rel_path):
+                    continue
+                try:
+                    if not entry.is_file():
+                        continue
+                except OSError:
+                    continue
+
+                yield Path(entry.path)
+
+            # 스택이므로 역순으로 넣어 이름순으로 방문
+            stack.extend(reversed(subdirs))
+
+    def accepts(self, file_path: Path, root: Optional[Path] = None) -> bool:
+        """
+        감시 이벤트 등으로 받은 파일이 스캔 대상인지 확인
+
+        Args:
+            file_path: 파일 경로
+            root: 스캔 기준 폴더 (경로 패턴과 상위 폴더 제외 확인용)
+        """
+        file_path = Path(file_path)
+        if not self._is_candidate(file_path.name):
+            return False
+
+        parts = [file_path.name]
+        if root is not None:
+            try:
+                parts = list(file_path.relative_to(root).parts)
+            except ValueError:
+                pass
+
+        for depth in range(len(parts)):
+            name = parts[depth]
+            rel_path = "/".join(parts[:depth + 1])
+            if self.skip_hidden and name.startswith("."):
+                return False
+            if self._matches(name, rel_path):
+                return False
+        return True
+
+    def _is_candidate(self, name: str) -> bool:
+        """확장자와 포함 패턴 확인 (이름만 사용)"""
+        if not DocumentParser.is_supported(Path(name)):
+            return False
+        return not self.include or any(fnmatch(name, pattern) for pattern in self.include)
+
+    def _is_excluded(self, entry: os.DirEntry, rel_path: str) -> bool:
+        """제외 패턴과 숨김 속성 확인"""
+        if self._matches(entry.name, rel_path):
+            return True
+        if not self.skip_hidden:
+            return False
+        if entry.name.startswith("."):
+            return True
+        # Windows에서는 scandir이 속성을 함께 가져오므로 추가 비용 없음
+        if os.name == "nt":
+            try:
+                attributes = entry.stat(follow_symlinks=False).st_file_attributes
+            except OSError:
+                return False
+            return bool(attributes & _HIDDEN_ATTRIBUTES)
+        return False
+
+    def _matches(self, name: str, rel_path: str) -> bool:
+        if any(fnmatch(name, pattern) for pattern in self._name_patterns):
+            return True
+        return any(fnmatch(rel_path, pattern) for pattern in self._path_patterns)
+
+    def __repr__(self) -> str:
+        return f"FolderScanner(include={self.include}, exclude={len(self.exclude)} patterns, skip_hidden={self.skip_hidden})"
@@ -0,0 +1,381 @@
+"""파싱 감독기 - 파일별 시간/메모리 예산을 두고 워커 프로세스에서 파싱"""
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, List, Optional
+from dataclasses import dataclass, field
+from multiprocessing.connection import wait as wait_connections
+import logging
+import multiprocessing
+import os
+import signal
+import time
+
+from ..core import DocumentParser
+from ..core.parser import DocumentChunk
+
+logger = logging.getLogger(__name__)
+
+# 워커 → 감독기 메시지 종류
+_CHUNKS = "chunks"
+_DONE = "done"
+_ERROR = "error"
+
+# 메모리 사용량을 확인하는 최대 간격 (초)
+_MEMORY_POLL_INTERVAL = 0.5
+
+
+class ParseError(Exception):
+    """
+    파싱 실패
+
+    Attributes:
+        quarantine: 시간/메모리 예산 초과나 워커 비정상 종료처럼 다시 시도해도 같은 결과가
+            나올 가능성이 높은 실패인지 여부
+    """
+
+    def __init__(self, reason: str, quarantine: bool = False):
+        super().__init__(reason)
+        self.quarantine = quarantine
+
+
+@dataclass
+class ParseEvent:
+    """파싱 진행 이벤트 (청크 일부, 파일 완료, 또는 실패)"""
+    file_path: Path
+    chunks: List[DocumentChunk] = field(default_factory=list)
+    final: bool = False
+    error: Optional[ParseError] = None
+    count: int = 0
+    wall_seconds: float = 0.0
+    cpu_seconds: float = 0.0
+
+
+def _worker_main(parser: DocumentParser, conn, batch_size: int):
+    """워커 프로세스 본체: 파일 경로를 받아 청크를 batch_size개씩 돌려보냄"""
+    # Ctrl-C는 부모 프로세스가 처리
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    # 워커마다 토크나이저 스레드 풀을 만들면 워커끼리 코어를 다투므로 워커 안에서는 단일 스레드로 토큰화
+    os.environ["TOKENIZERS_PARALLELISM"] = "false"
+    # 파서가 만든 자식 프로세스(병렬 PDF 추출 등)까지 함께 종료할 수 있도록 새 프로세스 그룹 사용
+    _set_process_group(0)
+
+    while True:
+        try:
+            task = conn.recv()
+        except (EOFError, OSError):
+            return
+        if task is None:
+            return
+        file_path, content_hash = task
+
+        wall, cpu = time.perf_counter(), time.process_time()
+        # 감독기가 결과를 읽지 않아 send에서 막혀 있던 시간 (시간 예산에서 제외)
+        blocked = 0.0
+        try:
+            batch = []
+            for chunk in parser.iter_chunks(file_path, content_hash):
+                batch.append(chunk)
+                if len(batch) >= batch_size:
+                    sent_at = time.monotonic()
+                    conn.send((_CHUNKS, batch, sent_at, blocked))
+                    blocked += time.monotonic() - sent_at
+                    batch = []
+            conn.send((_DONE, batch, time.perf_counter() - wall, time.process_time() - cpu))
+        except MemoryError:
+            conn.send((_ERROR, "out of memory while parsing", True))
+        except Exception as e:
+            conn.send((_ERROR, f"{type(e).__name__}: {e}", False))
+
+
+def _set_process_group(pid: int):
+    """프로세스를 자기 자신이 리더인 프로세스 그룹으로 옮김 (지원하지 않는 플랫폼에서는 무시)"""
+    try:
+        os.setpgid(pid, 0)
+    except (AttributeError, OSError):
+        pass
+
+
+def _resident_bytes(pid: int) -> Optional[int]:
+    """프로세스의 상주 메모리 크기 (확인할 수 없으면 None)"""
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    try:
+        import psutil
+        return psutil.Process(pid).memory_info().rss
+    except Exception:
+        return None
+
+
+class _Worker:
+    """감독기가 관리하는 워커 프로세스 하나"""
+
+    def __init__(self, context, parser: DocumentParser, batch_size: int, index: int):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=_worker_main,
+            args=(parser, child_conn, batch_size),
+            name=f"memorag-parse-{index}",
+            # 데몬 프로세스는 자식 프로세스를 만들 수 없으므로 종료는 감독기가 직접 관리
+            daemon=False
+        )
+        self.process.start()
+        child_conn.close()
+        # 워커가 스스로 옮기기 전에 종료되는 경우를 위해 부모에서도 설정
+        _set_process_group(self.process.pid)
+
+        self.file_path: Optional[Path] = None
+        self.count = 0
+        self.started = 0.0
+        self.blocked = 0.0
+        self.baseline_rss: Optional[int] = None
+
+    def start(self, file_path: Path, content_hash: Optional[str] = None):
+        """파일 하나 파싱 시작 (content_hash: 이미 계산한 내용 해시, 파싱 텍스트 캐시 키로 사용)"""
+        self.file_path = file_path
+        self.count = 0
+        self.started = time.monotonic()
+        self.blocked = 0.0
+        self.baseline_rss = _resident_bytes(self.process.pid)
+        self.conn.send((file_path, content_hash))
+
+    def finish(self):
+        self.file_path = None
+
+    def received(self, sent_at: float, blocked_before: float):
+        """
+        청크 메시지를 받은 시점에 결과 전송으로 막혀 있던 시간 갱신
+
+        워커는 이전 전송들에서 막혀 있던 시간만 알 수 있으므로, 이번 메시지는 보낸 뒤 받을 때까지를
+        모두 막혀 있던 시간으로 보고 다음 메시지에서 실제 값으로 바로잡습니다.
+        (time.monotonic은 프로세스 사이에 공유되는 시스템 시계)
+        """
+        self.blocked = blocked_before + max(0.0, time.monotonic() - sent_at)
+
+    def elapsed(self) -> float:
+        """현재 파일을 파싱하는 데 쓴 시간 (결과를 보내려고 막혀 있던 시간 제외)"""
+        return time.monotonic() - self.started - self.blocked
+
+    def memory_growth(self) -> int:
+        """파일 파싱을 시작한 뒤 늘어난 상주 메모리 (바이트)"""
+        if self.baseline_rss is None:
+            return 0
+        current = _resident_bytes(self.process.pid)
+        return 0 if current is None else current - self.baseline_rss
+
+    def kill(self):
+        """워커와 워커가 만든 자식 프로세스 강제 종료"""
+        if self.process.is_alive():
+            try:
+                os.killpg(self.process.pid, signal.SIGKILL)
+            except (AttributeError, OSError):
+                self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+    def stop(self):
+        """워커 정상 종료 (응답이 없으면 강제 종료)"""
+        try:
+            self.conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self.process.join(timeout=1.0)
+        self.kill()
+
+
+class ParseSupervisor:
+    """
+    파싱 감독기
+
+    각 파일을 워커 프로세스에서 파싱하고, 청크를 batch_size개씩 받아 ParseEvent로 내보냅니다.
+    파일이 시간 예산(timeout)이나 메모리 예산(memory_limit_mb, 파싱 중 늘어난 상주 메모리)을
+    넘기거나 워커가 비정상 종료되면 그 워커를 죽이고 새 워커로 교체한 뒤 실패 이벤트를 냅니다.
+
+    시간 예산은 파일 파싱을 시작한 뒤 지난 시간으로, 결과를 조금씩 계속 보내는 파일에도 적용됩니다.
+    소비자(임베딩 등)가 느려서 워커가 결과를 보내지 못하고 막혀 있던 시간은 파일 탓이 아니므로 뺍니다.
+
+    워커는 fork 대신 forkserver(없으면 spawn)로 시작합니다. 파이프라인 모드에서는 임베딩/쓰기 스레드가
+    도는 중에 죽은 워커를 다시 만드는데, fork하면 그 스레드들이 잡고 있던 잠금을 물려받아 멀쩡한 파일이
+    교착 후 시간 초과로 격리될 수 있기 때문입니다.
+    """
+
+    def __init__(
+        self,
+        parser: DocumentParser,
+        workers: int = 1,
+        timeout: Optional[float] = None,
+        memory_limit_mb: Optional[int] = None,
+        batch_size: int = 32
+    ):
+        """
+        Args:
+            parser: 문서 파서 (워커 프로세스로 전달됨)
+            workers: 워커 프로세스 수
+            timeout: 파일당 최대 파싱 시간 (초, None/0이면 제한 없음)
+            memory_limit_mb: 파일당 최대 메모리 증가량 (MB, None/0이면 제한 없음)
+            batch_size: 워커가 한 번에 보내는 청크 수
+        """
+        self.parser = parser
+        self.workers = max(1, workers)
+        self.timeout = timeout or None
+        self.memory_limit = int(memory_limit_mb * 1024 * 1024) if memory_limit_mb else None
+        self.batch_size = max(1, batch_size)
+        self.restarts = 0
+
+        if "forkserver" in multiprocessing.get_all_start_methods():
+            self._context = multiprocessing.get_context("forkserver")
+            # 워커마다 파서 모듈과 토크나이저 라이브러리(transformers)를 다시 import하지 않도록
+            # fork 서버에서 미리 로드
+            preload = [__name__]
+            if parser.tokenizer is not None:
+                preload.append(type(parser.tokenizer).__module__)
+            self._context.set_forkserver_preload(preload)
+        else:
+            self._context = multiprocessing.get_context("spawn")
+        self._spawned = 0
+
+        if self.memory_limit and _resident_bytes(os.getpid()) is None:
+            logger.warning("Cannot measure worker memory on this platform; memory budget is disabled")
+            self.memory_limit = None
+
+    def run(
+        self,
+        files: Iterable[Path],
+        content_hash: Optional[Callable[[Path], Optional[str]]] = None
+    ) -> Iterator[ParseEvent]:
+        """
+        파일들을 파싱하며 이벤트 생성
+
+        여러 워커가 동시에 실행되므로 서로 다른 파일의 이벤트가 섞여 나올 수 있지만,
+        같은 파일의 이벤트는 순서대로 나오고 마지막은 final=True이거나 error가 설정된 이벤트입니다.
+
+        Args:
+            files: 파싱할 파일 경로 (생성기여도 됨)
+            content_hash: 파일의 이미 계산한 내용 해시를 돌려주는 함수 (없으면 워커가 필요할 때 계산)
+
+        Yields:
+            ParseEvent
+        """
+        files = iter(files)
+        idle: List[_Worker] = []
+        running: List[_Worker] = []
+        exhausted = False
+
+        try:
+            while True:
+                # 워커는 파싱할 파일이 생겼을 때 시작 (바뀐 파일이 없는 증분 인덱싱은 워커를 만들지 않음)
+                while len(running) < self.workers and not exhausted:
+                    file_path = next(files, None)
+                    if file_path is None:
+                        exhausted = True
+                        break
+                    worker = idle.pop() if idle else self._spawn()
+                    worker.start(file_path, content_hash(file_path) if content_hash else None)
+                    running.append(worker)
+
+                if not running:
+                    return
+
+                # 결과 대기 (시간/메모리 예산 확인을 위해 제한 시간을 둠)
+                ready = wait_connections(
+                    [w.conn for w in running] + [w.process.sentinel for w in running],
+                    self._wait_timeout(running)
+                )
+
+                for worker in list(running):
+                    events = []
+                    if worker.conn in ready:
+                        events.append(self._receive(worker))
+                    elif worker.process.sentinel in ready:
+                        events.append(self._fail(
+                            worker, f"parser worker exited unexpectedly (exit code {worker.process.exitcode})"
+                        ))
+                    # 방금 결과를 보낸 워커도 확인 (청크를 조금씩 끝없이 내는 파일도 예산에 걸리도록)
+                    if worker.file_path is not None:
+                        events.append(self._check_budget(worker))
+
+                    for event in events:
+                        if event is None:
+                            continue
+                        if event.final or event.error is not None:
+                            running.remove(worker)
+                            # 실패로 죽은 워커는 다음 파일을 맡길 때 새 워커로 교체
+                            if worker.process.is_alive():
+                                idle.append(worker)
+                        yield event
+        finally:
+            for worker in idle + running:
+                if worker.file_path is None:
+                    worker.stop()
+                else:
+                    worker.kill()
+
+    def _spawn(self) -> _Worker:
+        self._spawned += 1
+        return _Worker(self._context, self.parser, self.batch_size, self._spawned)
+
+    def _wait_timeout(self, running: List[_Worker]) -> Optional[float]:
+        """가장 먼저 시간 예산을 넘길 워커까지 남은 시간"""
+        timeouts = []
+        if self.timeout is not None:
+            timeouts.append(max(0.0, min(self.timeout - w.elapsed() for w in running)))
+        if self.memory_limit is not None:
+            timeouts.append(_MEMORY_POLL_INTERVAL)
+        return min(timeouts) if timeouts else None
+
+    def _receive(self, worker: _Worker) -> Optional[ParseEvent]:
+        """워커 메시지 하나를 이벤트로 변환"""
+        try:
+            message = worker.conn.recv()
+        except (EOFError, OSError):
+            return self._fail(worker, "parser worker exited unexpectedly")
+
+        file_path = worker.file_path
+        kind = message[0]
+
+        if kind == _CHUNKS:
+            _, chunks, sent_at, blocked = message
+            worker.received(sent_at, blocked)
+            worker.count += len(chunks)
+            return ParseEvent(file_path, chunks=chunks)
+
+        if kind == _DONE:
+            _, chunks, wall, cpu = message
+            worker.count += len(chunks)
+            worker.finish()
+            return ParseEvent(
+                file_path, chunks=chunks, final=True, count=worker.count,
+                wall_seconds=wall, cpu_seconds=cpu
+            )
+
+        _, reason, quarantine = message
+        worker.finish()
+        return ParseEvent(file_path, error=ParseError(reason, quarantine=quarantine), count=worker.count)
+
+    def _check_budget(self, worker: _Worker) -> Optional[ParseEvent]:
+        """예산을 넘긴 워커면 종료하고 실패 이벤트 반환"""
+        if self.timeout is not None and worker.elapsed() >= self.timeout:
+            return self._fail(worker, f"parse timed out after {self.timeout:g}s")
+
+        if self.memory_limit is not None:
+            growth = worker.memory_growth()
+            if growth > self.memory_limit:
+                return self._fail(
+                    worker,
+                    f"parse exceeded memory budget ({growth // (1024 * 1024)} MB > "
+                    f"{self.memory_limit // (1024 * 1024)} MB)"
+                )
+        return None
+
+    def _fail(self, worker: _Worker, reason: str) -> ParseEvent:
+        """워커를 종료하고 격리 대상 실패 이벤트 생성"""
+        file_path = worker.file_path
+        logger.warning(f"Killing parser worker for {file_path}: {reason}")
+        worker.kill()
+        worker.finish()
+        self.restarts += 1
+        return ParseEvent(file_path, error=ParseError(reason, quarantine=True), count=worker.count)
+
+    def __repr__(self) -> str:
+        return f"ParseSupervisor(workers={self.workers}, timeout={self.timeout}, memory_limit={self.memory_limit})"
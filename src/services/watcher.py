@@ -0,0 +1,414 @@
+"""폴더 감시 서비스 - 파일 변경을 감지하여 컬렉션을 계속 동기화"""
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import struct
+import sys
+import time
+
+from ..core import DocumentParser
+from .scanner import FolderScanner
+
+logger = logging.getLogger(__name__)
+
+# 감시 이벤트 종류
+CHANGED = "changed"    # 파일 생성/수정/이동해 옴
+DELETED = "deleted"    # 파일 또는 폴더 삭제/이동해 나감
+RESCAN = "rescan"      # 폴더 전체 재확인 필요 (새 폴더, 이벤트 유실)
+
+
+class PollingWatcher:
+    """주기적으로 폴더를 스캔하여 변경을 찾는 감시기 (모든 플랫폼)"""
+
+    def __init__(self, folder_path: Path, recursive: bool = True, interval: float = 2.0,
+                 scanner: Optional[FolderScanner] = None):
+        """
+        Args:
+            folder_path: 감시할 폴더
+            recursive: 하위 폴더 포함 여부
+            interval: 스캔 간격 (초)
+            scanner: 폴더 스캐너 (None이면 기본 제외 패턴 사용)
+        """
+        self.folder_path = Path(folder_path)
+        self.recursive = recursive
+        self.interval = interval
+        self.scanner = scanner or FolderScanner()
+        self._snapshot = self._scan()
+        self._next_scan = time.monotonic() + interval
+
+    def _scan(self) -> Dict[Path, Tuple[int, int]]:
+        """지원 파일의 (크기, 수정 시각) 스냅샷"""
+        snapshot = {}
+        for file_path in self.scanner.iter_files(self.folder_path, self.recursive):
+            try:
+                stat = file_path.stat()
+            except OSError:
+                continue
+            snapshot[file_path] = (stat.st_size, stat.st_mtime_ns)
+        return snapshot
+
+    def poll(self, timeout: float) -> List[Tuple[str, Path]]:
+        """
+        변경 이벤트 대기
+
+        Args:
+            timeout: 최대 대기 시간 (초)
+
+        Returns:
+            (이벤트 종류, 경로) 리스트
+        """
+        wait = self._next_scan - time.monotonic()
+        if wait > 0:
+            time.sleep(min(wait, timeout))
+            if time.monotonic() < self._next_scan:
+                return []
+
+        self._next_scan = time.monotonic() + self.interval
+        snapshot = self._scan()
+
+        events = [(CHANGED, path) for path, sig in snapshot.items() if self._snapshot.get(path) != sig]
+        events += [(DELETED, path) for path in self._snapshot if path not in snapshot]
+        self._snapshot = snapshot
+        return events
+
+    def close(self):
+        """감시 종료"""
+
+
+class InotifyWatcher:
+    """Linux inotify 기반 감시기 (ctypes로 libc 직접 호출)"""
+
+    IN_MODIFY = 0x00000002
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_DELETE_SELF = 0x00000400
+    IN_Q_OVERFLOW = 0x00004000
+    IN_IGNORED = 0x00008000
+    IN_ISDIR = 0x40000000
+    IN_NONBLOCK = 0x00000800
+    IN_CLOEXEC = 0x00080000
+
+    WATCH_MASK = (
+        IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+        | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+    )
+    _EVENT_HEADER = struct.Struct("iIII")
+
+    def __init__(self, folder_path: Path, recursive: bool = True):
+        """
+        Args:
+            folder_path: 감시할 폴더
+            recursive: 하위 폴더 포함 여부
+
+        Raises:
+            OSError: inotify를 사용할 수 없음 (Linux 외 플랫폼, 감시 개수 제한 등)
+        """
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify is only available on Linux")
+
+        self.folder_path = Path(folder_path)
+        self.recursive = recursive
+
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._fd = self._libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self._fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+
+        self._watches: Dict[int, Path] = {}
+        self._add_tree(self.folder_path)
+
+    def _add_watch(self, dir_path: Path):
+        """폴더 하나에 감시 추가"""
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(str(dir_path)), self.WATCH_MASK)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, f"inotify_add_watch failed for {dir_path}: {os.strerror(errno)}")
+        self._watches[wd] = dir_path
+
+    def _add_tree(self, dir_path: Path):
+        """폴더와 (재귀 모드면) 모든 하위 폴더에 감시 추가"""
+        self._add_watch(dir_path)
+        if not self.recursive:
+            return
+        for root, dirs, _ in os.walk(dir_path):
+            for name in dirs:
+                try:
+                    self._add_watch(Path(root) / name)
+                except OSError as e:
+                    logger.warning(str(e))
+
+    def poll(self, timeout: float) -> List[Tuple[str, Path]]:
+        """
+        변경 이벤트 대기
+
+        Args:
+            timeout: 최대 대기 시간 (초)
+
+        Returns:
+            (이벤트 종류, 경로) 리스트
+        """
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return []
+
+        events = []
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            if not data:
+                break
+            events.extend(self._decode(data))
+        return events
+
+    def _decode(self, data: bytes) -> List[Tuple[str, Path]]:
+        """inotify_event 구조체 배열 해석"""
+        events = []
+        offset = 0
+        header_size = self._EVENT_HEADER.size
+
+        while offset + header_size <= len(data):
+            wd, mask, _cookie, length = self._EVENT_HEADER.unpack_from(data, offset)
+            raw_name = data[offset + header_size:offset + header_size + length]
+            offset += header_size + length
+
+            if mask & self.IN_Q_OVERFLOW:
+                # 이벤트가 유실되었으므로 전체 재확인
+                logger.warning("inotify queue overflow; rescanning folder")
+                events.append((RESCAN, self.folder_path))
+                continue
+
+            if mask & self.IN_IGNORED:
+                self._watches.pop(wd, None)
+                continue
+
+            parent = self._watches.get(wd)
+            if parent is None:
+                continue
+
+            name = os.fsdecode(raw_name.rstrip(b"\0"))
+            path = parent / name if name else parent
+
+            if mask & self.IN_ISDIR:
+                if mask & (self.IN_CREATE | self.IN_MOVED_TO):
+                    if self.recursive:
+                        try:
+                            self._add_tree(path)
+                        except OSError as e:
+                            logger.warning(str(e))
+                        # 감시를 걸기 전에 생긴 파일이 있을 수 있으므로 폴더 재확인
+                        events.append((RESCAN, path))
+                elif mask & (self.IN_DELETE | self.IN_MOVED_FROM):
+                    events.append((DELETED, path))
+                continue
+
+            if mask & self.IN_DELETE_SELF:
+                continue
+
+            if not DocumentParser.is_supported(path):
+                continue
+
+            if mask & (self.IN_DELETE | self.IN_MOVED_FROM):
+                events.append((DELETED, path))
+            else:
+                events.append((CHANGED, path))
+
+        return events
+
+    def close(self):
+        """감시 종료"""
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+def create_watcher(folder_path: Path, recursive: bool = True, use_polling: bool = False,
+                   poll_interval: float = 2.0, scanner: Optional[FolderScanner] = None):
+    """
+    플랫폼에 맞는 감시기 생성 (Linux는 inotify, 실패하거나 그 외는 폴링)
+
+    Args:
+        folder_path: 감시할 폴더
+        recursive: 하위 폴더 포함 여부
+        use_polling: True면 항상 폴링 사용
+        poll_interval: 폴링 간격 (초)
+        scanner: 폴링 감시기가 사용할 폴더 스캐너
+    """
+    if not use_polling:
+        try:
+            watcher = InotifyWatcher(folder_path, recursive)
+            logger.info("Watching with inotify")
+            return watcher
+        except (OSError, AttributeError) as e:
+            logger.info(f"inotify unavailable ({e}); falling back to polling")
+
+    logger.info(f"Watching by polling every {poll_interval}s")
+    return PollingWatcher(folder_path, recursive, poll_interval, scanner)
+
+
+class EventDebouncer:
+    """같은 경로의 연속 이벤트를 모아 일정 시간 조용해진 뒤 마지막 상태만 내보냄"""
+
+    def __init__(self, delay: float = 1.0):
+        """
+        Args:
+            delay: 마지막 이벤트 이후 기다리는 시간 (초)
+        """
+        self.delay = delay
+        self._pending: Dict[Tuple[str, Path], float] = {}
+        self._kinds: Dict[Path, str] = {}
+
+    def add(self, kind: str, path: Path):
+        """이벤트 추가 (같은 경로는 마지막 이벤트가 우선)"""
+        now = time.monotonic()
+        if kind == RESCAN:
+            self._pending[(RESCAN, path)] = now
+            return
+        self._kinds[path] = kind
+        self._pending[(CHANGED, path)] = now
+
+    def next_due(self) -> Optional[float]:
+        """가장 먼저 처리할 수 있는 이벤트까지 남은 시간"""
+        if not self._pending:
+            return None
+        return max(0.0, min(self._pending.values()) + self.delay - time.monotonic())
+
+    def pop_ready(self) -> List[Tuple[str, Path]]:
+        """조용해진 이벤트 꺼내기"""
+        now = time.monotonic()
+        ready = []
+        for key, last_seen in list(self._pending.items()):
+            if now - last_seen < self.delay:
+                continue
+            del self._pending[key]
+            kind, path = key
+            if kind == RESCAN:
+                ready.append((RESCAN, path))
+            else:
+                ready.append((self._kinds.pop(path), path))
+        return ready
+
+
+class WatchService:
+    """
+    폴더 감시 서비스
+
+    시작 시 증분 인덱싱으로 밀린 변경을 반영한 뒤, 파일 이벤트를 디바운스하여
+    바뀐 파일만 IndexingService로 다시 인덱싱하고 삭제된 파일의 청크를 제거합니다.
+    임베딩 모델은 프로세스가 살아 있는 동안 계속 메모리에 유지됩니다.
+    """
+
+    def __init__(
+        self,
+        indexing_service,
+        folder_path: Path,
+        collection_name: Optional[str] = None,
+        recursive: bool = True,
+        debounce: float = 1.0,
+        use_polling: bool = False,
+        poll_interval: float = 2.0
+    ):
+        """
+        Args:
+            indexing_service: 인덱싱 서비스 (임베딩 엔진 포함)
+            folder_path: 감시할 폴더
+            collection_name: 동기화할 컬렉션 이름
+            recursive: 하위 폴더 포함 여부
+            debounce: 디바운스 시간 (초)
+            use_polling: inotify 대신 폴링 사용
+            poll_interval: 폴링 간격 (초)
+        """
+        self.indexing_service = indexing_service
+        self.folder_path = Path(folder_path)
+        self.collection_name = collection_name
+        self.recursive = recursive
+        self.debouncer = EventDebouncer(debounce)
+        self.use_polling = use_polling
+        self.poll_interval = poll_interval
+        self._running = False
+
+    def run(self, on_update=None, max_wait: float = 1.0):
+        """
+        감시 시작 (stop()이 호출되거나 KeyboardInterrupt까지 반복)
+
+        Args:
+            on_update: 변경 반영 후 호출되는 콜백 (kind, path, result)
+            max_wait: 한 번에 이벤트를 기다리는 최대 시간 (초)
+        """
+        scanner = getattr(self.indexing_service, "scanner", None)
+        watcher = create_watcher(
+            self.folder_path, self.recursive, self.use_polling, self.poll_interval, scanner
+        )
+        self._running = True
+
+        try:
+            # 감시 시작 전의 변경 사항 반영
+            stats = self.indexing_service.index_folder(
+                self.folder_path,
+                collection_name=self.collection_name,
+                recursive=self.recursive,
+                show_progress=False
+            )
+            if on_update:
+                on_update(RESCAN, self.folder_path, stats)
+
+            while self._running:
+                due = self.debouncer.next_due()
+                timeout = max_wait if due is None else min(max_wait, due)
+
+                for kind, path in watcher.poll(timeout):
+                    # 잠금 파일, 숨김/제외 폴더의 변경은 무시
+                    if kind == CHANGED and scanner is not None and not scanner.accepts(path, self.folder_path):
+                        continue
+                    self.debouncer.add(kind, path)
+
+                for kind, path in self.debouncer.pop_ready():
+                    result = self.apply(kind, path)
+                    if on_update:
+                        on_update(kind, path, result)
+        finally:
+            self._running = False
+            watcher.close()
+
+    def stop(self):
+        """감시 루프 종료 요청"""
+        self._running = False
+
+    def apply(self, kind: str, path: Path):
+        """
+        디바운스된 이벤트 하나를 컬렉션에 반영
+
+        Args:
+            kind: 이벤트 종류 (changed/deleted/rescan)
+            path: 파일 또는 폴더 경로
+
+        Returns:
+            changed: 생성된 청크 수, deleted: 삭제된 파일 수, rescan: 인덱싱 통계
+        """
+        try:
+            if kind == RESCAN:
+                return self.indexing_service.index_folder(
+                    path,
+                    collection_name=self.collection_name,
+                    recursive=self.recursive,
+                    show_progress=False
+                )
+
+            if kind == CHANGED and path.is_file():
+                return self.indexing_service.index_file(path, self.collection_name, incremental=True)
+
+            # 삭제되었거나, 변경 이벤트 이후 사라진 파일
+            return self.indexing_service.remove_path(path, self.collection_name)
+
+        except Exception as e:
+            logger.error(f"Failed to sync {path}: {e}")
+            return None
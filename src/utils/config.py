@@ -14,7 +14,25 @@ class Config:
         "embedding": {
             "model_name": "intfloat/multilingual-e5-base",
             "batch_size": 32,
-            "device": "cpu"
+            "device": "cpu",
+            "backend": "torch",
+            "quantize": False,
+            "onnx_dir": "./models/onnx",
+            "max_batch_tokens": None,
+            "bucket_window": 256,
+            "parallel_workers": 0,
+            "worker_threads": 0,
+            "threads": 0
+        },
+        "cache": {
+            "enabled": True,
+            "directory": "./cache/embeddings",
+            "max_size_mb": 2048
+        },
+        "text_cache": {
+            "enabled": True,
+            "directory": "./cache/parsed",
+            "max_size_mb": 4096
         },
         "database": {
             "persist_directory": "./chroma",
@@ -23,12 +41,41 @@ class Config:
         "parsing": {
             "chunk_size": 512,
             "chunk_overlap": 50,
+            "chunk_unit": "tokens",
+            "pdf_parallel_pages": 200,
+            "pdf_workers": 0,
+            "pdf_backend": "auto",
+            "xlsx_repeat_header": True,
+            "ooxml_fast_path": True,
             "supported_extensions": [".pdf", ".docx", ".hwpx", ".txt", ".md"]
         },
+        "indexing": {
+            "workers": 1,
+            "queue_size": 16,
+            "batch_max_wait": 2.0,
+            "write_batch_size": 1024,
+            "parse_timeout": 300,
+            "parse_memory_mb": 2048,
+            "quarantine": True
+        },
+        "scan": {
+            "include": [],
+            "exclude": [],
+            "default_excludes": True,
+            "skip_hidden": True
+        },
+        "watch": {
+            "debounce": 1.0,
+            "poll_interval": 2.0
+        },
         "search": {
             "top_k": 5,
             "similarity_threshold": 0.5
         },
+        "daemon": {
+            "enabled": True,
+            "socket": "./cache/memorag.sock"
+        },
         "output": {
             "show_score": True,
             "show_snippet": True,
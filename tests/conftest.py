@@ -0,0 +1,35 @@
+"""테스트 공용 fixture"""
+import pytest
+
+
+@pytest.fixture(scope="session")
+def tiny_model_path(tmp_path_factory):
+    """2층 BERT + mean 풀링 + 정규화로 된 sentence-transformers 모델 (다운로드 없이 만듦)"""
+    pytest.importorskip("torch")
+    pytest.importorskip("sentence_transformers")
+    from tokenizers import Tokenizer, models, pre_tokenizers, processors
+    from transformers import BertConfig, BertModel, PreTrainedTokenizerFast
+    from sentence_transformers import SentenceTransformer, models as st_models
+
+    root = tmp_path_factory.mktemp("tiny-model")
+    words = ["[PAD]", "[UNK]", "[CLS]", "[SEP]"] + [f"w{i}" for i in range(32)] + list("가나다라마")
+    word_level = Tokenizer(models.WordLevel({word: i for i, word in enumerate(words)}, unk_token="[UNK]"))
+    word_level.pre_tokenizer = pre_tokenizers.Whitespace()
+    word_level.post_processor = processors.TemplateProcessing(
+        single="[CLS] $A [SEP]", special_tokens=[("[CLS]", 2), ("[SEP]", 3)]
+    )
+    tokenizer = PreTrainedTokenizerFast(
+        tokenizer_object=word_level, unk_token="[UNK]", pad_token="[PAD]", cls_token="[CLS]", sep_token="[SEP]"
+    )
+    config = BertConfig(
+        vocab_size=len(words), hidden_size=32, num_hidden_layers=2,
+        num_attention_heads=2, intermediate_size=64, max_position_embeddings=64
+    )
+    BertModel(config).save_pretrained(root / "hf")
+    tokenizer.save_pretrained(root / "hf")
+
+    transformer = st_models.Transformer(str(root / "hf"), max_seq_length=32)
+    pooling = st_models.Pooling(32, pooling_mode="mean")
+    model = SentenceTransformer(modules=[transformer, pooling, st_models.Normalize()], device="cpu")
+    model.save(str(root / "st"))
+    return str(root / "st")
@@ -0,0 +1,63 @@
+"""토큰 기준 청크 분할 테스트"""
+import pytest
+
+pytest.importorskip("tokenizers")
+pytest.importorskip("transformers")
+
+from tokenizers import Tokenizer, models, pre_tokenizers
+from transformers import PreTrainedTokenizerFast
+
+from src.core.chunking import TokenChunker
+from src.core.parser import DocumentParser
+
+
+@pytest.fixture
+def tokenizer():
+    """단어와 문장부호를 토큰 하나로 세는 오프라인 토크나이저"""
+    word_level = Tokenizer(models.WordLevel({"[UNK]": 0}, unk_token="[UNK]"))
+    word_level.pre_tokenizer = pre_tokenizers.Whitespace()
+    return PreTrainedTokenizerFast(tokenizer_object=word_level, unk_token="[UNK]")
+
+
+def _text(words: int) -> str:
+    return " ".join(f"단어{i}" + ("." if i % 7 == 6 else "") for i in range(words))
+
+
+def test_chunks_fit_token_limit(tokenizer):
+    """모든 청크가 토큰 한도 안에 들어가고 앞뒤 청크가 overlap만큼 겹치는지 테스트"""
+    chunker = TokenChunker(tokenizer, max_tokens=20, overlap=4)
+
+    chunks = chunker.split(_text(200))
+
+    assert len(chunks) > 10
+    assert all(chunker.length(chunk) <= 20 for chunk in chunks)
+    assert chunks[0].startswith("단어0 ")
+    assert chunks[-1].endswith("단어199")
+    # 다음 청크는 앞 청크의 끝부분에서 시작
+    assert chunks[1].split()[0] in chunks[0].split()
+
+
+def test_overlap_is_capped(tokenizer):
+    """오버랩이 청크의 1/4로 제한되는지 테스트"""
+    assert TokenChunker(tokenizer, max_tokens=20, overlap=50).overlap == 5
+
+
+def test_split_stream_matches_split(tokenizer):
+    """조각 단위 분할이 전체 분할과 같은 청크를 내는지 테스트"""
+    chunker = TokenChunker(tokenizer, max_tokens=16, overlap=2)
+    lines = [_text(i % 13 + 1) for i in range(300)]
+
+    streamed = list(chunker.split_stream(DocumentParser._join_lines(lines)))
+
+    assert streamed == chunker.split("\n".join(lines))
+
+
+def test_parser_uses_tokenizer(tokenizer):
+    """토크나이저를 설정한 파서가 모델 한도로 chunk_size를 줄이는지 테스트"""
+    parser = DocumentParser(chunk_size=512, chunk_overlap=50)
+    parser.use_tokenizer(tokenizer, max_tokens=30)
+
+    chunks = parser._split_text(_text(300))
+
+    assert parser.chunk_limit == 30
+    assert all(parser.measure(chunk) <= 30 for chunk in chunks)
@@ -0,0 +1,73 @@
+"""CLI 명령 테스트 - 모델 없이 명령 전체 흐름 실행"""
+import copy
+
+import pytest
+
+pytest.importorskip("chromadb")
+
+from click.testing import CliRunner
+
+import src.cli.main as cli_main
+from src.core.embedder import EmbeddingEngine
+from src.core.vector_search import VectorSearch
+from src.utils.config import Config
+
+
+class FakeEmbedder:
+    """모델 없이 고정 차원 벡터를 돌려주는 테스트용 임베딩 엔진"""
+
+    model_name = "fake"
+    batch_size = 8
+    cache = None
+
+    def embed_documents(self, texts):
+        return [[float(len(text)), 1.0, 0.0] for text in texts]
+
+    def embed_query(self, text):
+        return [float(len(text)), 1.0, 0.0]
+
+
+@pytest.fixture
+def config_file(tmp_path, monkeypatch):
+    # Config는 기본값을 얕은 복사하므로 설정 파일 병합이 다른 테스트로 새지 않도록 격리
+    monkeypatch.setattr(Config, "DEFAULT_CONFIG", copy.deepcopy(Config.DEFAULT_CONFIG))
+    monkeypatch.setattr(cli_main, "_create_embedder", lambda config, cache=True: FakeEmbedder())
+    path = tmp_path / "config.yaml"
+    path.write_text(
+        f"database:\n  persist_directory: {tmp_path / 'chroma'}\n"
+        f"parsing:\n  chunk_size: 64\n  chunk_overlap: 8\n  chunk_unit: chars\n"
+        f"text_cache:\n  enabled: false\n"
+        f"logging:\n  file: {tmp_path / 'memoRAG.log'}\n",
+        encoding="utf-8"
+    )
+    return path
+
+
+def test_index_command(config_file, tmp_path):
+    """index 명령이 기본 제외 패턴을 적용하여 폴더를 인덱싱하는지 테스트"""
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    (docs / "회의록.txt").write_text("체육대회 준비 회의 " * 20, encoding="utf-8")
+    (docs / "회의록.bak").write_text("백업", encoding="utf-8")
+
+    result = CliRunner().invoke(
+        cli_main.cli, ["--config", str(config_file), "index", "--folder", str(docs), "--output", "notes"]
+    )
+
+    assert result.exit_code == 0, result.output
+    assert "처리 파일: 1개" in result.output
+    vector_db = VectorSearch(persist_directory=str(tmp_path / "chroma"), collection_name="notes")
+    assert vector_db.get_collection_count("notes") == 4
+
+
+def test_create_embedder_applies_thread_settings(tmp_path, monkeypatch):
+    """임베딩 스레드 설정이 엔진까지 전달되는지 테스트"""
+    monkeypatch.setattr(Config, "DEFAULT_CONFIG", copy.deepcopy(Config.DEFAULT_CONFIG))
+    monkeypatch.setattr(EmbeddingEngine, "_load_model", lambda self: None)
+    path = tmp_path / "config.yaml"
+    path.write_text("embedding:\n  threads: 3\n  worker_threads: 2\n", encoding="utf-8")
+
+    engine = cli_main._create_embedder(Config(path), cache=False)
+
+    assert engine.threads == 3
+    assert engine.worker_threads == 2
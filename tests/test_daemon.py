@@ -0,0 +1,91 @@
+"""검색 데몬 테스트"""
+import threading
+
+import pytest
+
+pytest.importorskip("chromadb")
+
+from src.core.vector_search import VectorSearch
+from src.services.daemon import QueryDaemon, is_supported, query_daemon, send_request
+
+
+class FakeEmbedder:
+    """모델 없이 고정 차원 벡터를 돌려주는 테스트용 임베딩 엔진"""
+
+    model_name = "fake"
+    backend = "torch"
+    quantize = False
+
+    def embed_query(self, text):
+        return [float(len(text)), 1.0, 0.0]
+
+
+def _add(persist_directory, doc_id, text):
+    vector_db = VectorSearch(persist_directory=str(persist_directory), collection_name="notes")
+    vector_db.add_documents(
+        ids=[doc_id],
+        embeddings=[[float(len(text)), 1.0, 0.0]],
+        documents=[text],
+        metadatas=[{"file_path": f"/docs/{doc_id}.txt", "file_name": f"{doc_id}.txt", "chunk_index": 0}]
+    )
+
+
+@pytest.fixture
+def daemon(tmp_path):
+    _add(tmp_path / "chroma", "first", "체육대회 일정 안내")
+    daemon = QueryDaemon(FakeEmbedder(), persist_directory=str(tmp_path / "chroma"), default_collection="notes")
+    daemon.warm_up()
+    return daemon
+
+
+def test_handle_query_sees_new_documents(daemon, tmp_path):
+    """검색 결과를 돌려주고, 이후 인덱싱된 문서도 다시 열어 검색되는지 테스트"""
+    response = daemon.handle({"op": "query", "query": "체육대회"})
+    assert response["ok"]
+    assert [item["metadata"]["file_name"] for item in response["results"]] == ["first.txt"]
+    service = daemon._services["notes"]
+
+    # 같은 질의를 반복해도 컬렉션을 다시 열지 않음
+    daemon.handle({"op": "query", "query": "체육대회"})
+    assert daemon._services["notes"] is service
+
+    _add(tmp_path / "chroma", "second", "학부모 상담 주간")
+    response = daemon.handle({"op": "query", "query": "상담", "top_k": 5})
+    assert {item["metadata"]["file_name"] for item in response["results"]} == {"first.txt", "second.txt"}
+    assert daemon._services["notes"] is not service
+
+
+def test_handle_rejects_mismatched_settings(daemon):
+    """모델 설정이 다른 클라이언트의 요청은 거절"""
+    expect = QueryDaemon.identity("other-model", "torch", False, str(daemon.persist_directory))
+    response = daemon.handle({"op": "query", "query": "체육대회", "expect": expect})
+    assert not response["ok"] and "model_name" in response["error"]
+
+
+@pytest.mark.skipif(not is_supported(), reason="Unix domain sockets not supported")
+def test_serve_over_socket(daemon, tmp_path):
+    """소켓으로 검색하고, shutdown 요청 후 소켓 파일이 정리되는지 테스트"""
+    socket_path = tmp_path / "memorag.sock"
+    thread = threading.Thread(target=daemon.serve, args=(socket_path,), daemon=True)
+    thread.start()
+    for _ in range(100):
+        if send_request(socket_path, {"op": "ping"}, timeout=1.0):
+            break
+        thread.join(0.05)
+
+    results = query_daemon(socket_path, "체육대회", expect=daemon.own_identity)
+    assert [result.metadata["file_name"] for result in results] == ["first.txt"]
+    assert results[0].snippet.startswith("체육대회")
+    assert (socket_path.stat().st_mode & 0o777) == 0o600
+
+    other = QueryDaemon.identity("fake", "onnx", False, str(daemon.persist_directory))
+    assert query_daemon(socket_path, "체육대회", expect=other) is None
+
+    assert send_request(socket_path, {"op": "shutdown"}) == {"ok": True}
+    thread.join(5.0)
+    assert not thread.is_alive() and not socket_path.exists()
+
+
+def test_query_daemon_without_daemon(tmp_path):
+    """데몬이 없으면 None (직접 검색으로 대체)"""
+    assert query_daemon(tmp_path / "missing.sock", "체육대회") is None
@@ -0,0 +1,132 @@
+"""임베딩 엔진 배치 구성 테스트"""
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.core.embedder import EmbeddingEngine, plan_batches
+from src.core.embedding_cache import EmbeddingCache
+
+
+class FakeTokenizer:
+    """공백 단위 토크나이저 ([CLS], [SEP] 포함)"""
+
+    def __call__(self, texts, truncation=False, max_length=None, **kwargs):
+        lengths = [len(text.split()) + 2 for text in texts]
+        if truncation:
+            lengths = [min(length, max_length) for length in lengths]
+        return {"input_ids": [[0] * length for length in lengths]}
+
+
+class FakeModel:
+    """텍스트 길이를 벡터로 돌려주고, 배치마다 패딩 포함 토큰 수를 기록하는 모델"""
+
+    max_seq_length = 16
+
+    def __init__(self):
+        self.tokenizer = FakeTokenizer()
+        self.batches = []
+
+    def encode(self, texts, batch_size=32, **kwargs):
+        lengths = [min(len(text.split()) + 2, self.max_seq_length) for text in texts]
+        for start in range(0, len(texts), batch_size):
+            batch = lengths[start:start + batch_size]
+            self.batches.append(len(batch) * max(batch))
+        return np.array([[length, idx] for idx, length in enumerate(lengths)], dtype=np.float32)
+
+    def get_sentence_embedding_dimension(self):
+        return 2
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    monkeypatch.setattr(EmbeddingEngine, "_load_model", lambda self: setattr(self, "model", FakeModel()))
+    return EmbeddingEngine(model_name="fake", batch_size=4)
+
+
+def test_plan_batches_respects_token_budget():
+    """배치 크기 × 가장 긴 길이가 예산을 넘지 않고, 모든 인덱스를 한 번씩 포함"""
+    lengths = [3, 40, 5, 3, 38, 4, 3, 60]
+    batches = plan_batches(lengths, max_tokens=80)
+
+    assert sorted(idx for batch in batches for idx in batch) == list(range(len(lengths)))
+    for batch in batches:
+        assert len(batch) * max(lengths[idx] for idx in batch) <= 80 or len(batch) == 1
+    # 짧은 텍스트끼리 한 배치
+    assert {0, 2, 3, 5, 6} in [set(batch) for batch in batches]
+
+
+def test_embed_keeps_input_order_with_fewer_padded_tokens(engine):
+    """길이순 배치로 패딩이 줄고, 결과는 입력 순서를 유지"""
+    texts = ["w " * 14, "a", "b c", "w " * 13, "d", "e f g", "h", "w " * 12]
+    expected = [min(len(text.split()) + 2, 16) for text in texts]
+
+    engine.max_batch_tokens = 0
+    fixed = engine.embed(texts)
+    fixed_tokens = sum(engine.model.batches)
+
+    engine.model.batches = []
+    engine.max_batch_tokens = None  # batch_size × max_seq_length = 64
+    bucketed = engine.embed(texts)
+
+    assert isinstance(bucketed, np.ndarray) and bucketed.dtype == np.float32
+    assert fixed[:, 0].tolist() == expected
+    assert bucketed[:, 0].tolist() == expected
+    assert sum(engine.model.batches) < fixed_tokens
+    assert all(tokens <= 64 for tokens in engine.model.batches)
+
+
+def test_embed_returns_float32_arrays(engine):
+    """embed는 (n, dim), embed_query는 (dim,) float32 배열을 반환"""
+    assert engine.embed(["a", "b c"]).shape == (2, 2)
+    assert engine.embed([]).shape == (0, 2)
+    query = engine.embed_query("a b")
+    assert query.shape == (2,) and query.dtype == np.float32
+
+
+def test_embed_encodes_repeated_texts_once(engine, tmp_path):
+    """캐시를 쓸 때 한 배치 안에서 반복되는 텍스트는 한 번만 임베딩"""
+    engine.cache = EmbeddingCache(directory=str(tmp_path), max_size_mb=1)
+    encoded = []
+    encode = engine._encode
+
+    def recording_encode(texts, prefix=""):
+        encoded.extend(texts)
+        return encode(texts, prefix)
+
+    engine._encode = recording_encode
+    embeddings = engine.embed(["a b", "c", "a b", "c", "d e f"])
+
+    assert sorted(encoded) == ["a b", "c", "d e f"]
+    np.testing.assert_array_equal(embeddings[0], embeddings[2])
+    np.testing.assert_array_equal(embeddings[1], embeddings[3])
+    assert engine.cache.stats()["entries"] == 3
+    engine.cache.close()
+
+
+def test_embed_window(engine):
+    """길이별 배치를 쓰면 인덱싱 중 batch_size보다 많이 모아서 embed()에 넘김"""
+    from src.services.batching import ChunkAccumulator
+
+    assert ChunkAccumulator(engine, None, None).batch_size == engine.bucket_window == 256
+    engine.max_batch_tokens = 0
+    assert ChunkAccumulator(engine, None, None).batch_size == engine.batch_size == 4
+
+
+def test_parallel_embed_matches_in_process(tiny_model_path):
+    """워커 프로세스로 나눠 임베딩해도 결과와 순서가 같고, close()로 워커가 종료되는지 테스트"""
+    texts = [" ".join(f"w{(i * 7 + j) % 32}" for j in range(i % 9 + 1)) for i in range(24)]
+    single = EmbeddingEngine(model_name=tiny_model_path, batch_size=4)
+    parallel = EmbeddingEngine(model_name=tiny_model_path, batch_size=4, parallel_workers=2, worker_threads=1)
+
+    try:
+        expected = np.array(single.embed(texts))
+        assert np.allclose(parallel.embed(texts), expected, atol=1e-6)
+        # 두 번째 호출은 이미 시작한 워커를 재사용
+        processes = [worker.process for worker in parallel._pool._workers]
+        assert np.allclose(parallel.embed(texts[::-1]), expected[::-1], atol=1e-6)
+        assert [worker.process for worker in parallel._pool._workers] == processes
+        assert parallel.embed_window == 2 * 256
+    finally:
+        parallel.close()
+
+    assert processes and not any(process.is_alive() for process in processes)
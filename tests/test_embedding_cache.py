@@ -0,0 +1,70 @@
+"""임베딩 캐시 테스트"""
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.core.embedding_cache import EmbeddingCache
+
+
+def test_make_key_normalizes_whitespace():
+    """공백만 다른 텍스트는 같은 키를 사용"""
+    key = EmbeddingCache.make_key("model", "passage", "학부모  공개수업\n안내")
+    assert key == EmbeddingCache.make_key("model", "passage", " 학부모 공개수업 안내 ")
+    assert key != EmbeddingCache.make_key("model", "query", "학부모 공개수업 안내")
+    assert key != EmbeddingCache.make_key("other-model", "passage", "학부모 공개수업 안내")
+
+
+def test_put_and_get(tmp_path):
+    """저장한 벡터를 다시 읽기"""
+    cache = EmbeddingCache(directory=str(tmp_path), max_size_mb=1)
+    keys = [EmbeddingCache.make_key("model", "", f"text {i}") for i in range(3)]
+    vectors = np.arange(12, dtype=np.float32).reshape(3, 4)
+
+    cache.put_many(keys, vectors, model_name="model")
+    found = cache.get_many(keys + ["missing"])
+
+    assert set(found) == set(keys)
+    for key, vector in zip(keys, vectors):
+        np.testing.assert_array_equal(found[key], vector)
+    assert cache.stats()["entries"] == 3
+    cache.close()
+
+    # 다시 열어도 유지
+    reopened = EmbeddingCache(directory=str(tmp_path), max_size_mb=1)
+    np.testing.assert_array_equal(reopened.get_many(keys[:1])[keys[0]], vectors[0])
+    reopened.close()
+
+
+def test_prune_keeps_recently_used(tmp_path):
+    """크기 제한을 넘으면 오래 사용되지 않은 항목부터 제거"""
+    cache = EmbeddingCache(directory=str(tmp_path), max_size_mb=1)
+    keys = [EmbeddingCache.make_key("model", "", f"text {i}") for i in range(4)]
+    vectors = np.arange(16, dtype=np.float32).reshape(4, 4)
+    cache.put_many(keys, vectors)
+    cache.get_many(keys[2:])
+
+    removed = cache.prune(max_bytes=2 * 4 * 4)
+
+    assert removed == 2
+    assert cache.size_bytes() == 2 * 4 * 4
+    found = cache.get_many(keys)
+    assert set(found) == set(keys[2:])
+    np.testing.assert_array_equal(found[keys[3]], vectors[3])
+    cache.close()
+
+
+def test_put_many_allocates_slots_only_for_new_keys(tmp_path):
+    """이미 있는 키와 배치 안의 중복 키는 벡터 파일을 늘리지 않고 기존 벡터를 유지"""
+    cache = EmbeddingCache(directory=str(tmp_path), max_size_mb=1)
+    keys = [EmbeddingCache.make_key("model", "", f"text {i}") for i in range(3)]
+    vectors = np.arange(12, dtype=np.float32).reshape(3, 4)
+    cache.put_many(keys[:2], vectors[:2])
+
+    cache.put_many([keys[0], keys[2], keys[2]], vectors[[2, 2, 2]] + 100)
+
+    assert cache.size_bytes() == 3 * 4 * 4
+    assert cache.stats()["entries"] == 3
+    found = cache.get_many(keys)
+    np.testing.assert_array_equal(found[keys[0]], vectors[0])
+    np.testing.assert_array_equal(found[keys[2]], vectors[2] + 100)
+    cache.close()
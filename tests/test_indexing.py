@@ -0,0 +1,416 @@
+"""인덱싱 서비스 테스트"""
+import os
+import pytest
+from pathlib import Path
+
+pytest.importorskip("chromadb")
+
+from src.core.parser import DocumentParser
+from src.core.vector_search import VectorSearch
+from src.services.indexing import IndexingService
+from src.services.journal import IndexJournal
+from src.services.scanner import FolderScanner
+
+
+class FakeEmbedder:
+    """모델 없이 고정 차원 벡터를 돌려주는 테스트용 임베딩 엔진"""
+
+    model_name = "fake"
+    batch_size = 8
+
+    def embed_documents(self, texts):
+        return [[float(len(text)), 1.0, 0.0] for text in texts]
+
+    def embed_query(self, text):
+        return [float(len(text)), 1.0, 0.0]
+
+
+def _make_docs(folder: Path, count: int = 6):
+    folder.mkdir(parents=True, exist_ok=True)
+    for i in range(count):
+        (folder / f"memo_{i}.txt").write_text(f"회의록 {i}번 " * 20, encoding="utf-8")
+
+
+@pytest.fixture
+def service(tmp_path):
+    parser = DocumentParser(chunk_size=64, chunk_overlap=8)
+    vector_db = VectorSearch(persist_directory=str(tmp_path / "chroma"), collection_name="test")
+    return IndexingService(parser, FakeEmbedder(), vector_db)
+
+
+def test_index_folder_sequential(service, tmp_path):
+    """순차 인덱싱 테스트"""
+    _make_docs(tmp_path / "docs")
+
+    stats = service.index_folder(tmp_path / "docs", collection_name="test", show_progress=False)
+
+    assert stats["total_files"] == 6
+    assert stats["errors"] == 0
+    assert service.vector_db.get_collection_count() == stats["total_chunks"]
+
+
+def test_index_folder_pipelined(service, tmp_path):
+    """파이프라인(멀티 프로세스 파싱) 인덱싱 테스트"""
+    _make_docs(tmp_path / "docs")
+
+    stats = service.index_folder(
+        tmp_path / "docs", collection_name="test", show_progress=False, workers=2
+    )
+
+    assert stats["total_files"] == 6
+    assert stats["errors"] == 0
+    assert stats["total_chunks"] > 0
+    assert service.vector_db.get_collection_count() == stats["total_chunks"]
+
+
+def test_embedding_batches_span_files(service, tmp_path):
+    """작은 파일 여러 개의 청크가 하나의 임베딩 배치로 묶이는지 테스트"""
+    _make_docs(tmp_path / "docs")
+    calls = []
+    embed_documents = service.embedder.embed_documents
+
+    def recording_embed(texts):
+        calls.append(len(texts))
+        return embed_documents(texts)
+
+    service.embedder.embed_documents = recording_embed
+    stats = service.index_folder(tmp_path / "docs", collection_name="test", show_progress=False)
+
+    assert sum(calls) == stats["total_chunks"]
+    assert len(calls) == -(-stats["total_chunks"] // service.embedder.batch_size)
+
+
+def test_reindex_skips_unchanged_files(service, tmp_path):
+    """재인덱싱 시 변경 없는 파일 건너뛰기 테스트"""
+    _make_docs(tmp_path / "docs")
+    first = service.index_folder(tmp_path / "docs", collection_name="test", show_progress=False)
+
+    second = service.index_folder(tmp_path / "docs", collection_name="test", show_progress=False)
+
+    assert second["skipped_files"] == 6
+    assert second["total_chunks"] == 0
+    assert service.vector_db.get_collection_count() == first["total_chunks"]
+
+
+def test_reindex_updates_modified_and_deleted_files(service, tmp_path):
+    """수정된 파일의 이전 청크와 삭제된 파일의 청크 정리 테스트"""
+    docs = tmp_path / "docs"
+    _make_docs(docs)
+    first = service.index_folder(docs, collection_name="test", show_progress=False)
+
+    # 파일 하나는 짧게 줄이고, 하나는 삭제
+    (docs / "memo_0.txt").write_text("짧은 메모", encoding="utf-8")
+    (docs / "memo_1.txt").unlink()
+    chunks_per_file = first["total_chunks"] // 6
+
+    second = service.index_folder(docs, collection_name="test", show_progress=False)
+
+    assert second["skipped_files"] == 4
+    assert second["deleted_files"] == 1
+    assert second["total_chunks"] == 1
+    assert service.vector_db.get_collection_count() == chunks_per_file * 4 + 1
+
+
+def test_reindex_with_filter_keeps_filtered_out_files(service, tmp_path):
+    """포함 패턴으로 스캔에서 빠진 파일의 청크는 삭제하지 않는지 테스트"""
+    docs = tmp_path / "docs"
+    _make_docs(docs)
+    first = service.index_folder(docs, collection_name="test", show_progress=False)
+
+    service.scanner = FolderScanner(include=["memo_0.*"])
+    second = service.index_folder(docs, collection_name="test", show_progress=False)
+
+    assert second["total_files"] == 1
+    assert second["deleted_files"] == 0
+    assert service.vector_db.get_collection_count() == first["total_chunks"]
+
+
+def test_reindex_keeps_files_under_unreadable_folder(service, tmp_path, monkeypatch):
+    """스캔하지 못한 폴더 아래 파일의 청크는 삭제하지 않는지 테스트"""
+    docs = tmp_path / "docs"
+    _make_docs(docs, count=2)
+    _make_docs(docs / "sub", count=2)
+    first = service.index_folder(docs, collection_name="test", show_progress=False)
+
+    # 권한이 없는 폴더 흉내 (목록도 못 읽고, 그 아래 파일의 존재 확인도 실패)
+    sub = docs / "sub"
+    scandir, exists = os.scandir, Path.exists
+
+    def denied_scandir(path):
+        if Path(path) == sub:
+            raise PermissionError(13, "Permission denied", str(path))
+        return scandir(path)
+
+    monkeypatch.setattr(os, "scandir", denied_scandir)
+    monkeypatch.setattr(Path, "exists", lambda self: sub not in self.parents and exists(self))
+    second = service.index_folder(docs, collection_name="test", show_progress=False)
+
+    assert service.scanner.failed_dirs == {sub.absolute()}
+    assert second["total_files"] == 2
+    assert second["deleted_files"] == 0
+    assert service.vector_db.get_collection_count() == first["total_chunks"]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_reindex_removes_chunks_of_emptied_file(service, tmp_path, workers):
+    """내용이 모두 지워진 파일의 이전 청크를 삭제하고, 다음 실행에서는 건너뛰는지 테스트"""
+    docs = tmp_path / "docs"
+    _make_docs(docs)
+    first = service.index_folder(docs, collection_name="test", show_progress=False, workers=workers)
+    chunks_per_file = first["total_chunks"] // 6
+
+    (docs / "memo_0.txt").write_text("", encoding="utf-8")
+    second = service.index_folder(docs, collection_name="test", show_progress=False, workers=workers)
+
+    assert second["errors"] == 0
+    assert second["skipped_files"] == 5
+    assert service.vector_db.get_collection_count() == chunks_per_file * 5
+
+    third = service.index_folder(docs, collection_name="test", show_progress=False, workers=workers)
+
+    assert third["skipped_files"] == 6
+    assert service.vector_db.get_collection_count() == chunks_per_file * 5
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_failed_write_rolls_back_every_buffered_file(service, tmp_path, workers):
+    """쓰기 버퍼 플러시가 실패하면 그 버퍼의 모든 파일을 실패 처리하고 다음 실행에서 다시 인덱싱"""
+    docs = tmp_path / "docs"
+    _make_docs(docs)
+    # 파일 여러 개의 청크가 한 트랜잭션에 들어가도록 설정하고, 두 번째 트랜잭션을 실패시킴
+    service.write_batch_size = 6
+    add_documents = service.vector_db.add_documents
+    calls = []
+
+    def failing_add(*args, **kwargs):
+        calls.append(1)
+        if len(calls) == 2:
+            raise RuntimeError("disk full")
+        return add_documents(*args, **kwargs)
+
+    service.vector_db.add_documents = failing_add
+    first = service.index_folder(docs, collection_name="test", show_progress=False, workers=workers)
+
+    assert first["errors"] >= 2
+    assert all("disk full" in item["reason"] for item in first["error_files"])
+    assert service.vector_db.get_collection_count() == first["total_chunks"]
+
+    service.vector_db.add_documents = add_documents
+    second = service.index_folder(docs, collection_name="test", show_progress=False, workers=workers)
+
+    assert second["errors"] == 0
+    assert second["skipped_files"] == 6 - first["errors"]
+    assert service.vector_db.get_collection_count() == first["total_chunks"] + second["total_chunks"]
+    assert second["total_chunks"] == first["total_chunks"] // (6 - first["errors"]) * first["errors"]
+
+
+def test_resume_interrupted_job(service, tmp_path):
+    """중단된 전체 재인덱싱을 이어서 진행"""
+    docs = tmp_path / "docs"
+    _make_docs(docs)
+    first = service.index_folder(docs, collection_name="test", show_progress=False)
+
+    # 임베딩 배치마다 DB에 반영되도록 쓰기 버퍼를 작게 설정
+    service.write_batch_size = service.embedder.batch_size
+
+    # 두 번째 임베딩 배치에서 강제 종료
+    calls = []
+    embed_documents = service.embedder.embed_documents
+
+    def interrupted_embed(texts):
+        calls.append(len(texts))
+        if len(calls) == 2:
+            raise KeyboardInterrupt
+        return embed_documents(texts)
+
+    service.embedder.embed_documents = interrupted_embed
+    with pytest.raises(KeyboardInterrupt):
+        service.index_folder(docs, collection_name="test", show_progress=False, incremental=False)
+
+    service.embedder.embed_documents = embed_documents
+    resumed = service.index_folder(docs, collection_name="test", show_progress=False, resume=True)
+
+    # 완료된 파일은 건너뛰고, 나머지는 원래 작업의 옵션(전체 재인덱싱)대로 처리
+    assert 0 < resumed["resumed_files"] < 6
+    assert resumed["skipped_files"] == 0
+    assert resumed["errors"] == 0
+    assert service.vector_db.get_collection_count() == first["total_chunks"]
+
+
+def test_large_file_is_written_in_segments(service, tmp_path):
+    """큰 파일의 청크가 배치 단위 조각으로 나뉘어 저장되는지 테스트"""
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    (docs / "big.txt").write_text("아주 긴 보고서 문장입니다. " * 400, encoding="utf-8")
+    segments = []
+    store_segment = service._store_segment
+
+    def recording_store(file_path, start_index, chunks, embeddings, is_last):
+        segments.append((start_index, len(chunks), is_last))
+        store_segment(file_path, start_index, chunks, embeddings, is_last)
+
+    service._store_segment = recording_store
+    stats = service.index_folder(docs, collection_name="test", show_progress=False)
+
+    assert len(segments) > 1
+    assert all(size <= service.embedder.batch_size for _, size, _ in segments)
+    assert [start for start, _, _ in segments] == [
+        sum(size for _, size, _ in segments[:i]) for i in range(len(segments))
+    ]
+    assert segments[-1][2] and not any(last for _, _, last in segments[:-1])
+    assert service.vector_db.get_collection_count() == stats["total_chunks"]
+
+    # 다시 인덱싱하면 매니페스트에 모든 조각의 청크가 기록되어 있어야 함
+    (docs / "big.txt").write_text("짧아진 보고서", encoding="utf-8")
+    service.index_folder(docs, collection_name="test", show_progress=False)
+    assert service.vector_db.get_collection_count() == 1
+
+
+def test_pipelined_parse_events_use_embed_window(service, tmp_path):
+    """파이프라인 모드도 순차 모드와 같은 크기(embed_window)로 파싱 결과를 나눠 받는지 테스트"""
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    (docs / "big.txt").write_text("아주 긴 보고서 문장입니다. " * 400, encoding="utf-8")
+    service.embedder.embed_window = 5
+    parse_events = service._parse_events
+    event_sizes = {}
+
+    def recording_events(file_list, workers=1, batch_size=32):
+        for event in parse_events(file_list, workers=workers, batch_size=batch_size):
+            event_sizes.setdefault(workers, []).append(len(event.chunks))
+            yield event
+
+    service._parse_events = recording_events
+    for workers in [1, 2]:
+        service.index_folder(
+            docs, collection_name="test", show_progress=False, incremental=False, workers=workers
+        )
+
+    assert max(event_sizes[1]) == 5
+    assert event_sizes[2] == event_sizes[1]
+
+
+def test_journal_records_one_row_per_segment(tmp_path):
+    """큰 파일의 조각마다 청크 ID를 한 행씩 기록하고, 되돌릴 때 모두 모아 주는지 테스트"""
+    journal = IndexJournal(tmp_path / "test.journal")
+    job_id = journal.start_job(str(tmp_path), {})
+
+    journal.begin_file(job_id, "big.txt", ["c0", "c1", "old"])
+    journal.extend_file(job_id, "big.txt", 4, ["c4", "c5"])
+    journal.extend_file(job_id, "big.txt", 2, ["c2", "c3"])
+    journal.begin_file(job_id, "done.txt", ["d0"])
+    journal.commit_file(job_id, "done.txt")
+
+    rows = journal._conn.execute(
+        "SELECT start_index FROM segments WHERE path = ? ORDER BY start_index", ("big.txt",)
+    ).fetchall()
+    assert [row[0] for row in rows] == [0, 2, 4]
+    assert [(w.path, w.chunk_ids) for w in journal.pending_writes()] == [
+        ("big.txt", ["c0", "c1", "old", "c2", "c3", "c4", "c5"])
+    ]
+    assert journal.committed_paths(job_id) == {"done.txt"}
+
+    journal.discard_pending(journal.pending_writes())
+    assert journal.pending_writes() == []
+    assert journal._conn.execute("SELECT COUNT(*) FROM segments").fetchone()[0] == 0
+    journal.close()
+
+
+def test_bulk_writer_groups_small_files(service, tmp_path):
+    """여러 파일의 청크가 적은 수의 트랜잭션으로 저장되는지 테스트"""
+    _make_docs(tmp_path / "docs", count=20)
+    calls = []
+    add_documents = service.vector_db.add_documents
+
+    def recording_add(ids, embeddings, documents, metadatas, upsert=False):
+        calls.append(len(ids))
+        add_documents(ids, embeddings, documents, metadatas, upsert=upsert)
+
+    service.vector_db.add_documents = recording_add
+    stats = service.index_folder(tmp_path / "docs", collection_name="test", show_progress=False)
+
+    assert len(calls) == 1
+    assert calls[0] == stats["total_chunks"]
+
+
+def test_bulk_writer_orders_upserts_and_deletes(tmp_path):
+    """버퍼 안에서 같은 ID의 추가/삭제가 호출 순서대로 적용되는지 테스트"""
+    vector_db = VectorSearch(persist_directory=str(tmp_path / "chroma"), collection_name="test")
+    flushed = []
+
+    with vector_db.bulk_writer(batch_size=100) as writer:
+        writer.upsert(["a", "b"], [[1.0, 0.0], [0.0, 1.0]], ["A", "B"], [{"n": 1}, {"n": 2}])
+        writer.delete(["b"])
+        writer.upsert(["c"], [[1.0, 1.0]], ["C"], [{"n": 3}])
+        writer.on_flush(lambda: flushed.append(vector_db.get_collection_count()))
+        assert vector_db.get_collection_count() == 0
+
+    assert flushed == [2]
+    assert sorted(vector_db.collection.get()["ids"]) == ["a", "c"]
+
+
+def test_vector_search_accepts_arrays_and_lists(tmp_path):
+    """float32 배열과 float 리스트를 같은 벡터로 저장하고 검색하는지 테스트"""
+    np = pytest.importorskip("numpy")
+    vector_db = VectorSearch(persist_directory=str(tmp_path / "chroma"), collection_name="test")
+    vectors = np.array([[1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.6, 0.8, 0.0]], dtype=np.float32)
+
+    with vector_db.bulk_writer() as writer:
+        writer.upsert(["a", "b"], vectors[:2], ["A", "B"], [{"n": 1}, {"n": 2}])
+        writer.upsert(["c"], vectors[2:].tolist(), ["C"], [{"n": 3}])
+
+    stored = vector_db.collection.get(ids=["a", "b", "c"], include=["embeddings"])
+    found = dict(zip(stored["ids"], stored["embeddings"]))
+    for chunk_id, vector in zip(["a", "b", "c"], vectors):
+        np.testing.assert_allclose(found[chunk_id], vector, atol=1e-6)
+
+    by_array = vector_db.search(np.array([0.0, 1.0, 0.0], dtype=np.float32), top_k=2)
+    by_list = vector_db.search([0.0, 1.0, 0.0], top_k=2)
+    assert by_array["ids"] == by_list["ids"] == [["b", "c"]]
+
+
+def test_index_folder_reports_stage_timing(service, tmp_path):
+    """단계별 시간/처리량이 통계에 포함되는지 테스트"""
+    _make_docs(tmp_path / "docs")
+
+    stats = service.index_folder(tmp_path / "docs", collection_name="test", show_progress=False)
+    timing = stats["timing"]
+
+    assert {"scan", "parse.txt", "embed", "write"} <= set(timing["stages"])
+    assert timing["stages"]["scan"]["items"] == 6
+    assert timing["stages"]["parse.txt"]["items"] == stats["total_chunks"]
+    assert timing["stages"]["embed"]["items"] == stats["total_chunks"]
+    assert timing["bytes_read"] == sum(p.stat().st_size for p in (tmp_path / "docs").iterdir())
+    assert len(timing["slowest_files"]) == 6
+
+
+def test_quarantined_file_is_skipped_until_changed(tmp_path):
+    """시간 예산을 넘긴 파일이 격리되어 다음 실행에서 건너뛰고, 바뀌면 다시 시도되는지 테스트"""
+    from tests.test_supervisor import HangingParser
+
+    docs = tmp_path / "docs"
+    _make_docs(docs, count=2)
+    hang = docs / "hang.txt"
+    hang.write_text("HANG 멈추는 문서 " * 20, encoding="utf-8")
+
+    vector_db = VectorSearch(persist_directory=str(tmp_path / "chroma"), collection_name="test")
+    service = IndexingService(
+        HangingParser(chunk_size=64, chunk_overlap=8), FakeEmbedder(), vector_db, parse_timeout=1.0
+    )
+
+    stats = service.index_folder(docs, collection_name="test", show_progress=False)
+    assert stats["errors"] == 1
+    assert stats["error_files"][0]["path"] == str(hang)
+    assert "timed out" in stats["error_files"][0]["reason"]
+    assert vector_db.get_collection_count() == stats["total_chunks"] > 0
+
+    stats = service.index_folder(docs, collection_name="test", show_progress=False)
+    assert stats["quarantined_files"] == 1
+    assert stats["errors"] == 0
+
+    # 파일이 바뀌면 격리가 풀려 다시 인덱싱
+    hang.write_text("고친 문서 " * 30, encoding="utf-8")
+    stats = service.index_folder(docs, collection_name="test", show_progress=False)
+    assert stats["quarantined_files"] == 0
+    assert stats["errors"] == 0
+    assert stats["total_chunks"] > 0
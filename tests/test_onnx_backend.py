@@ -0,0 +1,49 @@
+"""ONNX 임베딩 백엔드 테스트 - 작은 임의 모델을 오프라인으로 만들어 torch 경로와 비교"""
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("torch")
+pytest.importorskip("onnx")
+pytest.importorskip("onnxruntime")
+pytest.importorskip("sentence_transformers")
+
+from src.core.embedder import EmbeddingEngine
+from src.core.onnx_backend import cosine_parity, onnx_model_dir
+
+TEXTS = ["w1 w2 w3 가 나", "w10 w11", "다 라 마 w5 w6 w7 w8 w9", "w0"]
+
+
+def test_onnx_matches_torch(tiny_model_path, tmp_path):
+    """ONNX fp32 임베딩이 torch와 같고, int8도 코사인이 거의 같은지 테스트"""
+    torch_engine = EmbeddingEngine(model_name=tiny_model_path, batch_size=2)
+    onnx_engine = EmbeddingEngine(model_name=tiny_model_path, batch_size=2, backend="onnx", onnx_dir=str(tmp_path))
+    int8_engine = EmbeddingEngine(
+        model_name=tiny_model_path, batch_size=2, backend="onnx", quantize=True, onnx_dir=str(tmp_path)
+    )
+
+    expected = np.array(torch_engine.embed(TEXTS))
+
+    assert onnx_engine.backend == "onnx"
+    assert (onnx_model_dir(tiny_model_path, str(tmp_path)) / "model_int8.onnx").exists()
+    assert cosine_parity(expected, np.array(onnx_engine.embed(TEXTS))).min() > 0.99999
+    assert cosine_parity(expected, np.array(int8_engine.embed(TEXTS))).min() > 0.99
+    assert np.allclose(onnx_engine.embed_query("w1 가"), torch_engine.embed_query("w1 가"), atol=1e-5)
+    assert onnx_engine.get_dimension() == torch_engine.get_dimension() == 32
+    assert onnx_engine.max_chunk_tokens() == torch_engine.max_chunk_tokens()
+    # int8 결과는 캐시에서 fp32 결과와 섞이지 않음
+    assert onnx_engine.cache_name == tiny_model_path
+    assert int8_engine.cache_name != tiny_model_path
+
+
+def test_onnx_failure_falls_back_to_torch(tiny_model_path, tmp_path, monkeypatch):
+    """ONNX 모델을 쓸 수 없으면 torch 백엔드로 대체하는지 테스트"""
+    import src.core.onnx_backend as onnx_backend
+
+    def unavailable(*args, **kwargs):
+        raise ImportError("onnxruntime is not installed")
+
+    monkeypatch.setattr(onnx_backend, "load_onnx_encoder", unavailable)
+    engine = EmbeddingEngine(model_name=tiny_model_path, backend="onnx", onnx_dir=str(tmp_path))
+
+    assert engine.backend == "torch"
+    assert len(engine.embed_query("w1")) == 32
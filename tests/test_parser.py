@@ -1,7 +1,9 @@
 """문서 파서 테스트"""
+import codecs
 import pytest
 from pathlib import Path
 from src.core.parser import DocumentParser, DocumentChunk
+from src.core.text_reader import iter_text_windows
 
 
 def test_parser_initialization():
@@ -32,6 +34,260 @@ def test_split_text():
     assert all(isinstance(chunk, str) for chunk in chunks)
 
 
+def test_split_stream_matches_split_text():
+    """조각 단위 분할이 전체 텍스트 분할과 같은 결과인지 테스트"""
+    parser = DocumentParser(chunk_size=40, chunk_overlap=8)
+    lines = [f"{i}번째 단락입니다. 내용이 조금 깁니다." * (i % 3 + 1) for i in range(50)]
+    
+    streamed = list(parser._split_stream(parser._join_lines(lines)))
+    
+    assert streamed == parser._split_text("\n".join(lines))
+
+
+def test_iter_chunks_is_lazy(tmp_path):
+    """iter_chunks가 청크를 하나씩 생성하고 parse와 같은 결과인지 테스트"""
+    file_path = tmp_path / "memo.txt"
+    file_path.write_text("긴 회의록 문장입니다. " * 200, encoding="utf-8")
+    parser = DocumentParser(chunk_size=64, chunk_overlap=8)
+    
+    iterator = parser.iter_chunks(file_path)
+    first = next(iterator)
+    
+    assert isinstance(first, DocumentChunk)
+    assert first.metadata["chunk_index"] == 0
+    assert [first] + list(iterator) == parser.parse(file_path)
+
+
+def _write_pdf(file_path: Path, pages: int):
+    """페이지마다 한 줄의 텍스트가 있는 최소 PDF 생성"""
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for page_num in range(1, pages + 1):
+        content = f"BT /F1 12 Tf 72 720 Td (Page {page_num} of the regulation text) Tj ET"
+        objects.append(f"<< /Length {len(content)} >>\nstream\n{content}\nendstream")
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>"
+        )
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {pages} >>"
+
+    data = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(data))
+        data += f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1")
+    xref = len(data)
+    data += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("latin-1")
+    data += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode("latin-1")
+    data += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode("latin-1")
+    file_path.write_bytes(data)
+
+
+def test_parallel_pdf_matches_sequential(tmp_path):
+    """페이지 범위 병렬 추출이 순차 추출과 같은 청크/순서/메타데이터인지 테스트"""
+    pytest.importorskip("pypdf")
+    file_path = tmp_path / "regulation.pdf"
+    _write_pdf(file_path, pages=40)
+
+    sequential = DocumentParser(chunk_size=64, chunk_overlap=8, pdf_parallel_pages=0).parse(file_path)
+    parallel_parser = DocumentParser(chunk_size=64, chunk_overlap=8, pdf_parallel_pages=20, pdf_workers=2)
+
+    assert parallel_parser._pdf_worker_count(40) == 2
+    assert parallel_parser.parse(file_path) == sequential
+    assert [chunk.page for chunk in sequential] == list(range(1, 41))
+    assert sequential[-1].metadata["total_pages"] == 40
+
+
+def test_pdf_backend_falls_back_to_pypdf(tmp_path):
+    """백엔드가 도중에 실패하면 실패한 페이지부터 pypdf로 이어서 추출하는지 테스트"""
+    pytest.importorskip("pypdf")
+    from src.core.pdf_backends import PdfBackend, PypdfBackend, iter_pdf_pages
+
+    class BrokenBackend(PdfBackend):
+        """3페이지에서 실패하는 백엔드 (정상 페이지는 대문자로 돌려줘 구분)"""
+        name = "broken"
+
+        def iter_pages(self, file_path, start=0, end=None):
+            for page_num, text in PypdfBackend().iter_pages(file_path, start, end):
+                if page_num == 3:
+                    raise RuntimeError("corrupt page")
+                yield page_num, text.upper()
+
+    file_path = tmp_path / "broken.pdf"
+    _write_pdf(file_path, pages=5)
+
+    pages = list(iter_pdf_pages(BrokenBackend(), file_path))
+
+    assert [page_num for page_num, _ in pages] == [1, 2, 3, 4, 5]
+    assert pages[0][1].isupper() and not pages[2][1].isupper()
+
+
+def _write_hwpx(file_path: Path, sections):
+    """섹션별 단락 XML 조각으로 최소 HWPX(zip) 생성"""
+    import zipfile
+
+    with zipfile.ZipFile(file_path, "w") as z:
+        for index, body in enumerate(sections):
+            z.writestr(
+                f"Contents/section{index}.xml",
+                '<hs:sec xmlns:hs="http://www.hancom.co.kr/hwpml/2011/section" '
+                'xmlns:hp="http://www.hancom.co.kr/hwpml/2011/paragraph">' + body + "</hs:sec>"
+            )
+
+
+def test_hwpx_streams_paragraphs_in_order(tmp_path):
+    """HWPX 단락이 문서 순서대로(표 안 단락, section10 포함) 단락 경계를 유지하며 추출되는지 테스트"""
+    pytest.importorskip("lxml")
+    table = (
+        '<hp:p><hp:run><hp:t>표 앞 문장</hp:t><hp:tbl><hp:tc><hp:subList>'
+        '<hp:p><hp:run><hp:t>셀 </hp:t><hp:t>내용</hp:t></hp:run></hp:p>'
+        '</hp:subList></hp:tc></hp:tbl><hp:t>표 뒤 문장</hp:t></hp:run></hp:p>'
+    )
+    sections = [f"<hp:p><hp:run><hp:t>섹션 {i} 본문</hp:t></hp:run></hp:p>" for i in range(11)]
+    sections[0] += table + "<hp:p><hp:run><hp:t>   </hp:t></hp:run></hp:p>"
+    file_path = tmp_path / "report.hwpx"
+    _write_hwpx(file_path, sections)
+
+    parser = DocumentParser(chunk_size=2000, chunk_overlap=0)
+    chunks = parser.parse(file_path)
+
+    expected = ["섹션 0 본문", "표 앞 문장", "셀 내용", "표 뒤 문장"] + [f"섹션 {i} 본문" for i in range(1, 11)]
+    assert len(chunks) == 1
+    assert chunks[0].text == "\n".join(expected)
+
+
+def test_xlsx_row_windows_repeat_header(tmp_path):
+    """XLSX를 행 묶음으로 나누고 각 청크에 머리글을 반복하는지 테스트"""
+    openpyxl = pytest.importorskip("openpyxl")
+    wb = openpyxl.Workbook()
+    sheet = wb.active
+    sheet.title = "예산"
+    sheet.append(["부서", "항목", "금액"])
+    for i in range(30):
+        sheet.append([f"부서{i}", "출장비", i * 1000])
+    sheet.append([None, None, None])
+    sheet.append(["합계", None, 435000])
+    file_path = tmp_path / "budget.xlsx"
+    wb.save(file_path)
+
+    chunks = DocumentParser(chunk_size=120, chunk_overlap=10).parse(file_path)
+
+    assert len(chunks) > 1
+    assert all(len(chunk.text) <= 120 for chunk in chunks)
+    assert all(chunk.text.startswith("부서 | 항목 | 금액\n") for chunk in chunks)
+    # 행이 잘리거나 중복되지 않음
+    rows = [line for chunk in chunks for line in chunk.text.split("\n")[1:]]
+    assert rows == [f"부서{i} | 출장비 | {i * 1000}" for i in range(30)] + ["합계 | 435000"]
+    assert chunks[0].metadata["row_start"] == 1
+    assert chunks[-1].metadata["row_end"] == 33
+    assert chunks[-1].metadata["sheet_name"] == "예산"
+
+
+def test_docx_fast_path_includes_tables_and_headers(tmp_path):
+    """DOCX 빠른 추출이 본문 순서대로 표 셀과 머리글까지 읽고, 본문은 python-docx와 같은지 테스트"""
+    docx = pytest.importorskip("docx")
+    document = docx.Document()
+    document.sections[0].header.paragraphs[0].text = "사내 대외비"
+    document.add_paragraph("첫 번째 단락")
+    table = document.add_table(rows=2, cols=2)
+    for r, row in enumerate(table.rows):
+        for c, cell in enumerate(row.cells):
+            cell.text = f"셀 {r}-{c}"
+    document.add_paragraph("마지막 단락")
+    file_path = tmp_path / "memo.docx"
+    document.save(file_path)
+
+    parser = DocumentParser(chunk_size=2000, chunk_overlap=0)
+    fast = parser.parse(file_path)
+    library = DocumentParser(chunk_size=2000, chunk_overlap=0, ooxml_fast_path=False).parse(file_path)
+
+    assert fast[0].text.split("\n") == [
+        "사내 대외비", "첫 번째 단락", "셀 0-0", "셀 0-1", "셀 1-0", "셀 1-1", "마지막 단락"
+    ]
+    assert library[0].text == "첫 번째 단락\n마지막 단락"
+    assert fast[0].metadata == library[0].metadata
+
+
+def test_pptx_fast_path_follows_slide_order(tmp_path):
+    """PPTX 빠른 추출이 파일 이름이 아니라 발표 순서를 따르고 표 셀을 포함하는지 테스트"""
+    pptx = pytest.importorskip("pptx")
+    from pptx.util import Inches
+
+    prs = pptx.Presentation()
+    for title in ["첫 슬라이드", "둘째 슬라이드"]:
+        slide = prs.slides.add_slide(prs.slide_layouts[5])
+        slide.shapes.title.text = title
+    table = prs.slides[1].shapes.add_table(1, 2, Inches(1), Inches(2), Inches(4), Inches(1)).table
+    table.cell(0, 0).text = "항목"
+    table.cell(0, 1).text = "값"
+    # 둘째 슬라이드를 앞으로 이동 (slide2.xml이 먼저 발표됨)
+    slide_ids = prs.slides._sldIdLst
+    slide_ids.insert(0, slide_ids[1])
+    file_path = tmp_path / "deck.pptx"
+    prs.save(file_path)
+
+    chunks = DocumentParser(chunk_size=2000, chunk_overlap=0).parse(file_path)
+
+    assert [chunk.text for chunk in chunks] == ["둘째 슬라이드\n항목\n값", "첫 슬라이드"]
+    assert [chunk.metadata["slide"] for chunk in chunks] == [1, 2]
+    assert chunks[0].metadata["total_slides"] == 2
+
+
+def test_ooxml_fast_path_falls_back_to_library(tmp_path):
+    """빠른 추출이 처음부터 실패하면 라이브러리 파서로 다시 파싱하는지 테스트"""
+    parser = DocumentParser()
+    calls = []
+
+    def broken(file_path):
+        calls.append("fast")
+        raise KeyError("word/document.xml")
+        yield  # pragma: no cover
+
+    def library(file_path):
+        calls.append("library")
+        yield "chunk"
+
+    assert list(parser._with_fallback(tmp_path / "x.docx", broken, library)) == ["chunk"]
+    assert calls == ["fast", "library"]
+
+
+def test_text_windows_match_full_decode(tmp_path):
+    """cp949 텍스트를 작은 구간으로 나눠 읽어도 전체를 한 번에 읽은 것과 같은 청크인지 테스트"""
+    text = "".join(f"{i}번째 줄입니다. 회의록 내용\r\n" for i in range(500))
+    file_path = tmp_path / "log.txt"
+    file_path.write_bytes(text.encode("cp949"))
+    parser = DocumentParser(chunk_size=64, chunk_overlap=8)
+
+    # 구간 경계가 2바이트 문자와 \r\n 사이에 걸리도록 홀수 크기 사용
+    windows = list(iter_text_windows(file_path, window_bytes=1001, sample_bytes=257))
+
+    assert len(windows) > 5
+    assert "".join(windows) == text.replace("\r\n", "\n")
+    assert parser.parse(file_path) == list(parser._make_chunks(file_path, "txt", parser._split_text("".join(windows))))
+
+
+def test_text_switches_encoding_after_ascii_prefix(tmp_path):
+    """앞부분이 ASCII뿐인 cp949 파일을 UTF-8로 추정했다가 뒤에서 cp949로 바꿔 읽는지 테스트"""
+    text = "2024-01-01 INFO started\n" * 100 + "한글 로그 메시지\n"
+    file_path = tmp_path / "server.log.txt"
+    file_path.write_bytes(text.encode("cp949"))
+
+    assert "".join(iter_text_windows(file_path, window_bytes=512, sample_bytes=128)) == text
+
+
+def test_text_strips_bom_and_rejects_binary(tmp_path):
+    """UTF-8 BOM은 제외하고, 어떤 인코딩으로도 읽을 수 없는 파일은 ValueError"""
+    bom = tmp_path / "bom.md"
+    bom.write_bytes(codecs.BOM_UTF8 + "# 제목\n본문".encode("utf-8"))
+    binary = tmp_path / "binary.txt"
+    binary.write_bytes(b"\x80\xff" * 100)
+
+    assert "".join(iter_text_windows(bom)) == "# 제목\n본문"
+    with pytest.raises(ValueError):
+        DocumentParser().parse(binary)
+
+
 # 실제 파일 테스트는 테스트 문서가 필요
 # TODO: 테스트용 샘플 문서 추가
 
@@ -0,0 +1,66 @@
+"""폴더 스캐너 테스트"""
+from pathlib import Path
+
+from src.services.scanner import FolderScanner
+
+
+def _touch(path: Path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("내용", encoding="utf-8")
+
+
+def test_iter_files_filters_and_orders(tmp_path):
+    """지원 형식만, 제외 패턴/숨김 항목 없이, 항상 같은 순서로 찾는지 테스트"""
+    for name in [
+        "b.txt", "a.md", "image.png", "~$보고서.docx", "old.bak",
+        "sub/c.pdf", "sub/deeper/d.txt",
+        ".git/e.txt", "node_modules/f.md", "backup/g.txt", ".hidden/h.txt", ".secret.txt",
+    ]:
+        _touch(tmp_path / name)
+
+    files = [p.relative_to(tmp_path).as_posix() for p in FolderScanner().iter_files(tmp_path)]
+
+    assert files == ["a.md", "b.txt", "sub/c.pdf", "sub/deeper/d.txt"]
+
+
+def test_iter_files_is_lazy_and_non_recursive(tmp_path):
+    """생성기로 동작하고 recursive=False면 하위 폴더를 보지 않는지 테스트"""
+    _touch(tmp_path / "a.txt")
+    _touch(tmp_path / "sub" / "b.txt")
+    scanner = FolderScanner()
+
+    iterator = scanner.iter_files(tmp_path)
+    assert next(iterator).name == "a.txt"
+
+    assert [p.name for p in scanner.iter_files(tmp_path, recursive=False)] == ["a.txt"]
+
+
+def test_custom_patterns(tmp_path):
+    """포함 패턴과 상대 경로 제외 패턴 테스트"""
+    for name in ["회의록_1.txt", "메모.txt", "archive/회의록_2.txt", "keep/회의록_3.txt"]:
+        _touch(tmp_path / name)
+    scanner = FolderScanner(include=["회의록*"], exclude=["archive/*"], skip_hidden=False)
+
+    files = sorted(p.name for p in scanner.iter_files(tmp_path))
+
+    assert files == ["회의록_1.txt", "회의록_3.txt"]
+    assert scanner.accepts(tmp_path / "keep" / "회의록_4.txt", tmp_path)
+    assert not scanner.accepts(tmp_path / "archive" / "회의록_4.txt", tmp_path)
+    assert not FolderScanner().accepts(tmp_path / "~$보고서.docx", tmp_path)
+
+
+def test_cli_scanner_merges_config_and_options(tmp_path, monkeypatch):
+    """CLI가 설정 파일과 명령행 패턴을 합쳐 스캐너를 만드는지 테스트"""
+    import copy
+
+    from src.cli.main import _create_scanner
+    from src.utils.config import Config
+
+    # Config는 기본값을 얕은 복사하므로 set()이 다른 테스트로 새지 않도록 격리
+    monkeypatch.setattr(Config, "DEFAULT_CONFIG", copy.deepcopy(Config.DEFAULT_CONFIG))
+    config = Config(tmp_path / "config.yaml")
+    config.set("scan.exclude", ["archive/*"])
+    scanner = _create_scanner(config, include=("회의록*",), exclude=("*.md",))
+
+    assert "archive/*" in scanner.exclude and "*.md" in scanner.exclude and "*.bak" in scanner.exclude
+    assert scanner.include == ["회의록*"]
@@ -0,0 +1,67 @@
+"""CLI 시작 시간 테스트 - 임베딩/벡터 DB를 쓰지 않는 명령어는 무거운 라이브러리를 import하지 않음"""
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# 임베딩 모델/벡터 DB를 열 때만 필요한 라이브러리
+HEAVY_MODULES = ["torch", "sentence_transformers", "transformers", "chromadb"]
+
+# import src.cli.main과 version 명령 실행에 허용하는 시간 (인터프리터 시작 포함, 초)
+# 지연 import 전에는 torch 때문에 6초 이상 걸렸음
+STARTUP_BUDGET = 3.0
+
+
+def _run(code: str) -> dict:
+    """새 인터프리터에서 code를 실행하고 마지막 줄의 JSON 결과 반환"""
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        timeout=120,
+        check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_cli_import_skips_heavy_modules():
+    """CLI와 서비스 패키지를 import해도 torch/chromadb가 로드되지 않는지 테스트"""
+    loaded = _run(
+        "import json, sys\n"
+        "import src.cli.main\n"
+        "from src.services import ManagementService, IndexingService\n"
+        "from src.core import DocumentParser, EmbeddingEngine, VectorSearch\n"
+        f"print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))\n"
+    )
+
+    assert loaded == []
+
+
+def test_version_command_within_budget():
+    """version 명령이 시작 시간 예산 안에 끝나는지 테스트"""
+    started = time.perf_counter()
+    result = _run(
+        "import json, sys, io, contextlib\n"
+        "from src.cli.main import cli\n"
+        "with contextlib.redirect_stdout(io.StringIO()):\n"
+        "    cli(['version'], obj={}, standalone_mode=False)\n"
+        f"print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))\n"
+    )
+    elapsed = time.perf_counter() - started
+
+    assert result == []
+    assert elapsed < STARTUP_BUDGET, f"version took {elapsed:.2f}s (budget {STARTUP_BUDGET}s)"
+
+
+def test_unknown_export_raises_attribute_error():
+    """지연 import 패키지에 없는 이름은 AttributeError"""
+    import src.core
+
+    with pytest.raises(AttributeError):
+        src.core.NoSuchClass
@@ -0,0 +1,115 @@
+"""파싱 감독기 테스트"""
+import time
+from pathlib import Path
+
+import pytest
+
+from src.core.parser import DocumentParser
+from src.services.supervisor import ParseSupervisor
+
+
+class HangingParser(DocumentParser):
+    """내용이 HANG으로 시작하는 파일에서 멈추는 테스트용 파서"""
+
+    def iter_chunks(self, file_path: Path, content_hash=None):
+        if Path(file_path).read_text(encoding="utf-8").startswith("HANG"):
+            time.sleep(60)
+        yield from super().iter_chunks(file_path)
+
+
+class TricklingParser(DocumentParser):
+    """내용이 TRICKLE로 시작하는 파일에서 청크를 조금씩 끝없이 내는 테스트용 파서"""
+
+    def iter_chunks(self, file_path: Path, content_hash=None):
+        if Path(file_path).read_text(encoding="utf-8").startswith("TRICKLE"):
+            while True:
+                time.sleep(0.3)
+                yield from super().iter_chunks(file_path)
+        yield from super().iter_chunks(file_path)
+
+
+def _collect(events):
+    """파일별 청크 수와 실패 이벤트 정리"""
+    counts, errors = {}, {}
+    for event in events:
+        name = Path(event.file_path).name
+        if event.error is not None:
+            errors[name] = event.error
+        else:
+            counts[name] = counts.get(name, 0) + len(event.chunks)
+    return counts, errors
+
+
+def test_supervisor_streams_chunks(tmp_path):
+    """워커가 청크를 batch_size개씩 보내고 결과가 parse와 같은지 테스트"""
+    file_path = tmp_path / "memo.txt"
+    file_path.write_text("긴 회의록 문장입니다. " * 200, encoding="utf-8")
+    parser = DocumentParser(chunk_size=64, chunk_overlap=8)
+
+    events = list(ParseSupervisor(parser, batch_size=4).run([file_path]))
+
+    assert all(len(event.chunks) <= 4 for event in events)
+    assert events[-1].final and events[-1].count == len(parser.parse(file_path))
+    assert [chunk for event in events for chunk in event.chunks] == parser.parse(file_path)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_supervisor_kills_hanging_file(tmp_path, workers):
+    """시간 예산을 넘긴 파일만 실패하고 워커를 교체해 나머지 파일을 계속 파싱하는지 테스트"""
+    files = []
+    for name in ["a.txt", "hang.txt", "b.txt", "c.txt"]:
+        file_path = tmp_path / name
+        prefix = "HANG " if name.startswith("hang") else ""
+        file_path.write_text(prefix + f"{name} 내용입니다. " * 20, encoding="utf-8")
+        files.append(file_path)
+
+    supervisor = ParseSupervisor(HangingParser(chunk_size=64, chunk_overlap=8), workers=workers, timeout=1.0)
+    started = time.monotonic()
+    counts, errors = _collect(supervisor.run(files))
+
+    assert time.monotonic() - started < 30
+    assert set(errors) == {"hang.txt"}
+    assert errors["hang.txt"].quarantine
+    assert "timed out" in str(errors["hang.txt"])
+    assert set(counts) == {"a.txt", "b.txt", "c.txt"}
+    assert supervisor.restarts == 1
+
+
+def test_supervisor_reports_parser_errors(tmp_path):
+    """파서 예외는 격리 대상이 아닌 실패로 전달되는지 테스트"""
+    file_path = tmp_path / "broken.pdf"
+    file_path.write_bytes(b"not a pdf")
+
+    counts, errors = _collect(ParseSupervisor(DocumentParser()).run([file_path]))
+
+    assert not errors["broken.pdf"].quarantine
+
+
+def test_supervisor_times_out_trickling_file(tmp_path):
+    """결과를 계속 조금씩 보내는 파일도 시간 예산을 넘기면 격리되는지 테스트"""
+    file_path = tmp_path / "trickle.txt"
+    file_path.write_text("TRICKLE 느린 문서", encoding="utf-8")
+
+    supervisor = ParseSupervisor(TricklingParser(chunk_size=64, chunk_overlap=8), timeout=1.0, batch_size=1)
+    started = time.monotonic()
+    counts, errors = _collect(supervisor.run([file_path]))
+
+    assert time.monotonic() - started < 10
+    assert counts["trickle.txt"] > 0
+    assert errors["trickle.txt"].quarantine and "timed out" in str(errors["trickle.txt"])
+
+
+def test_supervisor_excludes_consumer_backpressure(tmp_path):
+    """소비자가 느려 워커가 결과를 보내지 못하고 기다린 시간은 시간 예산에 넣지 않는지 테스트"""
+    file_path = tmp_path / "large.txt"
+    file_path.write_text("긴 회의록 문장입니다. " * 8000, encoding="utf-8")
+    parser = DocumentParser(chunk_size=2000, chunk_overlap=0)
+
+    events = []
+    for event in ParseSupervisor(parser, timeout=1.0, batch_size=2).run([file_path]):
+        events.append(event)
+        time.sleep(0.15)
+
+    assert all(event.error is None for event in events)
+    assert len(events) * 0.15 > 1.0
+    assert events[-1].final and events[-1].count == len(parser.parse(file_path))
@@ -0,0 +1,173 @@
+"""파싱 텍스트 캐시 테스트"""
+import os
+
+import pytest
+
+from src.core.parser import DocumentParser
+from src.core.text_cache import TextCache
+
+
+def _write_xlsx(file_path, rows: int):
+    openpyxl = pytest.importorskip("openpyxl")
+    wb = openpyxl.Workbook()
+    sheet = wb.active
+    sheet.title = "예산"
+    sheet.append(["부서", "항목", "금액"])
+    for i in range(rows):
+        sheet.append([f"부서{i}", "출장비", i * 1000])
+    wb.create_sheet("비고").append(["작성자", "총무팀"])
+    wb.save(file_path)
+
+
+def test_rechunk_from_cache_without_extracting(tmp_path, monkeypatch):
+    """캐시된 텍스트로 다른 청크 크기로 다시 분할해도 새로 파싱한 결과와 같은지 테스트"""
+    file_path = tmp_path / "budget.xlsx"
+    _write_xlsx(file_path, rows=40)
+    cache = TextCache(directory=str(tmp_path / "parsed"), max_size_mb=1)
+
+    DocumentParser(chunk_size=120, chunk_overlap=10, text_cache=cache).parse(file_path)
+    assert cache.stats()["entries"] == 1
+
+    # 두 번째 파싱은 문서를 열지 않아야 함
+    def fail(self, path):
+        raise AssertionError("extracted again")
+        yield  # pragma: no cover
+
+    expected = DocumentParser(chunk_size=300, chunk_overlap=10).parse(file_path)
+    monkeypatch.setattr(DocumentParser, "_extract_xlsx", fail)
+    cached = DocumentParser(chunk_size=300, chunk_overlap=10, text_cache=cache).parse(file_path)
+
+    assert cached == expected
+    assert {chunk.metadata["sheet_name"] for chunk in cached} == {"예산", "비고"}
+    assert cache.hits == 1
+
+
+def test_key_depends_on_content_and_variant(tmp_path):
+    """키가 경로가 아니라 내용과 추출 방식으로 정해지는지 테스트"""
+    first = tmp_path / "a.docx"
+    second = tmp_path / "b.docx"
+    first.write_bytes(b"same content")
+    second.write_bytes(b"same content")
+
+    def key(path, variant):
+        return TextCache.make_key(TextCache.hash_file(path), variant)
+
+    assert key(first, "docx:fast") == key(second, "docx:fast")
+    assert key(first, "docx:fast") != key(first, "docx:library")
+
+    second.write_bytes(b"changed content")
+    assert key(first, "docx:fast") != key(second, "docx:fast")
+
+
+def test_given_content_hash_is_not_recomputed(tmp_path, monkeypatch):
+    """이미 계산한 내용 해시를 넘기면 파일을 다시 해시하지 않고 같은 캐시 항목을 쓰는지 테스트"""
+    file_path = tmp_path / "budget.xlsx"
+    _write_xlsx(file_path, rows=10)
+    cache = TextCache(directory=str(tmp_path / "parsed"), max_size_mb=1)
+    content_hash = TextCache.hash_file(file_path)
+
+    def fail(path):
+        raise AssertionError("hashed again")
+
+    monkeypatch.setattr(TextCache, "hash_file", fail)
+    parser = DocumentParser(chunk_size=120, chunk_overlap=10, text_cache=cache)
+    first = list(parser.iter_chunks(file_path, content_hash))
+    second = list(parser.iter_chunks(file_path, content_hash))
+
+    assert first == second
+    assert cache.hits == 1 and cache.misses == 1
+
+
+def test_index_folder_hashes_each_file_once(tmp_path, monkeypatch):
+    """인덱싱할 때 매니페스트가 계산한 해시를 텍스트 캐시 키로 재사용하는지 테스트"""
+    pytest.importorskip("chromadb")
+    from src.core.vector_search import VectorSearch
+    from src.services import indexing
+
+    class FakeEmbedder:
+        model_name = "fake"
+        batch_size = 8
+
+        def embed_documents(self, texts):
+            return [[float(len(text)), 1.0, 0.0] for text in texts]
+
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    for i in range(3):
+        _write_xlsx(docs / f"budget_{i}.xlsx", rows=10 + i)
+    hashed = []
+    hash_file = indexing.hash_file
+
+    def counting_hash(path):
+        hashed.append(path.name)
+        return hash_file(path)
+
+    def fail(path):
+        raise AssertionError("hashed by the text cache")
+
+    monkeypatch.setattr(indexing, "hash_file", counting_hash)
+    monkeypatch.setattr(TextCache, "hash_file", fail)
+    cache = TextCache(directory=str(tmp_path / "parsed"), max_size_mb=1)
+    parser = DocumentParser(chunk_size=120, chunk_overlap=10, text_cache=cache)
+    vector_db = VectorSearch(persist_directory=str(tmp_path / "chroma"), collection_name="test")
+    service = indexing.IndexingService(parser, FakeEmbedder(), vector_db)
+
+    stats = service.index_folder(docs, collection_name="test", show_progress=False)
+
+    assert stats["errors"] == 0
+    assert sorted(hashed) == ["budget_0.xlsx", "budget_1.xlsx", "budget_2.xlsx"]
+    assert cache.stats()["entries"] == 3
+
+
+def test_fallback_extraction_is_not_stored(tmp_path):
+    """대체 추출기로 바뀐 결과는 요청한 추출 방식의 캐시에 저장하지 않는지 테스트"""
+    file_path = tmp_path / "report.docx"
+    file_path.write_bytes(b"not really a docx")
+    cache = TextCache(directory=str(tmp_path / "parsed"), max_size_mb=1)
+    parser = DocumentParser(text_cache=cache)
+
+    def extract(path, on_fallback):
+        yield "fast"
+        on_fallback()
+        yield "library 1"
+        yield "library 2"
+
+    records = list(parser._extract(file_path, None, "docx:fast", extract))
+
+    assert records == ["fast", "library 1", "library 2"]
+    assert cache.stats()["entries"] == 0
+    assert not list((tmp_path / "parsed").rglob("*.tmp"))
+
+
+def test_interrupted_extraction_is_not_stored(tmp_path):
+    """중간에 멈춘 추출 결과는 캐시에 남지 않는지 테스트"""
+    file_path = tmp_path / "budget.xlsx"
+    _write_xlsx(file_path, rows=40)
+    cache = TextCache(directory=str(tmp_path / "parsed"), max_size_mb=1)
+
+    chunks = DocumentParser(chunk_size=60, chunk_overlap=0, text_cache=cache).iter_chunks(file_path)
+    next(chunks)
+    chunks.close()
+
+    assert cache.stats()["entries"] == 0
+    assert not list((tmp_path / "parsed").rglob("*.tmp"))
+
+
+def test_prune_keeps_recently_read(tmp_path):
+    """크기 제한을 넘으면 오래 읽지 않은 항목부터 제거"""
+    cache = TextCache(directory=str(tmp_path), max_size_mb=1)
+    for i in range(3):
+        with cache.writer(f"{i:02d}key") as write:
+            write([i, os.urandom(4096).hex()])
+    # 가장 먼저 쓴 항목을 최근에 읽은 것으로 만들고 나머지는 오래된 것으로 설정
+    for i, age in [(1, 300), (2, 200)]:
+        path = cache._path(f"{i:02d}key")
+        os.utime(path, (path.stat().st_atime - age, path.stat().st_mtime - age))
+    assert cache.read("00key") is not None
+
+    keep = sum(cache._path(key).stat().st_size for key in ["00key", "02key"])
+    removed = cache.prune(max_bytes=keep)
+
+    assert removed == 1
+    assert cache.read("01key") is None
+    assert list(cache.read("00key"))[0][0] == 0
@@ -0,0 +1,73 @@
+"""폴더 감시 서비스 테스트"""
+import time
+import pytest
+from pathlib import Path
+
+pytest.importorskip("chromadb")
+
+from src.core.parser import DocumentParser
+from src.core.vector_search import VectorSearch
+from src.services.indexing import IndexingService
+from src.services.watcher import (
+    CHANGED, DELETED, EventDebouncer, PollingWatcher, WatchService, create_watcher
+)
+from tests.test_indexing import FakeEmbedder
+
+
+def test_debouncer_keeps_last_event():
+    """같은 경로의 이벤트는 조용해진 뒤 마지막 것만 나옴"""
+    debouncer = EventDebouncer(delay=0.05)
+    path = Path("a.txt")
+    debouncer.add(CHANGED, path)
+    debouncer.add(DELETED, path)
+
+    assert debouncer.pop_ready() == []
+    time.sleep(0.06)
+    assert debouncer.pop_ready() == [(DELETED, path)]
+    assert debouncer.next_due() is None
+
+
+@pytest.mark.parametrize("use_polling", [True, False])
+def test_watcher_reports_changes(tmp_path, use_polling):
+    """파일 생성/삭제 이벤트 감지"""
+    watcher = create_watcher(tmp_path, use_polling=use_polling, poll_interval=0.05)
+    try:
+        (tmp_path / "new.txt").write_text("새 공문", encoding="utf-8")
+        (tmp_path / "ignored.bin").write_bytes(b"\0")
+        events = []
+        deadline = time.monotonic() + 2
+        while (CHANGED, tmp_path / "new.txt") not in events and time.monotonic() < deadline:
+            events += watcher.poll(0.1)
+        assert (CHANGED, tmp_path / "new.txt") in events
+        assert all(path.suffix != ".bin" for _, path in events)
+
+        (tmp_path / "new.txt").unlink()
+        events = []
+        deadline = time.monotonic() + 2
+        while (DELETED, tmp_path / "new.txt") not in events and time.monotonic() < deadline:
+            events += watcher.poll(0.1)
+        assert (DELETED, tmp_path / "new.txt") in events
+    finally:
+        watcher.close()
+
+
+def test_apply_syncs_collection(tmp_path):
+    """변경/삭제 이벤트를 컬렉션에 반영"""
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    parser = DocumentParser(chunk_size=64, chunk_overlap=8)
+    vector_db = VectorSearch(persist_directory=str(tmp_path / "chroma"), collection_name="test")
+    service = WatchService(IndexingService(parser, FakeEmbedder(), vector_db), docs, "test")
+
+    memo = docs / "memo.txt"
+    memo.write_text("체육대회 준비물 안내 " * 10, encoding="utf-8")
+    chunks = service.apply(CHANGED, memo)
+    assert chunks > 0
+    assert vector_db.get_collection_count() == chunks
+
+    # 내용이 그대로면 다시 인덱싱하지 않음
+    assert service.apply(CHANGED, memo) == 0
+
+    memo.unlink()
+    assert service.apply(DELETED, memo) == 1
+    assert vector_db.get_collection_count() == 0